@@ -4,14 +4,27 @@ This module contains the FastAPI application.
 
 __version__ = "0.1.0"
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.metrics import metrics_router
 from app.api.ping import ping_router
 from app.api.v1 import api_router as v1_router
 from app.core.settings import settings
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Size the thread pool that runs synchronous handlers."""
+    limiter = to_thread.current_default_thread_limiter()
+    limiter.total_tokens = settings.server_threads
+    yield
+
+
 def create_app() -> FastAPI:
     """Create the FastAPI application."""
     docs_url = "/docs" if settings.is_development else None
@@ -28,6 +41,7 @@ def create_app() -> FastAPI:
         debug=settings.is_development,
         docs_url=docs_url,
         openapi_url=openapi_url,
+        lifespan=lifespan,
     )
 
     if settings.is_development:
@@ -54,6 +68,7 @@ def create_app() -> FastAPI:
         prefix=settings.api_v1_prefix,
     )
     new_app.include_router(ping_router, prefix="/ping")
+    new_app.include_router(metrics_router, prefix="/metrics")
 
     return new_app
 
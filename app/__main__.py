@@ -2,21 +2,37 @@
 This module contains the main application.
 """
 
+import logging
 import os
 
 import uvicorn
 
 from app import create_app
+from app.core.errors import TorProcessError
 from app.core.settings import settings
+from app.services.scraper_service import shared_tor
+
+logger = logging.getLogger(__name__)
 
 app = create_app()
 
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
+    workers = 1 if settings.is_development else settings.worker_count
+    # Each worker process imports the app itself and owns its own browser
+    # pools; BROWSER_HOST_MAX bounds their browsers together.
+    if workers > 1 and settings.tor_shared_process:
+        # The supervisor owns the shared tor, so a worker exiting does not
+        # stop it for the others; workers control it through its cookie.
+        try:
+            shared_tor.ensure_running(os.environ.get("TOR_BROWSER_PATH"))
+        except TorProcessError as e:
+            logger.warning("Shared tor not started by supervisor: %s", e)
     uvicorn.run(
-        app,
-        host="127.0.0.1",
+        "app.__main__:app" if workers > 1 else app,
+        host=settings.server_host,
         port=port,
         reload=settings.is_development,
+        workers=workers,
     )
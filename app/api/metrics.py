@@ -0,0 +1,18 @@
+"""Metrics"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import metrics
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@metrics_router.get("", include_in_schema=False)
+def get_metrics():
+    """Get scraper metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE
+    )
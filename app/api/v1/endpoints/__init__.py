@@ -1,7 +1,9 @@
 """Endpoints"""
 
+from app.api.v1.endpoints.plans import router_plans
 from app.api.v1.endpoints.scraper import router_scraper
 
 __all__ = [
+    "router_plans",
     "router_scraper",
 ]
@@ -0,0 +1,64 @@
+"""Extraction plan endpoints for reusable selector schemas"""
+
+from fastapi import APIRouter, HTTPException, Path, Response, status
+
+from app.serializers.scraper import (
+    PLAN_NAME_PATTERN,
+    ExtractionPlanRequest,
+    ExtractionPlanResponse,
+)
+from app.services.extraction_plans import extraction_plans
+
+router_plans = APIRouter()
+
+PlanName = Path(..., pattern=PLAN_NAME_PATTERN, description="Plan name")
+
+
+@router_plans.get(
+    "/plans",
+    response_model=list[str],
+    status_code=status.HTTP_200_OK,
+)
+def list_plans():
+    """List the names of every registered extraction plan."""
+    return extraction_plans.names()
+
+
+@router_plans.put(
+    "/plans/{name}",
+    response_model=ExtractionPlanResponse,
+    status_code=status.HTTP_200_OK,
+)
+def register_plan(request: ExtractionPlanRequest, name: str = PlanName):
+    """Register or replace a named extraction plan."""
+    return extraction_plans.register(name, request.selectors).to_response()
+
+
+@router_plans.get(
+    "/plans/{name}",
+    response_model=ExtractionPlanResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_plan(name: str = PlanName):
+    """Get a registered extraction plan."""
+    plan = extraction_plans.get(name)
+    if plan is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Extraction plan not found: {name}",
+        )
+    return plan.to_response()
+
+
+@router_plans.delete(
+    "/plans/{name}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+def delete_plan(name: str = PlanName):
+    """Remove a registered extraction plan."""
+    if not extraction_plans.delete(name):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Extraction plan not found: {name}",
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,56 +1,222 @@
 """Scraper endpoint for web scraping operations"""
 
+import itertools
 import logging
+from collections.abc import Iterator
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
-from app.core.errors import ScrapingError
-from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.core.errors import (
+    AdmissionRejectedError,
+    BrowserPoolTimeoutError,
+    HttpStatusError,
+    JobQueueFullError,
+    ScrapingError,
+)
+from app.serializers.scraper import (
+    CrawlRequest,
+    ScrapeBatchRequest,
+    ScrapeBatchResponse,
+    ScrapeJobResponse,
+    ScrapeRequest,
+    ScrapeResponse,
+    ScrapeStreamError,
+)
+from app.services.job_service import scrape_jobs
 from app.services.scraper_service import ScraperService
 
 logger = logging.getLogger(__name__)
 router_scraper = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 @router_scraper.post(
     "/scrape",
     response_model=ScrapeResponse,
     status_code=status.HTTP_200_OK,
 )
-def scrape_page(request: ScrapeRequest):
-    """Scrape a webpage using Tor Browser or Chrome with Selenium."""
+async def scrape_page(request: ScrapeRequest):
+    """
+    Scrape a webpage with Tor Browser, Chrome or the HTTP engine.
+
+    Browser scrapes are awaited on the event loop instead of holding a
+    threadpool thread for their whole duration.
+    """
     try:
         service = ScraperService()
-        result = service.scrape(request)
+        result = await service.scrape_async(request)
         return result
-    except ValueError as error:
-        logger.error("Configuration error: %s", error, exc_info=True)
+    except Exception as error:
+        raise _scrape_http_error(error) from error
+
+
+@router_scraper.post(
+    "/scrape/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def stream_scrape_page(request: ScrapeRequest):
+    """
+    Scrape a webpage and stream its fields as newline-delimited JSON.
+
+    Errors raised before the first line map to the same status codes as
+    /scrape; later errors end the stream with an error line.
+    """
+    events = ScraperService().stream_scrape(request)
+    try:
+        first = next(events)
+    except Exception as error:
+        raise _scrape_http_error(error) from error
+    return StreamingResponse(
+        _ndjson(itertools.chain([first], events)),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@router_scraper.post(
+    "/scrape/batch",
+    response_model=ScrapeBatchResponse,
+    status_code=status.HTTP_200_OK,
+)
+def scrape_batch(request: ScrapeBatchRequest):
+    """Scrape several webpages in parallel with shared options."""
+    try:
+        service = ScraperService()
+        return service.scrape_batch(request)
+    except Exception as error:
+        logger.error("Unexpected batch error: %s", error, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Unexpected error: {str(error)}",
+        ) from error
+
+
+@router_scraper.post(
+    "/scrape/batch/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def stream_scrape_batch(request: ScrapeBatchRequest):
+    """Scrape several webpages, streaming each result as it completes."""
+    return StreamingResponse(
+        _ndjson(ScraperService().stream_batch(request)),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@router_scraper.post(
+    "/crawl",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def crawl(request: CrawlRequest):
+    """
+    Crawl from seed URLs by following links, streaming each page.
+
+    Pages are scraped breadth first within the depth and page budgets,
+    with per-host concurrency and delay limits.
+    """
+    return StreamingResponse(
+        _ndjson(ScraperService().stream_crawl(request)),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@router_scraper.post(
+    "/scrape/jobs",
+    response_model=ScrapeJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def create_scrape_job(request: ScrapeRequest):
+    """Queue a scrape and return immediately with a job id."""
+    try:
+        return scrape_jobs.submit(request).to_response()
+    except JobQueueFullError as error:
+        logger.warning("Scrape job rejected: %s", error)
         raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Job queue full: {str(error)}",
+        ) from error
+
+
+@router_scraper.get(
+    "/scrape/jobs/{job_id}",
+    response_model=ScrapeJobResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_scrape_job(job_id: str):
+    """Get the status and result of a queued scrape."""
+    job = scrape_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job not found: {job_id}",
+        )
+    return job.to_response()
+
+
+def _scrape_http_error(error: Exception) -> HTTPException:
+    """Map a scraping failure to an HTTP error response."""
+    if isinstance(error, ValueError):
+        logger.error("Configuration error: %s", error, exc_info=True)
+        return HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Configuration error: {str(error)}",
-        ) from error
-    except TimeoutException as error:
+        )
+    if isinstance(error, TimeoutException):
         logger.error("Page load timeout: %s", error, exc_info=True)
-        raise HTTPException(
+        return HTTPException(
             status_code=status.HTTP_408_REQUEST_TIMEOUT,
             detail=f"Page load timeout: {str(error)}",
-        ) from error
-    except WebDriverException as error:
+        )
+    if isinstance(error, WebDriverException):
         logger.error("Browser error: %s", error, exc_info=True)
-        raise HTTPException(
+        return HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Browser error: {str(error)}",
-        ) from error
-    except ScrapingError as error:
+        )
+    if isinstance(error, AdmissionRejectedError):
+        logger.warning("Scrape rejected: %s", error)
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many scrapes: {str(error)}",
+            headers={"Retry-After": str(error.retry_after)},
+        )
+    if isinstance(error, BrowserPoolTimeoutError):
+        logger.error("Browser pool exhausted: %s", error, exc_info=True)
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"No browser available: {str(error)}",
+        )
+    if isinstance(error, HttpStatusError):
+        logger.warning("Page answered with an error: %s", error)
+        return HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Scraping failed: {str(error)}",
+        )
+    if isinstance(error, ScrapingError):
         logger.error("Scraping failed: %s", error, exc_info=True)
-        raise HTTPException(
+        return HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Scraping failed: {str(error)}",
-        ) from error
+        )
+    logger.error("Unexpected error: %s", error, exc_info=True)
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Unexpected error: {str(error)}",
+    )
+
+
+def _ndjson(events: Iterator[BaseModel]) -> Iterator[str]:
+    """Serialize events one JSON object per line, ending on errors."""
+    try:
+        for event in events:
+            yield event.model_dump_json() + "\n"
     except Exception as error:
-        logger.error("Unexpected error: %s", error, exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Unexpected error: {str(error)}",
-        ) from error
+        logger.error("Streamed scrape failed: %s", error, exc_info=True)
+        failure = ScrapeStreamError(error=f"{type(error).__name__}: {error}")
+        yield failure.model_dump_json() + "\n"
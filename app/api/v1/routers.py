@@ -2,8 +2,9 @@
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import router_scraper
+from app.api.v1.endpoints import router_plans, router_scraper
 
 v1 = APIRouter()
 
 v1.include_router(router_scraper, tags=["Scraper"])
+v1.include_router(router_plans, tags=["Extraction Plans"])
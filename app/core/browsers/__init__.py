@@ -2,10 +2,25 @@
 
 from app.core.browsers.abc import Browser
 from app.core.browsers.chrome import Chrome
+from app.core.browsers.lifecycle import DriverLifecycle
+from app.core.browsers.pool import BrowserPool, BrowserPoolRegistry
+from app.core.browsers.resources import ResourceBlocking
 from app.core.browsers.tor import TorBrowser
+from app.core.browsers.tor_circuits import TorCircuit, TorCircuitManager
+from app.core.browsers.tor_process import TorControl, TorProcess
+from app.core.browsers.webdriver_async import AsyncWebDriver
 
 __all__ = [
+    "AsyncWebDriver",
     "Browser",
+    "BrowserPool",
+    "BrowserPoolRegistry",
     "Chrome",
+    "DriverLifecycle",
+    "ResourceBlocking",
     "TorBrowser",
+    "TorCircuit",
+    "TorCircuitManager",
+    "TorControl",
+    "TorProcess",
 ]
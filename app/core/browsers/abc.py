@@ -1,8 +1,12 @@
 """ABC Browser"""
 
+import contextlib
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from typing import Any
 
+from app.core.browsers.lifecycle import DriverLifecycle
+
 
 class Browser(ABC):
     """Abstract base class for browser implementations."""
@@ -12,7 +16,10 @@ class Browser(ABC):
     instance: Any = None
 
     def __init__(
-        self, headless: bool = True, multi_instances: bool = False
+        self,
+        headless: bool = True,
+        multi_instances: bool = False,
+        lifecycle: DriverLifecycle | None = None,
     ) -> None:
         """
         Initialize browser.
@@ -20,9 +27,11 @@ class Browser(ABC):
         Args:
             headless: Run browser in headless mode
             multi_instances: Allow multiple browser instances
+            lifecycle: Limits the single shared instance is recycled past
         """
         self.headless = headless
         self.multi_instances = multi_instances
+        self.lifecycle = lifecycle
 
         self._set_executable()
         self._set_options()
@@ -41,3 +50,32 @@ class Browser(ABC):
     def get_instance(self) -> Any:
         """Get browser driver instance."""
         pass
+
+    def _shared_instance(self, new_driver: Callable[[], Any]) -> Any:
+        """
+        Get the single reused driver, recycling it past lifecycle limits.
+
+        Args:
+            new_driver: Callable launching a fresh driver
+
+        Returns:
+            WebDriver instance
+        """
+        if self.instance is not None and self.lifecycle is not None:
+            reason = self.lifecycle.recycle_reason(self.instance)
+            if reason is not None:
+                self.lifecycle.retire(
+                    self.instance, reason, type(self).__name__.lower()
+                )
+                with contextlib.suppress(Exception):
+                    self.instance.quit()
+                self.instance = None
+
+        if self.instance is None:
+            self.instance = new_driver()
+            if self.lifecycle is not None:
+                self.lifecycle.track(self.instance)
+
+        if self.lifecycle is not None:
+            self.lifecycle.record_page(self.instance)
+        return self.instance
@@ -64,7 +64,4 @@ class Chrome(Browser):
         if self.multi_instances:
             return new_driver()
 
-        if not self.instance:
-            self.instance = new_driver()
-
-        return self.instance
+        return self._shared_instance(new_driver)
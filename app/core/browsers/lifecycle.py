@@ -0,0 +1,210 @@
+"""Browser Lifecycle Module"""
+
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.metrics import browser_recycles_total
+
+logger = logging.getLogger(__name__)
+
+PROC_ROOT = "/proc"
+
+
+def _children_by_parent() -> dict[int, list[int]]:
+    """Map every process id to its child process ids, from /proc."""
+    children: dict[int, list[int]] = {}
+    try:
+        entries = os.listdir(PROC_ROOT)
+    except OSError:
+        return children
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(os.path.join(PROC_ROOT, entry, "stat")) as stat_file:
+                stat = stat_file.read()
+            # The command name may contain spaces; fields resume after ")".
+            parent = int(stat[stat.rfind(")") + 2 :].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    return children
+
+
+def _rss(pid: int) -> int:
+    """Resident set size of one process in bytes, 0 if it is gone."""
+    try:
+        with open(os.path.join(PROC_ROOT, str(pid), "statm")) as statm_file:
+            resident = int(statm_file.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return 0
+    return resident * os.sysconf("SC_PAGE_SIZE")
+
+
+def process_tree_rss(pid: int) -> int:
+    """
+    Resident memory of a process and all its descendants.
+
+    A driver's memory lives mostly in the browser and its content
+    processes, which are children of the WebDriver service process.
+
+    Args:
+        pid: Root process id
+
+    Returns:
+        Total RSS in bytes, 0 where /proc is unavailable
+    """
+    children = _children_by_parent()
+    total = 0
+    pending = [pid]
+    seen: set[int] = set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        total += _rss(current)
+        pending.extend(children.get(current, ()))
+    return total
+
+
+def driver_pid(driver: Any) -> int | None:
+    """Process id of a driver's WebDriver service (geckodriver etc.)."""
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    pid = getattr(process, "pid", None)
+    return pid if isinstance(pid, int) else None
+
+
+@dataclass
+class DriverStats:
+    """Size and usage of one tracked driver."""
+
+    pid: int | None
+    created_at: float = field(default_factory=time.monotonic)
+    pages: int = 0
+    rss: int = 0
+    rss_sampled_at: float | None = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the driver was launched."""
+        return time.monotonic() - self.created_at
+
+    def to_dict(self) -> dict[str, Any]:
+        """Stats as a JSON friendly dict."""
+        return {
+            "pid": self.pid,
+            "age": round(self.age, 3),
+            "pages": self.pages,
+            "rss_mb": round(self.rss / (1024 * 1024), 1),
+        }
+
+
+class DriverLifecycle:
+    """
+    Track each driver's age, pages served and process-tree RSS.
+
+    Drivers past any limit should be recycled: quit and replaced by a
+    fresh one, which keeps long-running workers at a stable footprint.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = 0,
+        max_age: float = 0,
+        max_rss_mb: int = 0,
+        rss_interval: float = 10,
+    ) -> None:
+        """
+        Initialize lifecycle manager.
+
+        Args:
+            max_pages: Pages served before recycling, 0 for no limit
+            max_age: Seconds alive before recycling, 0 for no limit
+            max_rss_mb: Process-tree RSS in MiB before recycling, 0 for no
+                limit
+            rss_interval: Minimum seconds between RSS samples of a driver
+        """
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.max_rss_mb = max_rss_mb
+        self.rss_interval = rss_interval
+        self._stats: weakref.WeakKeyDictionary[Any, DriverStats] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def track(self, driver: Any) -> DriverStats:
+        """Start tracking a newly launched driver."""
+        stats = DriverStats(pid=driver_pid(driver))
+        with self._lock:
+            self._stats[driver] = stats
+        return stats
+
+    def stats(self, driver: Any) -> DriverStats:
+        """Stats of a driver, tracking it from now if it is unknown."""
+        with self._lock:
+            stats = self._stats.get(driver)
+        return stats if stats is not None else self.track(driver)
+
+    def record_page(self, driver: Any) -> None:
+        """Count one page served by a driver."""
+        stats = self.stats(driver)
+        with self._lock:
+            stats.pages += 1
+
+    def recycle_reason(self, driver: Any) -> str | None:
+        """
+        Check a driver against the limits.
+
+        Args:
+            driver: Tracked WebDriver instance
+
+        Returns:
+            Why the driver should be recycled, or None to keep it
+        """
+        stats = self.stats(driver)
+        if self.max_pages and stats.pages >= self.max_pages:
+            return "pages"
+        if self.max_age and stats.age >= self.max_age:
+            return "age"
+        if self.max_rss_mb and stats.pid is not None:
+            now = time.monotonic()
+            if (
+                stats.rss_sampled_at is None
+                or now - stats.rss_sampled_at >= self.rss_interval
+            ):
+                stats.rss = process_tree_rss(stats.pid)
+                stats.rss_sampled_at = now
+            if stats.rss >= self.max_rss_mb * 1024 * 1024:
+                return "rss"
+        return None
+
+    def retire(self, driver: Any, reason: str, name: str = "browser") -> None:
+        """
+        Stop tracking a driver that is being recycled; the caller quits it.
+
+        Args:
+            driver: WebDriver instance
+            reason: Limit the driver exceeded
+            name: Browser name used in logs and metrics
+        """
+        stats = self.forget(driver)
+        logger.info(
+            "Recycling %s driver (%s): %s",
+            name,
+            reason,
+            stats.to_dict() if stats else {},
+        )
+        browser_recycles_total.inc(browser=name, reason=reason)
+
+    def forget(self, driver: Any) -> DriverStats | None:
+        """Stop tracking a driver."""
+        with self._lock:
+            return self._stats.pop(driver, None)
@@ -0,0 +1,475 @@
+"""Browser Pool Module"""
+
+import contextlib
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from selenium.common.exceptions import WebDriverException
+
+from app.core.browsers.lifecycle import DriverLifecycle
+from app.core.browsers.slots import BrowserSlot, BrowserSlots
+from app.core.errors import BrowserPoolTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledDriver:
+    """WebDriver instance tracked by a pool."""
+
+    driver: Any
+    created_at: float = field(default_factory=time.monotonic)
+    last_used_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+    slot: BrowserSlot | None = None
+
+
+class BrowserPool:
+    """Bounded pool of pre-launched WebDriver instances."""
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        min_size: int = 0,
+        max_size: int = 2,
+        max_uses: int = 50,
+        idle_timeout: float = 300,
+        lease_timeout: float = 60,
+        name: str = "browser",
+        slots: BrowserSlots | None = None,
+        lifecycle: DriverLifecycle | None = None,
+        reclaim: Callable[[], bool] | None = None,
+    ) -> None:
+        """
+        Initialize browser pool.
+
+        Args:
+            factory: Callable that launches a new WebDriver instance
+            min_size: Idle drivers kept warm
+            max_size: Maximum live drivers (idle and leased)
+            max_uses: Leases served by a driver before it is recycled
+            idle_timeout: Seconds an idle driver is kept before eviction
+            lease_timeout: Seconds to wait for a free driver
+            name: Pool name used in logs
+            slots: Host-wide browser slots each live driver holds one of
+            lifecycle: Age and memory limits drivers are recycled past
+            reclaim: Callable quitting an idle driver, of any pool, when
+                every host browser slot is held
+        """
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self.lease_timeout = lease_timeout
+        self.name = name
+        self.slots = slots
+        self.lifecycle = lifecycle
+        self.reclaim = reclaim
+
+        self._idle: list[PooledDriver] = []
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def size(self) -> int:
+        """Number of live drivers, including leased and launching ones."""
+        with self._condition:
+            return self._size
+
+    @property
+    def idle_count(self) -> int:
+        """Number of drivers waiting to be leased."""
+        with self._condition:
+            return len(self._idle)
+
+    @property
+    def idle_since(self) -> float | None:
+        """Monotonic time the longest idle driver was last used at."""
+        with self._condition:
+            return min(
+                (entry.last_used_at for entry in self._idle), default=None
+            )
+
+    def warm(self) -> None:
+        """Launch drivers until the pool holds min_size idle drivers."""
+        while True:
+            with self._condition:
+                if (
+                    self._closed
+                    or len(self._idle) >= self.min_size
+                    or self._size >= self.max_size
+                ):
+                    return
+                self._size += 1
+
+            # Warm-up takes free slots only, never an idle driver's.
+            self._checkin(self._launch(self.lease_timeout, reclaim=False))
+
+    @contextlib.contextmanager
+    def lease(self) -> Iterator[Any]:
+        """
+        Lease a driver for the duration of the context.
+
+        Drivers that raise a WebDriverException while leased are discarded
+        instead of being returned to the pool.
+
+        Raises:
+            BrowserPoolTimeoutError: If no driver frees up in time
+        """
+        entry = self._acquire()
+        reusable = True
+        try:
+            yield entry.driver
+        except WebDriverException:
+            reusable = False
+            raise
+        finally:
+            self._release(entry, reusable)
+
+    def evict_idle(self) -> int:
+        """
+        Quit drivers idle past the timeout, keeping min_size warm.
+
+        Returns:
+            Number of drivers quit
+        """
+        with self._condition:
+            stale = self._evict_idle()
+            if stale:
+                self._condition.notify_all()
+
+        for entry in stale:
+            self._quit(entry)
+        return len(stale)
+
+    def reclaim_idle(self) -> bool:
+        """
+        Quit the least recently used idle driver, even a warm one.
+
+        Returns:
+            Whether a driver was quit
+        """
+        with self._condition:
+            if not self._idle:
+                return False
+            entry = min(self._idle, key=lambda entry: entry.last_used_at)
+            self._idle.remove(entry)
+            self._size -= 1
+            self._condition.notify()
+
+        self._quit(entry)
+        return True
+
+    def close(self) -> None:
+        """Quit idle drivers and stop handing out new ones."""
+        with self._condition:
+            self._closed = True
+            stale = self._idle
+            self._idle = []
+            self._size -= len(stale)
+            self._condition.notify_all()
+
+        for entry in stale:
+            self._quit(entry)
+
+    def _acquire(self) -> PooledDriver:
+        deadline = time.monotonic() + self.lease_timeout
+        while True:
+            stale: list[PooledDriver] = []
+            entry: PooledDriver | None = None
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise BrowserPoolTimeoutError(
+                            f"{self.name} pool is closed"
+                        )
+                    stale.extend(self._evict_idle())
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserPoolTimeoutError(
+                            f"No {self.name} available after "
+                            f"{self.lease_timeout}s"
+                        )
+                    self._condition.wait(remaining)
+
+            for stale_entry in stale:
+                self._quit(stale_entry)
+
+            if entry is None:
+                # The slot wait shares the lease timeout, not a fresh one.
+                return self._launch(max(0.0, deadline - time.monotonic()))
+
+            if self._is_healthy(entry):
+                return entry
+
+            logger.warning("Discarding unhealthy %s driver", self.name)
+            self._discard(entry)
+
+    def _release(self, entry: PooledDriver, reusable: bool) -> None:
+        entry.uses += 1
+        entry.last_used_at = time.monotonic()
+
+        if not reusable or entry.uses >= self.max_uses:
+            self._discard(entry)
+            return
+
+        if self.lifecycle is not None:
+            self.lifecycle.record_page(entry.driver)
+            reason = self.lifecycle.recycle_reason(entry.driver)
+            if reason is not None:
+                self.lifecycle.retire(entry.driver, reason, self.name)
+                self._discard(entry)
+                return
+
+        if not self._reset(entry):
+            self._discard(entry)
+            return
+
+        self._checkin(entry)
+
+    def _checkin(self, entry: PooledDriver) -> None:
+        with self._condition:
+            if not self._closed:
+                self._idle.append(entry)
+                self._condition.notify()
+                return
+            self._size -= 1
+
+        self._quit(entry)
+
+    def _launch(self, timeout: float, reclaim: bool = True) -> PooledDriver:
+        slot = None
+        try:
+            if self.slots is not None:
+                slot = self.slots.acquire(
+                    timeout, reclaim=self.reclaim if reclaim else None
+                )
+            driver = self.factory()
+        except Exception:
+            if self.slots is not None:
+                self.slots.release(slot)
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+        if self.lifecycle is not None:
+            self.lifecycle.track(driver)
+        logger.info("Launched pooled %s driver", self.name)
+        return PooledDriver(driver=driver, slot=slot)
+
+    def _discard(self, entry: PooledDriver) -> None:
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+        self._quit(entry)
+
+    def _evict_idle(self) -> list[PooledDriver]:
+        """Detach drivers idle past the timeout, keeping min_size warm."""
+        if not self._idle:
+            return []
+
+        now = time.monotonic()
+        keep: list[PooledDriver] = []
+        stale: list[PooledDriver] = []
+        for entry in self._idle:
+            expired = now - entry.last_used_at >= self.idle_timeout
+            if expired and len(self._idle) - len(stale) > self.min_size:
+                stale.append(entry)
+            else:
+                keep.append(entry)
+
+        self._idle = keep
+        self._size -= len(stale)
+        return stale
+
+    def _is_healthy(self, entry: PooledDriver) -> bool:
+        try:
+            _ = entry.driver.current_url
+        except Exception:
+            return False
+        return True
+
+    def _reset(self, entry: PooledDriver) -> bool:
+        """Clear page state so the next lease starts clean."""
+        try:
+            entry.driver.delete_all_cookies()
+            entry.driver.get("about:blank")
+        except Exception:
+            return False
+        return True
+
+    def _quit(self, entry: PooledDriver) -> None:
+        with contextlib.suppress(Exception):
+            entry.driver.quit()
+        if self.slots is not None:
+            self.slots.release(entry.slot)
+        if self.lifecycle is not None:
+            self.lifecycle.forget(entry.driver)
+        logger.info(
+            "Closed pooled %s driver after %d uses", self.name, entry.uses
+        )
+
+
+class BrowserPoolRegistry:
+    """
+    Lazily created browser pools keyed by browser configuration.
+
+    A background sweep quits idle drivers of every pool, so a pool that
+    is no longer leased from does not keep its browsers, and their host
+    browser slots, forever. When every host slot is held, a launch quits
+    the least recently used idle driver of any pool instead of waiting,
+    and other processes waiting for a slot get theirs the same way.
+    """
+
+    def __init__(
+        self,
+        sweep_interval: float = 30,
+        slots: BrowserSlots | None = None,
+        reclaim_interval: float = 0.5,
+    ) -> None:
+        """
+        Initialize browser pool registry.
+
+        Args:
+            sweep_interval: Seconds between idle driver sweeps
+            slots: Host-wide browser slots other processes may wait for
+            reclaim_interval: Seconds between checks for such processes
+        """
+        self.sweep_interval = sweep_interval
+        self.slots = slots
+        self.reclaim_interval = reclaim_interval
+        self._pools: dict[Hashable, BrowserPool] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sweeper: threading.Thread | None = None
+
+    def get(
+        self,
+        key: Hashable,
+        factory: Callable[[], Any],
+        **pool_kwargs: Any,
+    ) -> BrowserPool:
+        """
+        Get the pool for a key, creating and warming it on first use.
+
+        Args:
+            key: Browser configuration key
+            factory: Callable that launches a new WebDriver instance
+            **pool_kwargs: Extra BrowserPool arguments
+
+        Returns:
+            BrowserPool instance
+        """
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is not None:
+                return pool
+            pool_kwargs.setdefault("reclaim", self.reclaim_idle)
+            pool = BrowserPool(factory, **pool_kwargs)
+            self._pools[key] = pool
+            self._start_sweeper()
+
+        if pool.min_size:
+            threading.Thread(
+                target=self._warm,
+                args=(pool,),
+                name=f"{pool.name}-pool-warmup",
+                daemon=True,
+            ).start()
+        return pool
+
+    def sweep(self) -> int:
+        """
+        Quit drivers idle past their pool's timeout, in every pool.
+
+        Returns:
+            Number of drivers quit
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+
+        evicted = 0
+        for pool in pools:
+            try:
+                evicted += pool.evict_idle()
+            except Exception as e:
+                logger.error("Failed to sweep %s pool: %s", pool.name, e)
+        return evicted
+
+    def reclaim_idle(self) -> bool:
+        """
+        Quit the least recently used idle driver of any pool.
+
+        Returns:
+            Whether a driver was quit
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+
+        idle: list[tuple[float, BrowserPool]] = []
+        for pool in pools:
+            since = pool.idle_since
+            if since is not None:
+                idle.append((since, pool))
+        for _, pool in sorted(idle, key=lambda item: item[0]):
+            if pool.reclaim_idle():
+                return True
+        return False
+
+    def close(self) -> None:
+        """Close every pool and quit their idle drivers."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+            self._stop.set()
+            self._sweeper = None
+
+        for pool in pools:
+            pool.close()
+
+    def _start_sweeper(self) -> None:
+        if self._sweeper is not None:
+            return
+        self._stop = threading.Event()
+        self._sweeper = threading.Thread(
+            target=self._sweep_loop,
+            args=(self._stop,),
+            name="browser-pool-sweeper",
+            daemon=True,
+        )
+        self._sweeper.start()
+
+    def _sweep_loop(self, stop: threading.Event) -> None:
+        interval = self.sweep_interval
+        if self.slots is not None and self.slots.enabled:
+            interval = min(interval, self.reclaim_interval)
+        next_sweep = time.monotonic() + self.sweep_interval
+        while not stop.wait(interval):
+            if self.slots is not None and self.slots.wanted(
+                2 * self.reclaim_interval
+            ):
+                self.reclaim_idle()
+            if time.monotonic() >= next_sweep:
+                self.sweep()
+                next_sweep = time.monotonic() + self.sweep_interval
+
+    @staticmethod
+    def _warm(pool: BrowserPool) -> None:
+        try:
+            pool.warm()
+        except Exception as e:
+            logger.error("Failed to warm %s pool: %s", pool.name, e)
@@ -0,0 +1,244 @@
+"""Resource Blocking Module"""
+
+import logging
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_KINDS = ("images", "media", "fonts", "stylesheets")
+
+RESOURCE_EXTENSIONS = {
+    "images": (
+        "png",
+        "jpg",
+        "jpeg",
+        "gif",
+        "webp",
+        "avif",
+        "svg",
+        "ico",
+        "bmp",
+    ),
+    "media": ("mp4", "webm", "ogg", "ogv", "mp3", "m4a", "wav", "m3u8"),
+    "fonts": ("woff", "woff2", "ttf", "otf", "eot"),
+    "stylesheets": ("css",),
+}
+
+FIREFOX_CONTENT_TYPES = {
+    "images": ("TYPE_IMAGE", "TYPE_IMAGESET"),
+    "media": ("TYPE_MEDIA",),
+    "fonts": ("TYPE_FONT",),
+    "stylesheets": ("TYPE_STYLESHEET",),
+}
+
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "mixpanel.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "amazon-adsystem.com",
+    "newrelic.com",
+    "nr-data.net",
+)
+
+FIREFOX_BLOCKING_SCRIPT = """
+const policy = arguments[0];
+const state = window.__scraperBlocking || (window.__scraperBlocking = {});
+state.types = policy.types.flatMap((name) => {
+    const type = Ci.nsIContentPolicy[name];
+    return type === undefined ? [] : [type];
+});
+state.domains = policy.domains;
+if (!state.observer) {
+    state.observer = {
+        observe(subject) {
+            if (!state.types.length && !state.domains.length) {
+                return;
+            }
+            const channel = subject.QueryInterface(Ci.nsIHttpChannel);
+            const type = channel.loadInfo.externalContentPolicyType;
+            const host = channel.URI.host;
+            if (
+                state.types.includes(type)
+                || state.domains.some(
+                    (domain) => host === domain || host.endsWith("." + domain)
+                )
+            ) {
+                channel.cancel(Cr.NS_ERROR_ABORT);
+            }
+        },
+    };
+    Services.obs.addObserver(state.observer, "http-on-modify-request");
+}
+"""
+
+
+class _InstalledPolicy:
+    """Policy in effect on a browser and the tab drivers relying on it."""
+
+    def __init__(self) -> None:
+        self.blocking: ResourceBlocking | None = None
+        self.holders: set[int] = set()
+        self.condition = threading.Condition()
+
+
+_installed: "weakref.WeakKeyDictionary[Any, _InstalledPolicy]" = (
+    weakref.WeakKeyDictionary()
+)
+_installed_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ResourceBlocking:
+    """Subresources a browser should not download."""
+
+    kinds: frozenset[str] = frozenset()
+    domains: tuple[str, ...] = ()
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether nothing is blocked."""
+        return not self.kinds and not self.domains
+
+    def url_patterns(self) -> list[str]:
+        """Chrome DevTools URL patterns matching the blocked requests."""
+        patterns = []
+        for kind in sorted(self.kinds):
+            for extension in RESOURCE_EXTENSIONS[kind]:
+                patterns += [f"*.{extension}", f"*.{extension}?*"]
+        for domain in self.domains:
+            patterns += [f"*://{domain}/*", f"*://*.{domain}/*"]
+        return patterns
+
+    def firefox_policy(self) -> dict[str, list[str]]:
+        """Argument of FIREFOX_BLOCKING_SCRIPT."""
+        types = [
+            name
+            for kind in sorted(self.kinds)
+            for name in FIREFOX_CONTENT_TYPES[kind]
+        ]
+        return {"types": types, "domains": list(self.domains)}
+
+
+def _policy_target(driver: Any) -> Any:
+    """
+    Object a driver's resource policy takes effect on.
+
+    DevTools blocking applies to the tab's own target, while the Firefox
+    observer applies to the whole browser, shared by every tab driver.
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        return driver
+    return getattr(driver, "tab_browser", driver)
+
+
+def _installed_policy(target: Any) -> _InstalledPolicy:
+    with _installed_lock:
+        installed = _installed.get(target)
+        if installed is None:
+            installed = _installed[target] = _InstalledPolicy()
+        return installed
+
+
+def apply_resource_blocking(
+    driver: Any, blocking: ResourceBlocking, timeout: float = 60
+) -> bool:
+    """
+    Install a resource policy on a driver before it navigates.
+
+    Chrome requests are blocked by URL pattern through the DevTools
+    protocol. Firefox based drivers (Tor Browser) get a privileged request
+    observer that cancels requests by content type and host. Policies stay
+    installed on pooled drivers, so an empty policy clears a previous one.
+
+    The Firefox observer is browser wide, so a tab driver needing another
+    policy than the one other tabs of its browser rely on waits for them
+    to close, until release_resource_blocking.
+
+    Args:
+        driver: WebDriver instance
+        blocking: Resources to block
+        timeout: Seconds to wait for other tabs to give up their policy
+
+    Returns:
+        Whether the policy is in effect on the driver
+    """
+    target = _policy_target(driver)
+    installed = _installed_policy(target)
+    with installed.condition:
+        if not installed.condition.wait_for(
+            lambda: (
+                installed.blocking == blocking
+                or not installed.holders - {id(driver)}
+            ),
+            timeout,
+        ):
+            logger.warning(
+                "Resource policy not applied, other tabs still rely on theirs"
+            )
+            return False
+
+        previous = installed.blocking
+        if previous != blocking and not (
+            previous is None and blocking.is_empty
+        ):
+            if not _install(driver, blocking, first=previous is None):
+                return False
+            installed.blocking = blocking
+        if target is not driver:
+            installed.holders.add(id(driver))
+    return not blocking.is_empty
+
+
+def release_resource_blocking(driver: Any) -> None:
+    """
+    Stop a tab driver from relying on its browser's resource policy.
+
+    Args:
+        driver: Tab driver given to apply_resource_blocking
+    """
+    target = _policy_target(driver)
+    with _installed_lock:
+        installed = _installed.get(target)
+    if installed is None:
+        return
+    with installed.condition:
+        installed.holders.discard(id(driver))
+        installed.condition.notify_all()
+
+
+def _install(driver: Any, blocking: ResourceBlocking, first: bool) -> bool:
+    try:
+        if hasattr(driver, "execute_cdp_cmd"):
+            if first:
+                driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": blocking.url_patterns()}
+            )
+        elif hasattr(driver, "CONTEXT_CHROME"):
+            with driver.context(driver.CONTEXT_CHROME):
+                driver.execute_script(
+                    FIREFOX_BLOCKING_SCRIPT, blocking.firefox_policy()
+                )
+        else:
+            return False
+    except WebDriverException as e:
+        logger.warning("Could not apply resource blocking: %s", e)
+        return False
+    return True
@@ -0,0 +1,180 @@
+"""Browser Slots Module"""
+
+import contextlib
+import logging
+import os
+import random
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
+from app.core.errors import BrowserPoolTimeoutError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+FILE_LOCKS = fcntl is not None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BrowserSlot:
+    """One held host-wide browser slot."""
+
+    index: int
+    fd: int
+
+
+class BrowserSlots:
+    """
+    Host-wide limit on live browsers, shared by every worker process.
+
+    Each slot is a lock file; holding an exclusive flock on it means one
+    browser may run. Locks are released by the kernel when a process dies,
+    so a crashed worker never leaks slots.
+    """
+
+    def __init__(
+        self, directory: str, limit: int, poll_interval: float = 0.05
+    ) -> None:
+        """
+        Initialize browser slots.
+
+        Args:
+            directory: Directory holding the slot lock files
+            limit: Live browsers allowed on the host, 0 for no limit
+            poll_interval: Seconds between attempts while all slots are held
+        """
+        self.directory = directory
+        self.limit = limit
+        self.poll_interval = poll_interval
+        if limit and not FILE_LOCKS:
+            logger.warning("File locks unavailable, browser slots disabled")
+            self.limit = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether browser launches are limited."""
+        return self.limit > 0
+
+    def acquire(
+        self, timeout: float, reclaim: Callable[[], bool] | None = None
+    ) -> BrowserSlot | None:
+        """
+        Wait for a free slot.
+
+        While every slot is held, reclaim is asked to quit an idle browser
+        of this process, and other processes are asked to quit theirs.
+
+        Args:
+            timeout: Seconds to wait for a slot
+            reclaim: Callable quitting an idle browser, returning whether
+                it did; without it, held slots are only waited on
+
+        Returns:
+            Held slot, or None when slots are disabled
+
+        Raises:
+            BrowserPoolTimeoutError: If every slot stays held
+        """
+        if not self.enabled:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        deadline = time.monotonic() + timeout
+        while True:
+            slot = self._try_acquire()
+            if slot is not None:
+                return slot
+            if reclaim is not None:
+                if reclaim():
+                    continue
+                self._request_release()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise BrowserPoolTimeoutError(
+                    f"All {self.limit} host browser slots busy after "
+                    f"{timeout}s"
+                )
+            time.sleep(min(self.poll_interval, remaining))
+
+    def release(self, slot: BrowserSlot | None) -> None:
+        """Give a slot back."""
+        if slot is None:
+            return
+        with contextlib.suppress(OSError):
+            fcntl.flock(slot.fd, fcntl.LOCK_UN)
+        with contextlib.suppress(OSError):
+            os.close(slot.fd)
+
+    @contextlib.contextmanager
+    def hold(self, timeout: float) -> Iterator[BrowserSlot | None]:
+        """Hold a slot for the duration of the context."""
+        slot = self.acquire(timeout)
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+
+    def wanted(self, within: float) -> bool:
+        """
+        Whether a process waited for a slot in the last seconds.
+
+        Args:
+            within: Seconds a request to quit idle browsers stays current
+        """
+        if not self.enabled:
+            return False
+        try:
+            requested_at = os.stat(self._wanted_path).st_mtime
+        except OSError:
+            return False
+        return time.time() - requested_at < within
+
+    def in_use(self) -> int:
+        """Number of slots held by any process on the host."""
+        if not self.enabled:
+            return 0
+        os.makedirs(self.directory, exist_ok=True)
+        held = 0
+        for index in range(self.limit):
+            slot = self._try_lock(index)
+            if slot is None:
+                held += 1
+            else:
+                self.release(slot)
+        return held
+
+    @property
+    def _wanted_path(self) -> str:
+        return os.path.join(self.directory, "wanted")
+
+    def _request_release(self) -> None:
+        """Ask other processes to quit idle browsers, see wanted."""
+        with contextlib.suppress(OSError):
+            os.close(
+                os.open(self._wanted_path, os.O_WRONLY | os.O_CREAT, 0o600)
+            )
+            os.utime(self._wanted_path)
+
+    def _try_acquire(self) -> BrowserSlot | None:
+        # Start at a random slot so workers do not all contend for slot 0.
+        offset = random.randrange(self.limit)
+        for step in range(self.limit):
+            slot = self._try_lock((offset + step) % self.limit)
+            if slot is not None:
+                return slot
+        return None
+
+    def _try_lock(self, index: int) -> BrowserSlot | None:
+        path = os.path.join(self.directory, f"slot-{index}.lock")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return BrowserSlot(index=index, fd=fd)
@@ -0,0 +1,392 @@
+"""Browser Tabs Module"""
+
+import contextlib
+import copy
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from selenium.common.exceptions import (
+    NoSuchWindowException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.remote.command import Command
+
+from app.core.browsers.pool import BrowserPool
+from app.core.browsers.resources import release_resource_blocking
+from app.core.errors import BrowserPoolTimeoutError
+
+logger = logging.getLogger(__name__)
+
+NAVIGATE_SCRIPT = """
+window.__scraperNavigating = true;
+window.location.assign(arguments[0]);
+"""
+
+LOADED_SCRIPT = """
+return !window.__scraperNavigating && document.readyState === "complete";
+"""
+
+
+@dataclass
+class Tab:
+    """One window of a shared browser, leased to one scrape."""
+
+    handle: str
+    driver: Any
+    browser_context: str | None = None
+
+
+class BrowserTabs:
+    """
+    Several concurrent scrapes sharing one WebDriver session.
+
+    WebDriver commands act on the session's current window, so every tab
+    gets its own driver object whose commands switch to the tab's window
+    first, under a lock held for the single command. Navigation starts the
+    load from a script and polls for completion without the lock, so pages
+    in different tabs load concurrently.
+    """
+
+    def __init__(
+        self,
+        driver: Any,
+        isolate: bool = True,
+        page_load_timeout: float = 60,
+        poll_interval: float = 0.1,
+    ) -> None:
+        """
+        Initialize tabs of a driver.
+
+        Args:
+            driver: WebDriver instance owning the browser
+            isolate: Give Chrome tabs their own cookie jar
+            page_load_timeout: Seconds a tab waits for a page to load
+            poll_interval: Seconds between load checks
+        """
+        self.driver = driver
+        self.isolate = isolate
+        self.page_load_timeout = page_load_timeout
+        self.poll_interval = poll_interval
+        self.lock = threading.RLock()
+        self.base_handle = self._raw(Command.W3C_GET_CURRENT_WINDOW_HANDLE)
+        self._current = self.base_handle
+
+    def open_tab(self) -> Tab:
+        """Open a blank window and a driver bound to it."""
+        with self.lock:
+            browser_context = None
+            handle = None
+            if self.isolate and hasattr(self.driver, "execute_cdp_cmd"):
+                browser_context, handle = self._open_isolated()
+            if handle is None:
+                handle = self._raw(Command.NEW_WINDOW, {"type": "tab"})[
+                    "handle"
+                ]
+                self._current = None
+        return Tab(
+            handle=handle,
+            driver=self._tab_driver(handle),
+            browser_context=browser_context,
+        )
+
+    def close_tab(self, tab: Tab) -> None:
+        """
+        Close a tab and drop its cookies.
+
+        Isolated tabs take their browser context, and its cookies, with
+        them. Other tabs delete the cookies of the site they visited.
+        """
+        release_resource_blocking(tab.driver)
+        with self.lock:
+            try:
+                self._switch(tab.handle)
+                if tab.browser_context is None:
+                    self._raw(Command.DELETE_ALL_COOKIES)
+                self._raw(Command.CLOSE)
+            finally:
+                self._current = None
+                if tab.browser_context is not None:
+                    with contextlib.suppress(WebDriverException):
+                        self.driver.execute_cdp_cmd(
+                            "Target.disposeBrowserContext",
+                            {"browserContextId": tab.browser_context},
+                        )
+                self._switch(self.base_handle)
+
+    def navigate(self, tab_driver: Any, url: str) -> None:
+        """
+        Load a page in a tab without holding the session.
+
+        Raises:
+            TimeoutException: If the page does not load in time
+        """
+        tab_driver.execute_script(NAVIGATE_SCRIPT, url)
+        deadline = time.monotonic() + self.page_load_timeout
+        while True:
+            try:
+                if tab_driver.execute_script(LOADED_SCRIPT):
+                    return
+            except NoSuchWindowException:
+                raise
+            except WebDriverException:
+                # The old document unloads while the new one starts.
+                pass
+            if time.monotonic() >= deadline:
+                raise TimeoutException(
+                    f"Tab page load timed out after {self.page_load_timeout}s"
+                )
+            time.sleep(self.poll_interval)
+
+    def _open_isolated(self) -> tuple[str | None, str | None]:
+        try:
+            browser_context = self.driver.execute_cdp_cmd(
+                "Target.createBrowserContext", {}
+            )["browserContextId"]
+        except WebDriverException as e:
+            logger.warning("Isolated tab unavailable, sharing cookies: %s", e)
+            return None, None
+
+        try:
+            handle = self.driver.execute_cdp_cmd(
+                "Target.createTarget",
+                {"url": "about:blank", "browserContextId": browser_context},
+            )["targetId"]
+            # ChromeDriver window handles are DevTools target ids.
+            self._switch(handle)
+        except WebDriverException as e:
+            logger.warning("Isolated tab unavailable, sharing cookies: %s", e)
+            self._current = None
+            with contextlib.suppress(WebDriverException):
+                self.driver.execute_cdp_cmd(
+                    "Target.disposeBrowserContext",
+                    {"browserContextId": browser_context},
+                )
+            return None, None
+        return browser_context, handle
+
+    def _tab_driver(self, handle: str) -> Any:
+        # A shallow copy shares the session; its own execute routes every
+        # command, including those of elements it finds, through the tab.
+        tab_driver = copy.copy(self.driver)
+        raw_execute = type(self.driver).execute
+
+        def execute(command: str, params: Any = None) -> Any:
+            with self.lock:
+                self._switch(handle)
+                return raw_execute(tab_driver, command, params)
+
+        @contextlib.contextmanager
+        def context(name: str) -> Iterator[None]:
+            # Firefox contexts are session wide; keep other tabs out.
+            with self.lock, type(self.driver).context(tab_driver, name):
+                yield
+
+        tab_driver.execute = execute
+        tab_driver.get = lambda url: self.navigate(tab_driver, url)
+        tab_driver.quit = lambda: None
+        tab_driver.tab_browser = self.driver
+        if hasattr(self.driver, "_switch_to"):
+            tab_driver._switch_to = type(self.driver._switch_to)(tab_driver)
+        if hasattr(self.driver, "CONTEXT_CHROME"):
+            tab_driver.context = context
+        return tab_driver
+
+    def _switch(self, handle: str) -> None:
+        if self._current != handle:
+            self._raw(Command.SWITCH_TO_WINDOW, {"handle": handle})
+            self._current = handle
+
+    def _raw(self, command: str, params: Any = None) -> Any:
+        response = self.driver.execute(command, params)
+        return response.get("value") if response else None
+
+
+@dataclass
+class _Host:
+    """Leased browser serving tabs."""
+
+    tabs: BrowserTabs
+    lease: Any
+    open: int = 0
+    broken: bool = False
+    retiring: bool = False
+
+
+class TabPool:
+    """
+    Lease tabs of pooled browsers, several scrapes per browser.
+
+    Tabs are packed into the busiest browser with room, and a new browser
+    is leased from the pool only when every browser is full. A browser
+    goes back to the pool when its last tab closes. Every tab counts as a
+    page of its browser, and a browser past a lifecycle limit gets no new
+    tabs, so it drains and is recycled by the pool.
+    """
+
+    def __init__(
+        self,
+        pool: BrowserPool,
+        max_tabs: int,
+        isolate: bool = True,
+        page_load_timeout: float = 60,
+    ) -> None:
+        """
+        Initialize tab pool.
+
+        Args:
+            pool: Pool the browsers are leased from
+            max_tabs: Concurrent tabs per browser
+            isolate: Give Chrome tabs their own cookie jar
+            page_load_timeout: Seconds a tab waits for a page to load
+        """
+        self.pool = pool
+        self.max_tabs = max_tabs
+        self.isolate = isolate
+        self.page_load_timeout = page_load_timeout
+
+        self._hosts: list[_Host] = []
+        self._launching = 0
+        self._condition = threading.Condition()
+
+    @property
+    def open_tabs(self) -> int:
+        """Tabs currently leased."""
+        with self._condition:
+            return sum(host.open for host in self._hosts)
+
+    @contextlib.contextmanager
+    def lease(self) -> Iterator[Any]:
+        """
+        Lease a tab for the duration of the context.
+
+        Yields:
+            Driver bound to the tab
+
+        Raises:
+            BrowserPoolTimeoutError: If no tab frees up in time
+        """
+        host = self._acquire()
+        tab = None
+        try:
+            tab = host.tabs.open_tab()
+            yield tab.driver
+        except TimeoutException:
+            raise
+        except WebDriverException:
+            host.broken = True
+            raise
+        finally:
+            if tab is not None:
+                try:
+                    host.tabs.close_tab(tab)
+                except WebDriverException as e:
+                    logger.warning("Failed to close tab: %s", e)
+                    host.broken = True
+            self._release(host)
+
+    def _acquire(self) -> _Host:
+        deadline = time.monotonic() + self.pool.lease_timeout
+        with self._condition:
+            while True:
+                usable = [
+                    host
+                    for host in self._hosts
+                    if not host.broken
+                    and not host.retiring
+                    and host.open < self.max_tabs
+                ]
+                if usable:
+                    host = max(usable, key=lambda host: host.open)
+                    host.open += 1
+                    return host
+                if len(self._hosts) + self._launching < self.pool.max_size:
+                    self._launching += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise BrowserPoolTimeoutError(
+                        f"No {self.pool.name} tab available after "
+                        f"{self.pool.lease_timeout}s"
+                    )
+                self._condition.wait(remaining)
+
+        lease = self.pool.lease()
+        try:
+            driver = lease.__enter__()
+            try:
+                tabs = BrowserTabs(
+                    driver,
+                    isolate=self.isolate,
+                    page_load_timeout=self.page_load_timeout,
+                )
+            except BaseException as e:
+                lease.__exit__(type(e), e, e.__traceback__)
+                raise
+        finally:
+            with self._condition:
+                self._launching -= 1
+                self._condition.notify_all()
+
+        host = _Host(tabs=tabs, lease=lease, open=1)
+        with self._condition:
+            self._hosts.append(host)
+        return host
+
+    def _release(self, host: _Host) -> None:
+        with self._condition:
+            host.open -= 1
+            drained = host.open == 0
+            if drained:
+                self._hosts.remove(host)
+            else:
+                self._check_lifecycle(host)
+            self._condition.notify_all()
+
+        if not drained:
+            return
+        if host.broken:
+            error = WebDriverException(f"{self.pool.name} tab failed")
+            host.lease.__exit__(WebDriverException, error, None)
+        else:
+            host.lease.__exit__(None, None, None)
+
+    def _check_lifecycle(self, host: _Host) -> None:
+        """Count a closed tab and stop filling a browser past a limit."""
+        # The pool counts the last tab when the drained browser returns.
+        lifecycle = self.pool.lifecycle
+        if lifecycle is None:
+            return
+        lifecycle.record_page(host.tabs.driver)
+        if lifecycle.recycle_reason(host.tabs.driver) is not None:
+            host.retiring = True
+
+
+class TabPoolRegistry:
+    """Tab pools created on demand for browser pools."""
+
+    def __init__(self) -> None:
+        self._pools: dict[int, TabPool] = {}
+        self._lock = threading.Lock()
+
+    def get(self, pool: BrowserPool, **tab_kwargs: Any) -> TabPool:
+        """
+        Get the tab pool of a browser pool.
+
+        Args:
+            pool: Browser pool the tabs live in
+            **tab_kwargs: Extra TabPool arguments
+
+        Returns:
+            TabPool instance
+        """
+        with self._lock:
+            tab_pool = self._pools.get(id(pool))
+            if tab_pool is None or tab_pool.pool is not pool:
+                tab_pool = TabPool(pool, **tab_kwargs)
+                self._pools[id(pool)] = tab_pool
+            return tab_pool
@@ -13,6 +13,7 @@ from tbselenium.common import USE_RUNNING_TOR
 from tbselenium.tbdriver import TorBrowserDriver
 
 from app.core.browsers.abc import Browser
+from app.core.browsers.lifecycle import DriverLifecycle
 
 
 class TorBrowser(Browser):
@@ -25,9 +26,22 @@ class TorBrowser(Browser):
         tor_browser_path: str | None = None,
         tor_data_dir: str | None = None,
         use_running_tor: bool = False,
+        socks_port: int | None = None,
+        control_port: int | None = None,
+        lifecycle: DriverLifecycle | None = None,
     ) -> None:
         """
         Initialize Tor Browser.
+
+        Args:
+            headless: Run browser in headless mode
+            multi_instances: Allow multiple browser instances
+            tor_browser_path: Tor Browser installation directory
+            tor_data_dir: Tor data directory
+            use_running_tor: Attach to an already running tor process
+            socks_port: SOCKS port of the running tor process
+            control_port: Control port of the running tor process
+            lifecycle: Limits the single shared instance is recycled past
         """
         self.tor_browser_path = (
             tor_browser_path
@@ -38,7 +52,13 @@ class TorBrowser(Browser):
             "TOR_DATA_DIR", "/tmp/tor-data"
         )
         self.use_running_tor = use_running_tor
-        super().__init__(headless=headless, multi_instances=multi_instances)
+        self.socks_port = socks_port
+        self.control_port = control_port
+        super().__init__(
+            headless=headless,
+            multi_instances=multi_instances,
+            lifecycle=lifecycle,
+        )
 
     @staticmethod
     def _detect_tor_browser_path() -> str:
@@ -187,7 +207,7 @@ class TorBrowser(Browser):
                     "TOR_BROWSER_PATH environment variable."
                 ) from e
 
-        driver_kwargs = {}
+        driver_kwargs: dict[str, Any] = {}
         if self.tor_data_dir:
             tor_data_dir = os.path.abspath(
                 os.path.expanduser(self.tor_data_dir)
@@ -195,7 +215,11 @@ class TorBrowser(Browser):
             os.makedirs(tor_data_dir, exist_ok=True)
             driver_kwargs["tor_data_dir"] = tor_data_dir
         if self.use_running_tor:
-            driver_kwargs["use_running_tor"] = USE_RUNNING_TOR
+            driver_kwargs["tor_cfg"] = USE_RUNNING_TOR
+            if self.socks_port:
+                driver_kwargs["socks_port"] = self.socks_port
+            if self.control_port:
+                driver_kwargs["control_port"] = self.control_port
 
         driver = TorBrowserDriver(tor_browser_path, **driver_kwargs)
         driver.implicitly_wait(5)
@@ -211,7 +235,4 @@ class TorBrowser(Browser):
         if self.multi_instances:
             return self._create_driver()
 
-        if not self.instance:
-            self.instance = self._create_driver()
-
-        return self.instance
+        return self._shared_instance(self._create_driver)
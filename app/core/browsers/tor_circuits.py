@@ -0,0 +1,221 @@
+"""Tor Circuit Scheduling Module"""
+
+import contextlib
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+logger = logging.getLogger(__name__)
+
+CircuitStrategy = Literal["round_robin", "latency"]
+
+
+@dataclass
+class TorCircuit:
+    """Isolated SOCKS port of the shared tor and its measured performance."""
+
+    port: int
+    active: int = 0
+    completed: int = 0
+    failed: int = 0
+    consecutive_failures: int = 0
+    latency: float | None = None
+    samples: int = 0
+    busy_seconds: float = 0.0
+    rotations: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def throughput(self) -> float:
+        """Completed scrapes per second of circuit busy time."""
+        if self.busy_seconds <= 0:
+            return 0.0
+        return self.completed / self.busy_seconds
+
+    def reset(self) -> None:
+        """Forget measurements taken on the previous circuit."""
+        self.consecutive_failures = 0
+        self.latency = None
+        self.samples = 0
+        self.started_at = time.monotonic()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize circuit statistics."""
+        return {
+            "port": self.port,
+            "active": self.active,
+            "completed": self.completed,
+            "failed": self.failed,
+            "latency": self.latency,
+            "throughput": round(self.throughput, 3),
+            "rotations": self.rotations,
+        }
+
+
+class TorCircuitManager:
+    """Assign scrapes to isolated Tor circuits and rotate bad ones."""
+
+    def __init__(
+        self,
+        ports: list[int],
+        strategy: CircuitStrategy = "latency",
+        max_failures: int = 3,
+        slow_factor: float = 3.0,
+        rotate: Callable[[], None] | None = None,
+        min_rotate_interval: float = 10,
+        min_samples: int = 3,
+        smoothing: float = 0.3,
+    ) -> None:
+        """
+        Initialize circuit manager.
+
+        Args:
+            ports: SOCKS ports, one isolation group each
+            strategy: 'round_robin' or 'latency' circuit assignment
+            max_failures: Consecutive failures before a circuit is rotated
+            slow_factor: Latency multiple of the fastest circuit at which a
+                circuit is rotated
+            rotate: Callable requesting fresh circuits from Tor
+            min_rotate_interval: Minimum seconds between rotations
+            min_samples: Measurements required before judging latency
+            smoothing: Weight of the newest latency sample
+        """
+        if not ports:
+            raise ValueError("At least one Tor circuit port is required")
+
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.slow_factor = slow_factor
+        self.rotate = rotate
+        self.min_rotate_interval = min_rotate_interval
+        self.min_samples = min_samples
+        self.smoothing = smoothing
+
+        self._circuits = [TorCircuit(port=port) for port in ports]
+        self._cycle = itertools.cycle(self._circuits)
+        self._last_rotation = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def ports(self) -> list[int]:
+        """SOCKS port of every circuit."""
+        return [circuit.port for circuit in self._circuits]
+
+    def acquire(self) -> TorCircuit:
+        """
+        Pick the circuit for the next scrape.
+
+        Round robin cycles through the circuits. The latency strategy picks
+        the circuit with the lowest expected completion time, trying circuits
+        without measurements first.
+
+        Returns:
+            Assigned TorCircuit
+        """
+        with self._lock:
+            if self.strategy == "round_robin":
+                circuit = next(self._cycle)
+            else:
+                circuit = min(self._circuits, key=self._expected_latency)
+            circuit.active += 1
+            return circuit
+
+    def release(
+        self, circuit: TorCircuit, elapsed: float | None, success: bool
+    ) -> None:
+        """
+        Record the outcome of a scrape on a circuit.
+
+        Args:
+            circuit: Circuit returned by acquire()
+            elapsed: Seconds the scrape spent on the circuit, or None if it
+                never used the circuit
+            success: Whether the scrape succeeded
+        """
+        with self._lock:
+            circuit.active -= 1
+            if elapsed is None:
+                return
+
+            circuit.busy_seconds += elapsed
+            if success:
+                circuit.completed += 1
+                circuit.consecutive_failures = 0
+                circuit.samples += 1
+                if circuit.latency is None:
+                    circuit.latency = elapsed
+                else:
+                    circuit.latency += self.smoothing * (
+                        elapsed - circuit.latency
+                    )
+            else:
+                circuit.failed += 1
+                circuit.consecutive_failures += 1
+
+            reason = self._rotation_reason(circuit)
+            if reason is None or not self._claim_rotation():
+                return
+            circuit.rotations += 1
+            circuit.reset()
+
+        logger.warning("Rotating Tor circuit %d: %s", circuit.port, reason)
+        if self.rotate is not None:
+            try:
+                self.rotate()
+            except Exception as e:
+                logger.warning("Tor circuit rotation failed: %s", e)
+
+    @contextlib.contextmanager
+    def lease(self) -> Iterator[TorCircuit]:
+        """
+        Hold a circuit for the duration of a block.
+
+        Yields:
+            Assigned TorCircuit
+        """
+        circuit = self.acquire()
+        started = time.monotonic()
+        success = False
+        try:
+            yield circuit
+            success = True
+        finally:
+            self.release(circuit, time.monotonic() - started, success)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Statistics of every circuit."""
+        with self._lock:
+            return [circuit.to_dict() for circuit in self._circuits]
+
+    def _expected_latency(self, circuit: TorCircuit) -> tuple[float, int]:
+        if circuit.latency is None:
+            return 0.0, circuit.active
+        return circuit.latency * (circuit.active + 1), circuit.active
+
+    def _rotation_reason(self, circuit: TorCircuit) -> str | None:
+        if circuit.consecutive_failures >= self.max_failures:
+            return f"{circuit.consecutive_failures} consecutive failures"
+
+        if circuit.latency is None or circuit.samples < self.min_samples:
+            return None
+        others = [
+            other.latency
+            for other in self._circuits
+            if other is not circuit
+            and other.latency is not None
+            and other.samples >= self.min_samples
+        ]
+        if others and circuit.latency > self.slow_factor * min(others):
+            return f"latency {circuit.latency:.2f}s vs {min(others):.2f}s"
+        return None
+
+    def _claim_rotation(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_rotation < self.min_rotate_interval:
+            return False
+        self._last_rotation = now
+        return True
@@ -0,0 +1,314 @@
+"""Shared Tor Process Module"""
+
+import contextlib
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from app.core.errors import TorProcessError
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_TOR_BINARY = os.path.join("Browser", "TorBrowser", "Tor", "tor")
+
+
+class TorControl:
+    """Minimal client for the Tor control protocol."""
+
+    def __init__(
+        self,
+        port: int,
+        cookie_path: str | None = None,
+        host: str = "127.0.0.1",
+        timeout: float = 5,
+    ) -> None:
+        """
+        Initialize control client.
+
+        Args:
+            port: Tor control port
+            cookie_path: Path to control_auth_cookie, if cookie auth is used
+            host: Tor control host
+            timeout: Socket timeout in seconds
+        """
+        self.port = port
+        self.cookie_path = cookie_path
+        self.host = host
+        self.timeout = timeout
+        self._socket: Any = None
+        self._file: Any = None
+
+    def __enter__(self) -> "TorControl":
+        self._socket = socket.create_connection(
+            (self.host, self.port), timeout=self.timeout
+        )
+        self._file = self._socket.makefile("rwb")
+        self.authenticate()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        with contextlib.suppress(Exception):
+            self.command("QUIT")
+        with contextlib.suppress(Exception):
+            self._file.close()
+        with contextlib.suppress(Exception):
+            self._socket.close()
+
+    def authenticate(self) -> None:
+        """Authenticate with the auth cookie, or with no credentials."""
+        secret = ""
+        if self.cookie_path:
+            secret = Path(self.cookie_path).read_bytes().hex()
+        self.command(f"AUTHENTICATE {secret}".strip())
+
+    def command(self, line: str) -> list[str]:
+        """
+        Send one command and read its reply.
+
+        Args:
+            line: Control protocol command
+
+        Returns:
+            Reply lines without status codes
+
+        Raises:
+            TorProcessError: If Tor replies with an error status
+        """
+        self._file.write(f"{line}\r\n".encode())
+        self._file.flush()
+
+        replies = []
+        while True:
+            raw = self._file.readline()
+            if not raw:
+                raise TorProcessError("Tor control connection closed")
+            reply = raw.decode(errors="replace").rstrip("\r\n")
+            status, separator, text = reply[:3], reply[3:4], reply[4:]
+            if not status.startswith("2"):
+                raise TorProcessError(f"Tor control error: {reply}")
+            replies.append(text)
+            if separator == " ":
+                return replies
+
+    def get_info(self, key: str) -> str:
+        """Read a GETINFO value."""
+        for reply in self.command(f"GETINFO {key}"):
+            if reply.startswith(f"{key}="):
+                return reply[len(key) + 1 :]
+        return ""
+
+    def bootstrap_progress(self) -> int:
+        """Bootstrap completion percentage reported by Tor."""
+        phase = self.get_info("status/bootstrap-phase")
+        for token in phase.split():
+            if token.startswith("PROGRESS="):
+                return int(token.split("=", 1)[1])
+        return 0
+
+
+class TorProcess:
+    """Long-running tor daemon shared by every Tor Browser driver."""
+
+    def __init__(
+        self,
+        tor_binary: str | None = None,
+        socks_port: int = 9050,
+        control_port: int = 9051,
+        data_dir: str = "/tmp/tor-shared",
+        bootstrap_timeout: float = 120,
+        extra_socks_ports: list[int] | None = None,
+    ) -> None:
+        """
+        Initialize shared Tor process.
+
+        Args:
+            tor_binary: Path to the tor executable, detected when omitted
+            socks_port: SOCKS port Tor Browser connects through
+            control_port: Control port used for health checks
+            data_dir: Tor data directory
+            bootstrap_timeout: Seconds to wait for Tor to bootstrap
+            extra_socks_ports: Additional SOCKS ports, each isolated from
+                the others so they use separate circuits
+        """
+        self.tor_binary = tor_binary
+        self.socks_port = socks_port
+        self.extra_socks_ports = list(extra_socks_ports or [])
+        self.control_port = control_port
+        self.data_dir = os.path.abspath(os.path.expanduser(data_dir))
+        self.bootstrap_timeout = bootstrap_timeout
+
+        self._process: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def detect_binary(tor_browser_path: str | None = None) -> str | None:
+        """
+        Find a tor executable in the Tor Browser bundle or on PATH.
+
+        Args:
+            tor_browser_path: Tor Browser installation directory
+
+        Returns:
+            Path to tor, or None if not found
+        """
+        if tor_browser_path:
+            bundled = os.path.join(
+                os.path.expanduser(tor_browser_path), BUNDLED_TOR_BINARY
+            )
+            if os.path.isfile(bundled):
+                return bundled
+        return shutil.which("tor")
+
+    @property
+    def socks_ports(self) -> list[int]:
+        """Every SOCKS port the process listens on, primary first."""
+        return [self.socks_port, *self.extra_socks_ports]
+
+    @property
+    def cookie_path(self) -> str:
+        """Path of the control auth cookie written by Tor."""
+        return os.path.join(self.data_dir, "control_auth_cookie")
+
+    @property
+    def is_managed(self) -> bool:
+        """Whether this object launched the running tor process."""
+        return self._process is not None and self._process.poll() is None
+
+    def control(self) -> TorControl:
+        """
+        Open an authenticated control connection.
+
+        The auth cookie is read from the data directory whenever it is
+        there, so a tor launched by another worker process can be
+        controlled too.
+        """
+        cookie_path = (
+            self.cookie_path
+            if self.is_managed or os.path.isfile(self.cookie_path)
+            else None
+        )
+        return TorControl(self.control_port, cookie_path=cookie_path)
+
+    def is_healthy(self) -> bool:
+        """Check Tor answers on its control port and is bootstrapped."""
+        if self._process is not None and self._process.poll() is not None:
+            return False
+        try:
+            with self.control() as control:
+                return control.bootstrap_progress() >= 100
+        except (OSError, TorProcessError):
+            return self._process is None and self._socks_listening()
+
+    def ensure_running(self, tor_browser_path: str | None = None) -> None:
+        """
+        Make sure a healthy Tor is listening, restarting it if needed.
+
+        Args:
+            tor_browser_path: Tor Browser bundle searched for a tor binary
+                when none was configured
+
+        Raises:
+            TorProcessError: If Tor cannot be started or bootstrapped
+        """
+        with self._lock:
+            if self.is_healthy():
+                return
+            if self._process is not None:
+                logger.warning("Shared tor process unhealthy, restarting")
+            self._stop()
+            if not self.tor_binary:
+                self.tor_binary = self.detect_binary(tor_browser_path)
+            self._start()
+
+    def signal_newnym(self) -> None:
+        """
+        Ask Tor to build fresh circuits for new connections.
+
+        Raises:
+            TorProcessError: If Tor rejects the signal
+        """
+        with self.control() as control:
+            control.command("SIGNAL NEWNYM")
+
+    def stop(self) -> None:
+        """Stop the managed tor process."""
+        with self._lock:
+            self._stop()
+
+    def _start(self) -> None:
+        if not self.tor_binary:
+            raise TorProcessError(
+                "tor executable not found. Install tor or set TOR_BINARY_PATH."
+            )
+
+        os.makedirs(self.data_dir, mode=0o700, exist_ok=True)
+        env = dict(os.environ)
+        tor_dir = os.path.dirname(os.path.abspath(self.tor_binary))
+        env["LD_LIBRARY_PATH"] = os.pathsep.join(
+            filter(None, [tor_dir, env.get("LD_LIBRARY_PATH")])
+        )
+
+        torrc = os.path.join(self.data_dir, "torrc")
+        with open(torrc, "w", encoding="utf-8") as config:
+            for port in self.socks_ports:
+                config.write(f"SocksPort {port}\n")
+            config.write(f"ControlPort {self.control_port}\n")
+            config.write("CookieAuthentication 1\n")
+            config.write(f"DataDirectory {self.data_dir}\n")
+
+        logger.info(
+            "Starting shared tor on SOCKS ports %s, control port %d",
+            self.socks_ports,
+            self.control_port,
+        )
+        self._process = subprocess.Popen(
+            [self.tor_binary, "-f", torrc],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self._wait_for_bootstrap()
+
+    def _wait_for_bootstrap(self) -> None:
+        deadline = time.monotonic() + self.bootstrap_timeout
+        while time.monotonic() < deadline:
+            if self._process is None or self._process.poll() is not None:
+                raise TorProcessError("tor exited during bootstrap")
+            try:
+                with self.control() as control:
+                    if control.bootstrap_progress() >= 100:
+                        logger.info("Shared tor bootstrapped")
+                        return
+            except (OSError, TorProcessError):
+                pass
+            time.sleep(0.5)
+
+        self._stop()
+        raise TorProcessError(
+            f"tor did not bootstrap within {self.bootstrap_timeout}s"
+        )
+
+    def _stop(self) -> None:
+        process, self._process = self._process, None
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    def _socks_listening(self) -> bool:
+        try:
+            with socket.create_connection(
+                ("127.0.0.1", self.socks_port), timeout=2
+            ):
+                return True
+        except OSError:
+            return False
@@ -0,0 +1,231 @@
+"""Async WebDriver Module"""
+
+import asyncio
+import contextlib
+import json
+from typing import Any
+from urllib.parse import urlsplit
+
+import h11
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+
+from app.core.metrics import CommandStats
+
+
+class AsyncWebDriver:
+    """
+    Non-blocking client of an existing W3C WebDriver session.
+
+    Selenium drivers block the calling thread for every command, including
+    page loads. This client speaks the same protocol over an asyncio
+    connection to the driver server, so a session launched and pooled by
+    Selenium can be driven from an event loop. Commands of a session are
+    serialized over one keep-alive connection, as the server runs them one
+    at a time anyway.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        session_id: str,
+        timeout: float = 120,
+        stats: CommandStats | None = None,
+    ) -> None:
+        """
+        Initialize async WebDriver client.
+
+        Args:
+            server_url: Base URL of the driver server
+            session_id: Session the commands are sent to
+            timeout: Seconds a command may take, page loads included
+            stats: Counts the commands sent and bytes received
+        """
+        parts = urlsplit(server_url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Unsupported WebDriver server: {server_url}")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.base_path = parts.path.rstrip("/")
+        self.session_id = session_id
+        self.timeout = timeout
+        self.stats = stats if stats is not None else CommandStats()
+
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._connection: h11.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_driver(cls, driver: Any, **kwargs: Any) -> "AsyncWebDriver":
+        """
+        Attach to the session of a Selenium driver.
+
+        Args:
+            driver: Selenium WebDriver instance
+            **kwargs: Extra AsyncWebDriver arguments
+
+        Returns:
+            AsyncWebDriver sending commands to the driver's session
+        """
+        executor = driver.command_executor
+        config = getattr(executor, "client_config", None)
+        server_url = getattr(config, "remote_server_addr", None) or getattr(
+            executor, "_url", None
+        )
+        return cls(str(server_url), driver.session_id, **kwargs)
+
+    async def get(self, url: str) -> None:
+        """Load a page, returning once the driver considers it loaded."""
+        await self.execute("get", "POST", "/url", {"url": url})
+
+    async def execute_script(self, script: str, *args: Any) -> Any:
+        """Run a synchronous script in the current page."""
+        return await self.execute(
+            "w3cExecuteScript",
+            "POST",
+            "/execute/sync",
+            {"script": script, "args": list(args)},
+        )
+
+    async def title(self) -> str:
+        """Title of the current page."""
+        title = await self.execute("getTitle", "GET", "/title")
+        return str(title)
+
+    async def execute(
+        self,
+        command: str,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        """
+        Send a command to the session.
+
+        Args:
+            command: Selenium command name, for the statistics
+            method: HTTP method
+            path: Endpoint relative to the session
+            params: JSON body
+
+        Returns:
+            The command's value
+
+        Raises:
+            WebDriverException: The error the driver reported, mapped to
+                the Selenium exception of its kind
+        """
+        target = f"{self.base_path}/session/{self.session_id}{path}"
+        body = json.dumps(params if params is not None else {}).encode()
+        if method == "GET":
+            body = b""
+        status, data = await self._request(method, target, body)
+
+        if status >= 400:
+            ErrorHandler().check_response(
+                {"status": status, "value": data.decode("utf-8", "replace")}
+            )
+        response = json.loads(data) if data else {}
+        self.stats.record(command, response)
+        return response.get("value")
+
+    async def close(self) -> None:
+        """Close the connection, leaving the session running."""
+        async with self._lock:
+            self._disconnect()
+
+    async def _request(
+        self, method: str, target: str, body: bytes
+    ) -> tuple[int, bytes]:
+        async with self._lock:
+            reused = self._connection is not None
+            try:
+                return await self._exchange(method, target, body)
+            except (ConnectionError, h11.RemoteProtocolError):
+                self._disconnect()
+                if not reused:
+                    raise
+            # The server closed an idle keep-alive connection before
+            # reading the request; send it again on a fresh one.
+            try:
+                return await self._exchange(method, target, body)
+            except (ConnectionError, h11.RemoteProtocolError):
+                self._disconnect()
+                raise
+
+    async def _exchange(
+        self, method: str, target: str, body: bytes
+    ) -> tuple[int, bytes]:
+        try:
+            async with asyncio.timeout(self.timeout):
+                return await self._send(method, target, body)
+        except TimeoutError as e:
+            # The response may still arrive; the connection is unusable.
+            self._disconnect()
+            raise TimeoutException(
+                f"WebDriver command timed out after {self.timeout}s"
+            ) from e
+        except asyncio.CancelledError:
+            self._disconnect()
+            raise
+
+    async def _send(
+        self, method: str, target: str, body: bytes
+    ) -> tuple[int, bytes]:
+        if self._connection is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+            self._connection = h11.Connection(h11.CLIENT)
+        connection, reader, writer = (
+            self._connection,
+            self._reader,
+            self._writer,
+        )
+        assert reader is not None and writer is not None
+
+        headers = [
+            ("Host", f"{self.host}:{self.port}"),
+            ("Accept", "application/json"),
+            ("Content-Type", "application/json;charset=UTF-8"),
+            ("Content-Length", str(len(body))),
+        ]
+        writer.write(
+            connection.send(
+                h11.Request(method=method, target=target, headers=headers)
+            )
+        )
+        if body:
+            writer.write(connection.send(h11.Data(data=body)))
+        writer.write(connection.send(h11.EndOfMessage()))
+        await writer.drain()
+
+        status = 0
+        chunks: list[bytes] = []
+        while True:
+            event = connection.next_event()
+            if event is h11.NEED_DATA:
+                connection.receive_data(await reader.read(65536))
+            elif isinstance(event, h11.Response):
+                status = event.status_code
+            elif isinstance(event, h11.Data):
+                chunks.append(bytes(event.data))
+            elif isinstance(event, h11.EndOfMessage):
+                break
+            elif isinstance(event, h11.ConnectionClosed):
+                raise ConnectionError("WebDriver server closed connection")
+
+        if connection.our_state is h11.DONE and (
+            connection.their_state is h11.DONE
+        ):
+            connection.start_next_cycle()
+        else:
+            self._disconnect()
+        return status, b"".join(chunks)
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            with contextlib.suppress(Exception):
+                self._writer.close()
+        self._reader = self._writer = self._connection = None
@@ -7,3 +7,43 @@ class ScrapingError(Exception):
     """Raised when a scraping operation fails."""
 
     pass
+
+
+class BrowserPoolTimeoutError(ScrapingError):
+    """Raised when no pooled browser becomes available in time."""
+
+    pass
+
+
+class JobQueueFullError(ScrapingError):
+    """Raised when the scrape job queue cannot accept more jobs."""
+
+    pass
+
+
+class TorProcessError(ScrapingError):
+    """Raised when the shared Tor process cannot be started."""
+
+    pass
+
+
+class HttpStatusError(ScrapingError):
+    """Raised when a page fetched over HTTP answers with an error status."""
+
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class HttpConnectionError(ScrapingError):
+    """Raised when a page fetched over HTTP cannot be connected to."""
+
+    pass
+
+
+class AdmissionRejectedError(ScrapingError):
+    """Raised when a scrape is shed because its browser type is saturated."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
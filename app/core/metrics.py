@@ -0,0 +1,414 @@
+"""
+In-process metrics exposed in the Prometheus text format.
+"""
+
+import bisect
+import contextlib
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import Counter as CommandCounter
+from collections.abc import Iterator
+from typing import Any, TypeVar
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+)
+
+BYTES_BUCKETS = (
+    1024,
+    8 * 1024,
+    64 * 1024,
+    256 * 1024,
+    1024 * 1024,
+    4 * 1024 * 1024,
+    16 * 1024 * 1024,
+)
+
+COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+MetricT = TypeVar("MetricT", bound="Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """Base class of labelled metrics."""
+
+    kind = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        """
+        Initialize metric.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, "
+                f"got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        """Prometheus text lines of this metric."""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        """Sample lines of every label set."""
+        pass
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Increase the count for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Current count for a label set."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}"
+            f"{_format_labels(dict(zip(self.labelnames, key, strict=True)))}"
+            f" {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """
+        Initialize histogram.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample carries
+            buckets: Sorted upper bounds of the buckets
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record one observation for a label set."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(
+                key, [0] * (len(self.buckets) + 1)
+            )
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: Any) -> int:
+        """Number of observations for a label set."""
+        with self._lock:
+            return sum(self._counts.get(self._key(labels), []))
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            series = sorted(
+                (key, list(counts), self._sums[key])
+                for key, counts in self._counts.items()
+            )
+
+        lines = []
+        for key, counts, total in series:
+            labels = dict(zip(self.labelnames, key, strict=True))
+            cumulative = 0
+            for bound, count in zip(
+                (*self.buckets, float("inf")), counts, strict=True
+            ):
+                cumulative += count
+                bucket = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            suffix = _format_labels(labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        """Register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Register a histogram."""
+        return self._register(
+            Histogram(name, documentation, labelnames, buckets)
+        )
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: MetricT) -> MetricT:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+class StageTimings:
+    """Wall-clock durations of the stages of one scrape."""
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block as the named stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + (
+                time.perf_counter() - started
+            )
+
+    def total(self) -> float:
+        """Seconds since the timings started."""
+        return time.perf_counter() - self._started
+
+    def as_milliseconds(self) -> dict[str, float]:
+        """Stage durations in milliseconds, including the total."""
+        timings = {
+            name: round(seconds * 1000, 3)
+            for name, seconds in self.durations.items()
+        }
+        timings["total"] = round(self.total() * 1000, 3)
+        return timings
+
+    def observe(self, browser_type: str) -> None:
+        """Record the stage durations in the stage histogram."""
+        for name, seconds in self.durations.items():
+            scrape_stage_seconds.observe(
+                seconds, browser_type=browser_type, stage=name
+            )
+        scrape_stage_seconds.observe(
+            self.total(), browser_type=browser_type, stage="total"
+        )
+
+
+class CommandStats:
+    """WebDriver commands sent and bytes received by one driver."""
+
+    def __init__(self) -> None:
+        self.commands: CommandCounter[str] = CommandCounter()
+        self.bytes = 0
+
+    def reset(self) -> None:
+        """Start counting a new scrape."""
+        self.commands = CommandCounter()
+        self.bytes = 0
+
+    def record(self, command: str, response: Any) -> None:
+        """Count one command and the size of its result."""
+        self.commands[command] += 1
+        if isinstance(response, dict):
+            self.bytes += payload_size(response.get("value"))
+
+    def observe(self, browser_type: str) -> None:
+        """Record the counts in the WebDriver metrics."""
+        for command, count in self.commands.items():
+            webdriver_commands_total.inc(
+                count, browser_type=browser_type, command=command
+            )
+        webdriver_commands_per_scrape.observe(
+            sum(self.commands.values()), browser_type=browser_type
+        )
+        webdriver_response_bytes.observe(self.bytes, browser_type=browser_type)
+
+
+def payload_size(value: Any) -> int:
+    """Approximate size in bytes of a decoded WebDriver result."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(
+            len(str(key)) + payload_size(item) for key, item in value.items()
+        )
+    if isinstance(value, list | tuple):
+        return sum(payload_size(item) for item in value)
+    return 8 if value is not None else 0
+
+
+_instrumented: "weakref.WeakKeyDictionary[Any, CommandStats]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def instrument_driver(driver: Any) -> CommandStats:
+    """
+    Count the WebDriver commands a driver sends.
+
+    The driver's execute method is wrapped once; later calls return the
+    same statistics, reset for the new scrape.
+
+    Args:
+        driver: WebDriver instance
+
+    Returns:
+        CommandStats updated by every command the driver sends
+    """
+    stats = _instrumented.get(driver)
+    if stats is not None:
+        stats.reset()
+        return stats
+
+    stats = CommandStats()
+    execute = getattr(driver, "execute", None)
+    if callable(execute):
+
+        def counted_execute(command: str, params: Any = None) -> Any:
+            response = execute(command, params)
+            stats.record(command, response)
+            return response
+
+        driver.execute = counted_execute
+    _instrumented[driver] = stats
+    return stats
+
+
+metrics = MetricsRegistry()
+
+scrapes_total = metrics.counter(
+    "scraper_scrapes_total",
+    "Scrapes performed, by engine and outcome.",
+    ("browser_type", "outcome"),
+)
+
+scrape_stage_seconds = metrics.histogram(
+    "scraper_stage_seconds",
+    "Duration of each scrape stage in seconds.",
+    ("browser_type", "stage"),
+)
+
+admission_rejections_total = metrics.counter(
+    "scraper_admission_rejections_total",
+    "Scrapes rejected by admission control, by reason.",
+    ("browser_type", "reason"),
+)
+
+browser_recycles_total = metrics.counter(
+    "scraper_browser_recycles_total",
+    "Drivers recycled for exceeding a lifecycle limit, by reason.",
+    ("browser", "reason"),
+)
+
+webdriver_commands_total = metrics.counter(
+    "scraper_webdriver_commands_total",
+    "WebDriver commands sent, by command.",
+    ("browser_type", "command"),
+)
+
+webdriver_commands_per_scrape = metrics.histogram(
+    "scraper_webdriver_commands_per_scrape",
+    "WebDriver commands sent per scrape.",
+    ("browser_type",),
+    buckets=COUNT_BUCKETS,
+)
+
+webdriver_response_bytes = metrics.histogram(
+    "scraper_webdriver_response_bytes",
+    "Bytes of WebDriver results received per scrape.",
+    ("browser_type",),
+    buckets=BYTES_BUCKETS,
+)
@@ -73,6 +73,395 @@ class Settings(BaseSettings):
         description="Allowed headers for CORS",
     )
 
+    browser_pool_enabled: bool = Field(
+        default=True,
+        description="Reuse pre-launched browsers across scrape requests",
+    )
+
+    browser_pool_min_size: int = Field(
+        default=0,
+        ge=0,
+        description="Idle browsers kept warm per browser type",
+    )
+
+    browser_pool_max_size: int = Field(
+        default=2,
+        ge=1,
+        description="Maximum live browsers per browser type",
+    )
+
+    browser_pool_max_uses: int = Field(
+        default=50,
+        ge=1,
+        description="Scrapes served by a browser before it is recycled",
+    )
+
+    browser_pool_idle_timeout: int = Field(
+        default=300,
+        ge=0,
+        description="Seconds an idle browser is kept before eviction",
+    )
+
+    browser_pool_lease_timeout: int = Field(
+        default=60,
+        ge=0,
+        description="Seconds to wait for a free browser",
+    )
+
+    browser_max_tabs: int = Field(
+        default=1,
+        ge=1,
+        le=32,
+        description="Concurrent scrapes per browser, each in its own tab",
+    )
+
+    browser_tab_isolation: bool = Field(
+        default=True,
+        description="Give each Chrome tab its own cookie jar",
+    )
+
+    browser_tab_load_timeout: int = Field(
+        default=60,
+        ge=1,
+        description="Seconds a tab waits for its page to load",
+    )
+
+    browser_max_age: int = Field(
+        default=1800,
+        ge=0,
+        description="Seconds a browser lives before recycling, 0 for no limit",
+    )
+
+    browser_max_rss_mb: int = Field(
+        default=1536,
+        ge=0,
+        description="Browser process-tree RSS (MiB) that triggers recycling",
+    )
+
+    batch_max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum parallel browser sessions per batch request",
+    )
+
+    crawl_max_pages: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum pages scraped by one crawl request",
+    )
+
+    crawl_seen_capacity: int = Field(
+        default=1_000_000,
+        ge=1000,
+        description="URLs a crawl's seen-URL Bloom filter is sized for",
+    )
+
+    crawl_seen_error_rate: float = Field(
+        default=0.001,
+        gt=0,
+        lt=1,
+        description="False positive rate of the seen-URL Bloom filter",
+    )
+
+    job_workers: int = Field(
+        default=2,
+        ge=1,
+        description="Worker threads draining the scrape job queue",
+    )
+
+    job_queue_max_size: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum queued scrape jobs",
+    )
+
+    job_result_ttl: int = Field(
+        default=3600,
+        ge=0,
+        description="Seconds finished job results are kept",
+    )
+
+    jobs_persistent: bool = Field(
+        default=False,
+        description="Keep job state in the database for every worker",
+    )
+
+    cache_enabled: bool = Field(
+        default=True,
+        description="Serve repeated scrapes from the result cache",
+    )
+
+    cache_ttl: int = Field(
+        default=300,
+        ge=0,
+        description="Seconds a scrape result stays cached",
+    )
+
+    cache_max_entries: int = Field(
+        default=1000,
+        ge=1,
+        description="Maximum scrape results kept in memory",
+    )
+
+    cache_persistent: bool = Field(
+        default=False,
+        description="Also cache scrape results in the database",
+    )
+
+    extraction_plan_cache_size: int = Field(
+        default=256,
+        ge=1,
+        description="Compiled selector schemas kept for reuse",
+    )
+
+    extraction_plans_persistent: bool = Field(
+        default=False,
+        description="Keep named extraction plans in the database",
+    )
+
+    change_tracking_max_entries: int = Field(
+        default=10000,
+        ge=1,
+        description="Page versions kept in memory for change detection",
+    )
+
+    change_tracking_persistent: bool = Field(
+        default=False,
+        description="Also keep page versions in the database",
+    )
+
+    change_diff_max_lines: int = Field(
+        default=500,
+        ge=1,
+        description="Longest text diff reported for a changed page",
+    )
+
+    async_scraping: bool = Field(
+        default=True,
+        description="Drive browser scrapes of /scrape on the event loop",
+    )
+
+    coalesce_requests: bool = Field(
+        default=True,
+        description="Share one browser session among identical scrapes",
+    )
+
+    tor_shared_process: bool = Field(
+        default=True,
+        description="Attach Tor Browser drivers to one managed tor process",
+    )
+
+    tor_binary_path: str | None = Field(
+        default=None,
+        description="tor executable, detected from the bundle or PATH",
+    )
+
+    tor_socks_port: int = Field(
+        default=9050, ge=1, le=65535, description="Shared tor SOCKS port"
+    )
+
+    tor_control_port: int = Field(
+        default=9051, ge=1, le=65535, description="Shared tor control port"
+    )
+
+    tor_shared_data_dir: str = Field(
+        default="/tmp/tor-shared",
+        description="Data directory of the shared tor process",
+    )
+
+    tor_bootstrap_timeout: int = Field(
+        default=120,
+        ge=1,
+        description="Seconds to wait for the shared tor to bootstrap",
+    )
+
+    tor_circuits: int = Field(
+        default=1,
+        ge=1,
+        le=16,
+        description="Isolated SOCKS ports (circuits) of the shared tor",
+    )
+
+    tor_circuit_base_port: int = Field(
+        default=9060,
+        ge=1,
+        le=65535,
+        description="First SOCKS port of the additional circuits",
+    )
+
+    tor_circuit_strategy: Literal["round_robin", "latency"] = Field(
+        default="latency",
+        description="How scrapes are assigned to Tor circuits",
+    )
+
+    tor_circuit_max_failures: int = Field(
+        default=3,
+        ge=1,
+        description="Consecutive failures before a circuit is rotated",
+    )
+
+    tor_circuit_slow_factor: float = Field(
+        default=3.0,
+        gt=1,
+        description="Latency multiple of the fastest circuit that rotates",
+    )
+
+    http_pool_size: int = Field(
+        default=10,
+        ge=1,
+        description="Keep-alive connections per host of the HTTP engine",
+    )
+
+    http_timeout: int = Field(
+        default=30, ge=1, description="HTTP engine request timeout in seconds"
+    )
+
+    http_max_bytes: int = Field(
+        default=10 * 1024 * 1024,
+        ge=1024,
+        description="Largest response body the HTTP engine reads",
+    )
+
+    http_user_agent: str = Field(
+        default=(
+            "Mozilla/5.0 (Windows NT 10.0; rv:128.0) "
+            "Gecko/20100101 Firefox/128.0"
+        ),
+        description="User-Agent header sent by the HTTP engine",
+    )
+
+    auto_engine_ttl: int = Field(
+        default=3600,
+        ge=0,
+        description="Seconds a per-domain 'auto' engine decision is kept",
+    )
+
+    auto_engine_max_domains: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum domains with a remembered 'auto' engine",
+    )
+
+    auto_min_text_length: int = Field(
+        default=200,
+        ge=0,
+        description="Visible text below which 'auto' escalates to a browser",
+    )
+
+    admission_enabled: bool = Field(
+        default=True,
+        description="Queue and shed scrapes beyond the concurrency limits",
+    )
+
+    admission_max_concurrent: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Concurrent browser scrapes per browser type, "
+            "0 for browser_pool_max_size"
+        ),
+    )
+
+    admission_http_max_concurrent: int = Field(
+        default=32,
+        ge=1,
+        description="Concurrent scrapes of the HTTP engine",
+    )
+
+    admission_max_queue: int = Field(
+        default=16,
+        ge=0,
+        description="Scrapes waiting per browser type before 429s",
+    )
+
+    admission_queue_timeout: float = Field(
+        default=30,
+        ge=0,
+        description="Seconds a scrape may wait for admission before a 429",
+    )
+
+    server_host: str = Field(
+        default="127.0.0.1", description="Interface the server binds to"
+    )
+
+    server_workers: int = Field(
+        default=1,
+        ge=0,
+        description="Server worker processes, 0 for one per CPU core",
+    )
+
+    server_threads: int = Field(
+        default=40,
+        ge=1,
+        description="Threads per worker running synchronous handlers",
+    )
+
+    browser_host_max: int = Field(
+        default=0,
+        ge=0,
+        description="Live browsers allowed across all workers, 0 for no limit",
+    )
+
+    browser_slot_dir: str = Field(
+        default="/tmp/scraper-browser-slots",
+        description="Lock files coordinating browser_host_max across workers",
+    )
+
+    page_store_enabled: bool = Field(
+        default=False,
+        description="Keep every scraped page in the content-addressed store",
+    )
+
+    page_store_codec: Literal["auto", "zstd", "gzip"] = Field(
+        default="auto",
+        description="Page compression, 'auto' prefers zstd when installed",
+    )
+
+    page_store_batch_size: int = Field(
+        default=100,
+        ge=1,
+        description="Fetches buffered before a bulk insert",
+    )
+
+    page_store_flush_interval: float = Field(
+        default=2.0,
+        ge=0,
+        description="Most seconds a fetch stays buffered, 0 to flush by size",
+    )
+
+    page_store_max_pending_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="Page content kept for retry while store writes fail",
+    )
+
+    @model_validator(mode="after")
+    def check_browser_pool_sizes(self) -> "Settings":
+        """Ensure the warm pool size does not exceed its maximum."""
+        if self.browser_pool_min_size > self.browser_pool_max_size:
+            raise ValueError(
+                "browser_pool_min_size cannot exceed browser_pool_max_size"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def check_worker_state(self) -> "Settings":
+        """Ensure state polled across requests is shared by every worker."""
+        if self.is_development or self.worker_count == 1:
+            return self
+        missing = [
+            name.upper()
+            for name in ("jobs_persistent", "extraction_plans_persistent")
+            if not getattr(self, name)
+        ]
+        if missing:
+            raise ValueError(
+                f"{self.worker_count} server workers require "
+                f"{' and '.join(missing)}, otherwise jobs and extraction "
+                "plans are only visible to the worker that created them"
+            )
+        return self
+
     @model_validator(mode="before")
     @classmethod
     def remove_empty_strings(
@@ -88,6 +477,20 @@ class Settings(BaseSettings):
         """Check if running in development environment."""
         return self.scope == "development"
 
+    @property
+    def tor_circuit_ports(self) -> list[int]:
+        """SOCKS ports of every Tor circuit, the shared port first."""
+        extra = [
+            self.tor_circuit_base_port + index
+            for index in range(self.tor_circuits - 1)
+        ]
+        return [self.tor_socks_port, *extra]
+
+    @property
+    def worker_count(self) -> int:
+        """Server worker processes to run."""
+        return self.server_workers or os.cpu_count() or 1
+
     @property
     def is_lambda(self) -> bool:
         """Check if running on AWS Lambda."""
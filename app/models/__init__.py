@@ -0,0 +1,17 @@
+"""
+Database models.
+"""
+
+from app.models.cache import CachedScrapeResult
+from app.models.jobs import ScrapeJobRecord
+from app.models.pages import PageContent, PageFetch, PageVersion
+from app.models.plans import ExtractionPlanRecord
+
+__all__ = [
+    "CachedScrapeResult",
+    "ExtractionPlanRecord",
+    "PageContent",
+    "PageFetch",
+    "PageVersion",
+    "ScrapeJobRecord",
+]
@@ -0,0 +1,19 @@
+"""
+Database model for cached scrape results.
+"""
+
+from sqlalchemy import Float, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class CachedScrapeResult(Base):
+    """Scrape response cached under its request key."""
+
+    __tablename__ = "scrape_result_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    response: Mapped[str] = mapped_column(Text, nullable=False)
+    stored_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
@@ -0,0 +1,19 @@
+"""
+Database model for scrape jobs.
+"""
+
+from sqlalchemy import Float, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ScrapeJobRecord(Base):
+    """State of a scrape job, readable by every worker."""
+
+    __tablename__ = "scrape_job"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    request: Mapped[str] = mapped_column(Text, nullable=False)
+    state: Mapped[str] = mapped_column(Text, nullable=False)
+    finished_at: Mapped[float | None] = mapped_column(Float, index=True)
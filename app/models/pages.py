@@ -0,0 +1,61 @@
+"""
+Database models for stored pages and their versions.
+"""
+
+from sqlalchemy import Float, Integer, LargeBinary, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class PageContent(Base):
+    """Compressed page content stored once per distinct hash."""
+
+    __tablename__ = "page_content"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    codec: Mapped[str] = mapped_column(String(8), nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    stored_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class PageFetch(Base):
+    """One fetch of a URL, pointing at the content it returned."""
+
+    __tablename__ = "page_fetch"
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True
+    )
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    url_key: Mapped[str] = mapped_column(
+        String(64), nullable=False, index=True
+    )
+    title: Mapped[str | None] = mapped_column(Text, nullable=True)
+    html_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )
+    text_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )
+    fetched_at: Mapped[float] = mapped_column(
+        Float, nullable=False, index=True
+    )
+
+
+class PageVersion(Base):
+    """Last known version of a URL, for change detection."""
+
+    __tablename__ = "page_version"
+
+    url_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    etag: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(Text, nullable=True)
+    codec: Mapped[str | None] = mapped_column(String(8), nullable=True)
+    text: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    checked_at: Mapped[float] = mapped_column(Float, nullable=False)
+    changed_at: Mapped[float] = mapped_column(Float, nullable=False)
@@ -0,0 +1,18 @@
+"""
+Database model for registered extraction plans.
+"""
+
+from sqlalchemy import Float, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ExtractionPlanRecord(Base):
+    """Selector schema registered under a name."""
+
+    __tablename__ = "extraction_plan"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    schema: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[float] = mapped_column(Float, nullable=False)
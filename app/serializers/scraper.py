@@ -2,28 +2,131 @@
 Serializers for Scraper operations.
 """
 
+import re
+from datetime import datetime
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import (
+    BaseModel,
+    Field,
+    HttpUrl,
+    field_validator,
+    model_validator,
+)
 
 
-class ScrapeRequest(BaseModel):
-    """Request schema for scraping operation."""
+class ResourcePolicy(BaseModel):
+    """Subresources the browser should not download."""
 
-    url: HttpUrl = Field(..., description="URL to scrape")
-    browser_type: Literal["tor", "chrome"] = Field(
+    block_images: bool = Field(
+        default=False, description="Block image downloads"
+    )
+    block_media: bool = Field(
+        default=False, description="Block audio and video downloads"
+    )
+    block_fonts: bool = Field(default=False, description="Block web fonts")
+    block_stylesheets: bool = Field(
+        default=False, description="Block CSS stylesheets"
+    )
+    block_trackers: bool = Field(
+        default=False,
+        description="Block well-known analytics and advertising domains",
+    )
+    block_domains: list[str] = Field(
+        default_factory=list,
+        max_length=100,
+        description="Extra domains (and their subdomains) to block",
+    )
+
+    @field_validator("block_domains")
+    @classmethod
+    def normalize_domains(cls, domains: list[str]) -> list[str]:
+        """Lowercase domains and drop wildcard prefixes."""
+        normalized = (
+            domain.strip().lower().removeprefix("*.") for domain in domains
+        )
+        return [domain for domain in normalized if domain]
+
+
+PLAN_NAME_PATTERN = r"^[A-Za-z0-9_.-]{1,64}$"
+
+
+class SelectorField(BaseModel):
+    """Named value extracted from the page by a CSS or XPath selector."""
+
+    selector: str = Field(..., min_length=1, description="Selector to match")
+    type: Literal["css", "xpath"] = Field(
+        default="css", description="Selector language"
+    )
+    attribute: str | None = Field(
+        default=None,
+        description=(
+            "Attribute or property to read, e.g. 'href' or 'outerHTML', "
+            "instead of the element's text"
+        ),
+    )
+    multiple: bool = Field(
+        default=False,
+        description="Return every match as a list instead of the first",
+    )
+    fields: dict[str, "SelectorField"] | None = Field(
+        default=None,
+        max_length=50,
+        description="Fields extracted relative to each match, as objects",
+    )
+
+
+class ScrapeOptions(BaseModel):
+    """Browser and extraction options shared by scraping operations."""
+
+    browser_type: Literal["tor", "chrome", "http", "auto"] = Field(
         default="tor",
-        description="Browser type to use: 'tor' or 'chrome'",
+        description=(
+            "Engine to use: 'tor' or 'chrome' browsers, 'http' for a plain "
+            "HTTP fetch without JavaScript, or 'auto' to fetch over HTTP "
+            "and escalate to a browser only when needed"
+        ),
     )
     wait_time: int = Field(
         default=5,
         ge=0,
         le=60,
-        description="Wait time in seconds for page to load",
+        description="Maximum time in seconds to wait for the page to be ready",
+    )
+    wait_strategy: Literal[
+        "ready_state", "network_idle", "dom_quiet", "selector"
+    ] = Field(
+        default="ready_state",
+        description=(
+            "Page readiness condition: 'ready_state', 'network_idle', "
+            "'dom_quiet' or 'selector'"
+        ),
+    )
+    wait_selector: str | None = Field(
+        default=None,
+        min_length=1,
+        description="CSS selector awaited by the 'selector' strategy",
+    )
+    idle_time_ms: int = Field(
+        default=500,
+        ge=0,
+        le=10000,
+        description="Quiet period for 'network_idle' and 'dom_quiet'",
     )
     headless: bool = Field(
         default=True, description="Run browser in headless mode"
     )
+    resources: ResourcePolicy = Field(
+        default_factory=ResourcePolicy,
+        description="Resources blocked while loading the page",
+    )
+    http_via_tor: bool = Field(
+        default=False,
+        description=(
+            "Route 'http' engine requests through the shared tor; 'auto' "
+            "then escalates to Tor Browser instead of Chrome"
+        ),
+    )
     extract_text: bool = Field(
         default=True, description="Extract text content from page"
     )
@@ -37,20 +140,330 @@ class ScrapeRequest(BaseModel):
         default=False, description="Extract all image URLs from page"
     )
 
+    selectors: dict[str, SelectorField] | None = Field(
+        default=None,
+        max_length=100,
+        description=(
+            "Named selectors evaluated in the browser, returned in 'data'; "
+            "disable the other extract_* options to return only these"
+        ),
+    )
+    plan: str | None = Field(
+        default=None,
+        pattern=PLAN_NAME_PATTERN,
+        description="Registered extraction plan used instead of selectors",
+    )
+
+    detect_changes: bool = Field(
+        default=False,
+        description=(
+            "Compare with the URL's last detect_changes scrape using "
+            "conditional requests and a text fingerprint; unchanged pages "
+            "are returned without content. Never served from the cache"
+        ),
+    )
+    include_diff: bool = Field(
+        default=False,
+        description="Add a unified text diff when a detected page changed",
+    )
+
+    cache_max_age: int | None = Field(
+        default=None,
+        ge=0,
+        description="Accept cached results up to this age in seconds",
+    )
+    bypass_cache: bool = Field(
+        default=False,
+        description="Always scrape the page, ignoring cached results",
+    )
+
+    @model_validator(mode="after")
+    def check_wait_selector(self) -> "ScrapeOptions":
+        """Ensure the selector strategy has a selector to wait for."""
+        if self.wait_strategy == "selector" and not self.wait_selector:
+            raise ValueError(
+                "wait_selector is required when wait_strategy is 'selector'"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def check_selectors_engine(self) -> "ScrapeOptions":
+        """Ensure selectors run on an engine that evaluates them."""
+        if self.selectors and self.plan:
+            raise ValueError("Use either selectors or a plan, not both")
+        if (self.selectors or self.plan) and self.browser_type == "http":
+            raise ValueError(
+                "selectors are evaluated in a browser; use 'tor', 'chrome' "
+                "or 'auto' as browser_type"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def check_include_diff(self) -> "ScrapeOptions":
+        """Ensure diffs are only requested along with change detection."""
+        if self.include_diff and not self.detect_changes:
+            raise ValueError("include_diff requires detect_changes")
+        return self
+
+
+class ScrapeRequest(ScrapeOptions):
+    """Request schema for scraping operation."""
+
+    url: HttpUrl = Field(..., description="URL to scrape")
+
 
 class ScrapeResponse(BaseModel):
     """Response schema for scraping operation."""
 
     url: str = Field(..., description="Scraped URL")
-    title: str | None = Field(None, description="Page title")
-    text: str | None = Field(None, description="Extracted text content")
-    html: str | None = Field(None, description="Extracted HTML content")
+    title: str | None = Field(default=None, description="Page title")
+    text: str | None = Field(
+        default=None, description="Extracted text content"
+    )
+    html: str | None = Field(
+        default=None, description="Extracted HTML content"
+    )
     links: list[str] = Field(
         default_factory=list, description="Extracted links"
     )
     images: list[str] = Field(
         default_factory=list, description="Extracted image URLs"
     )
+    data: dict[str, Any] | None = Field(
+        default=None, description="Values of the requested selectors"
+    )
+    metadata: dict[str, Any] = Field(
+        default_factory=dict, description="Additional metadata"
+    )
+
+
+class ScrapeBatchRequest(BaseModel):
+    """Request schema for scraping several URLs in one call."""
+
+    urls: list[HttpUrl] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="URLs to scrape",
+    )
+    options: ScrapeOptions = Field(
+        default_factory=ScrapeOptions,
+        description="Options applied to every URL",
+    )
+    concurrency: int = Field(
+        default=2,
+        ge=1,
+        le=32,
+        description="Maximum browser sessions used in parallel",
+    )
+
+    def to_requests(self) -> list[ScrapeRequest]:
+        """Build one ScrapeRequest per URL with the shared options."""
+        options = self.options.model_dump()
+        return [ScrapeRequest(url=url, **options) for url in self.urls]
+
+
+class ScrapeBatchItem(BaseModel):
+    """Outcome of scraping a single URL within a batch."""
+
+    url: str = Field(..., description="Requested URL")
+    success: bool = Field(..., description="Whether the scrape succeeded")
+    result: ScrapeResponse | None = Field(
+        default=None, description="Scraped data when successful"
+    )
+    error: str | None = Field(default=None, description="Failure reason")
+
+
+class ScrapeBatchResponse(BaseModel):
+    """Response schema for batch scraping operation."""
+
+    results: list[ScrapeBatchItem] = Field(
+        default_factory=list,
+        description="Per-URL results in request order",
+    )
+    succeeded: int = Field(0, description="Number of successful scrapes")
+    failed: int = Field(0, description="Number of failed scrapes")
+
+
+class ScrapeBatchStreamItem(ScrapeBatchItem):
+    """Streamed outcome of one batch URL, emitted as soon as it finishes."""
+
+    event: Literal["result"] = "result"
+    index: int = Field(..., description="Position of the URL in the batch")
+
+
+class ScrapeStreamDone(BaseModel):
+    """Final line of a streamed scrape."""
+
+    event: Literal["done"] = "done"
+    succeeded: int | None = Field(
+        default=None, description="Number of successful batch scrapes"
+    )
+    failed: int | None = Field(
+        default=None, description="Number of failed batch scrapes"
+    )
+
+
+class ScrapeStreamPage(BaseModel):
+    """First line of a streamed page scrape."""
+
+    event: Literal["page"] = "page"
+    url: str = Field(..., description="Scraped URL")
+    title: str | None = Field(default=None, description="Page title")
+    data: dict[str, Any] | None = Field(
+        default=None, description="Values of the requested selectors"
+    )
     metadata: dict[str, Any] = Field(
         default_factory=dict, description="Additional metadata"
     )
+
+
+ScrapeStreamFieldName = Literal["links", "images", "text", "html"]
+
+
+class ScrapeStreamField(BaseModel):
+    """One extracted field of a streamed page scrape."""
+
+    event: Literal["field"] = "field"
+    name: ScrapeStreamFieldName = Field(..., description="Field name")
+    value: str | list[str] | None = Field(
+        default=None, description="Field value"
+    )
+
+
+class ScrapeStreamError(BaseModel):
+    """Error that ended a streamed scrape after it started."""
+
+    event: Literal["error"] = "error"
+    error: str = Field(..., description="Failure reason")
+
+
+class CrawlRequest(BaseModel):
+    """Request schema for crawling from seed URLs by following links."""
+
+    seeds: list[HttpUrl] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="URLs the crawl starts from",
+    )
+    options: ScrapeOptions = Field(
+        default_factory=ScrapeOptions,
+        description="Options for every page, links are always extracted",
+    )
+    max_depth: int = Field(
+        default=2,
+        ge=0,
+        le=20,
+        description="Links followed from a seed, 0 to scrape only the seeds",
+    )
+    max_pages: int = Field(
+        default=100,
+        ge=1,
+        description="Pages scraped at most, capped by crawl_max_pages",
+    )
+    same_host: bool = Field(
+        default=True,
+        description="Only follow links to the hosts of the seeds",
+    )
+    include: list[str] = Field(
+        default_factory=list,
+        max_length=20,
+        description="Follow only URLs matching one of these regexes",
+    )
+    exclude: list[str] = Field(
+        default_factory=list,
+        max_length=20,
+        description="Never follow URLs matching one of these regexes",
+    )
+    concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Maximum pages scraped in parallel",
+    )
+    host_concurrency: int = Field(
+        default=1,
+        ge=1,
+        le=32,
+        description="Maximum pages of one host scraped in parallel",
+    )
+    host_delay: float = Field(
+        default=1.0,
+        ge=0,
+        le=60,
+        description="Seconds between scrapes of one host starting",
+    )
+
+    @field_validator("include", "exclude")
+    @classmethod
+    def check_patterns(cls, patterns: list[str]) -> list[str]:
+        """Ensure every pattern is a valid regular expression."""
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid pattern {pattern!r}: {e}") from e
+        return patterns
+
+
+class CrawlStreamItem(ScrapeBatchItem):
+    """Streamed outcome of one crawled page."""
+
+    event: Literal["result"] = "result"
+    depth: int = Field(..., description="Links followed from a seed")
+    parent: str | None = Field(
+        default=None, description="Page the URL was found on, None for seeds"
+    )
+
+
+class CrawlStreamDone(ScrapeStreamDone):
+    """Final line of a streamed crawl."""
+
+    discovered: int = Field(0, description="Distinct in-scope URLs found")
+    unvisited: int = Field(
+        0, description="URLs left in the frontier when the crawl stopped"
+    )
+
+
+class ExtractionPlanRequest(BaseModel):
+    """Request schema for registering a named extraction plan."""
+
+    selectors: dict[str, SelectorField] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Named selectors the plan extracts",
+    )
+
+
+class ExtractionPlanResponse(BaseModel):
+    """Response schema for a registered extraction plan."""
+
+    name: str = Field(..., description="Plan name used in scrape requests")
+    key: str = Field(..., description="Hash of the plan's selector schema")
+    selectors: dict[str, SelectorField] = Field(
+        ..., description="Named selectors the plan extracts"
+    )
+
+
+ScrapeJobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class ScrapeJobResponse(BaseModel):
+    """Response schema for an asynchronous scrape job."""
+
+    id: str = Field(..., description="Job identifier")
+    status: ScrapeJobStatus = Field(..., description="Job status")
+    url: str = Field(..., description="Requested URL")
+    created_at: datetime = Field(..., description="When the job was queued")
+    started_at: datetime | None = Field(
+        default=None, description="When a worker picked up the job"
+    )
+    finished_at: datetime | None = Field(
+        default=None, description="When the job finished"
+    )
+    result: ScrapeResponse | None = Field(
+        default=None, description="Scraped data when the job succeeded"
+    )
+    error: str | None = Field(default=None, description="Failure reason")
@@ -0,0 +1,228 @@
+"""
+Admission control in front of scrapes, per browser type.
+"""
+
+import asyncio
+import contextlib
+import math
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+from app.core.errors import AdmissionRejectedError
+from app.core.metrics import admission_rejections_total
+from app.core.settings import settings
+
+# Seconds between slot checks of scrapes waiting on an event loop, which
+# the condition variable cannot wake.
+ASYNC_POLL_INTERVAL = 0.05
+
+
+class AdmissionController:
+    """
+    Concurrency limit with a bounded wait queue.
+
+    Scrapes beyond the limit wait in line; when the line is full, or a
+    scrape waits longer than the queue timeout, it is rejected with an
+    estimate of when capacity frees up, based on measured service times.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        smoothing: float = 0.2,
+        initial_service_time: float = 1.0,
+    ) -> None:
+        """
+        Initialize admission controller.
+
+        Args:
+            name: Name used in errors and metrics, the browser type
+            max_concurrent: Scrapes allowed to run at once
+            max_queue: Scrapes allowed to wait for a free slot
+            queue_timeout: Seconds a scrape may wait before rejection
+            smoothing: Weight of the latest sample in the service time
+            initial_service_time: Service time assumed before any sample
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.smoothing = smoothing
+        self.service_time = initial_service_time
+
+        self._active = 0
+        self._waiting = 0
+        self._condition = threading.Condition()
+
+    @contextlib.contextmanager
+    def admit(self) -> Iterator[None]:
+        """
+        Run the context once a slot is free.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the wait times
+                out
+        """
+        with self._condition:
+            if (
+                self._active >= self.max_concurrent
+                and self._waiting >= self.max_queue
+            ):
+                raise self._reject("queue full")
+
+            deadline = time.monotonic() + self.queue_timeout
+            self._waiting += 1
+            try:
+                while self._active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._reject("queue timeout")
+                    self._condition.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._active += 1
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(started)
+
+    @contextlib.asynccontextmanager
+    async def admit_async(self) -> AsyncIterator[None]:
+        """
+        Run the context once a slot is free, waiting without a thread.
+
+        Shares slots and queue with admit.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the wait times
+                out
+        """
+        with self._condition:
+            if (
+                self._active >= self.max_concurrent
+                and self._waiting >= self.max_queue
+            ):
+                raise self._reject("queue full")
+            deadline = time.monotonic() + self.queue_timeout
+            self._waiting += 1
+
+        try:
+            while True:
+                with self._condition:
+                    if self._active < self.max_concurrent:
+                        self._active += 1
+                        break
+                    if time.monotonic() >= deadline:
+                        raise self._reject("queue timeout")
+                await asyncio.sleep(ASYNC_POLL_INTERVAL)
+        finally:
+            with self._condition:
+                self._waiting -= 1
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(started)
+
+    def retry_after(self) -> int:
+        """Seconds until a new scrape would likely be admitted."""
+        with self._condition:
+            return self._retry_after()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current load, for diagnostics."""
+        with self._condition:
+            return {
+                "active": self._active,
+                "waiting": self._waiting,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "service_time": round(self.service_time, 3),
+            }
+
+    def _release(self, started: float) -> None:
+        elapsed = time.monotonic() - started
+        with self._condition:
+            self._active -= 1
+            self.service_time += self.smoothing * (elapsed - self.service_time)
+            self._condition.notify()
+
+    def _retry_after(self) -> int:
+        # Everyone ahead in line, plus this scrape, drains at
+        # max_concurrent scrapes per service time.
+        rounds = (self._waiting + 1) / self.max_concurrent
+        return max(1, math.ceil(self.service_time * rounds))
+
+    def _reject(self, reason: str) -> AdmissionRejectedError:
+        admission_rejections_total.inc(browser_type=self.name, reason=reason)
+        retry_after = self._retry_after()
+        return AdmissionRejectedError(
+            f"{self.name} scrapes saturated ({reason}), "
+            f"retry after {retry_after}s",
+            retry_after=retry_after,
+        )
+
+
+class AdmissionRegistry:
+    """Admission controllers created on demand per browser type."""
+
+    def __init__(self) -> None:
+        self._controllers: dict[str, AdmissionController] = {}
+        self._lock = threading.Lock()
+
+    def get(self, browser_type: str) -> AdmissionController:
+        """Get the controller of a browser type."""
+        with self._lock:
+            controller = self._controllers.get(browser_type)
+            if controller is None:
+                controller = AdmissionController(
+                    browser_type,
+                    max_concurrent=self._max_concurrent(browser_type),
+                    max_queue=settings.admission_max_queue,
+                    queue_timeout=settings.admission_queue_timeout,
+                )
+                self._controllers[browser_type] = controller
+            return controller
+
+    @contextlib.contextmanager
+    def admit(self, browser_type: str) -> Iterator[None]:
+        """Run the context once the browser type admits another scrape."""
+        if not settings.admission_enabled:
+            yield
+            return
+        with self.get(browser_type).admit():
+            yield
+
+    @contextlib.asynccontextmanager
+    async def admit_async(self, browser_type: str) -> AsyncIterator[None]:
+        """Async variant of admit for scrapes run on an event loop."""
+        if not settings.admission_enabled:
+            yield
+            return
+        async with self.get(browser_type).admit_async():
+            yield
+
+    def clear(self) -> None:
+        """Forget every controller, e.g. after a settings change."""
+        with self._lock:
+            self._controllers.clear()
+
+    @staticmethod
+    def _max_concurrent(browser_type: str) -> int:
+        if browser_type == "http":
+            return settings.admission_http_max_concurrent
+        return (
+            settings.admission_max_concurrent
+            or settings.browser_pool_max_size * settings.browser_max_tabs
+        )
+
+
+admission = AdmissionRegistry()
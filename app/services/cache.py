@@ -0,0 +1,250 @@
+"""
+Result cache for scraping operations.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.settings import settings
+from app.models.cache import CachedScrapeResult
+from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.services.extraction_plans import extraction_plans
+
+logger = logging.getLogger(__name__)
+
+CACHE_CONTROL_FIELDS = {"url", "cache_max_age", "bypass_cache"}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent spellings share a cache key.
+
+    Lowercases scheme and host, drops default ports and fragments, and
+    sorts query parameters.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def request_cache_key(request: ScrapeRequest) -> str:
+    """
+    Build the cache key of a scrape request.
+
+    The key covers the normalized URL and every option that shapes the
+    result, but not the cache control options themselves. A named
+    extraction plan is keyed by its selectors, so redefining the plan
+    does not serve results extracted with the old ones.
+
+    Args:
+        request: ScrapeRequest to key
+
+    Returns:
+        Hex digest identifying equivalent requests
+    """
+    options = request.model_dump(mode="json", exclude=CACHE_CONTROL_FIELDS)
+    options["url"] = normalize_url(str(request.url))
+    if request.plan is not None:
+        plan = extraction_plans.get(request.plan)
+        options["plan"] = plan.key if plan is not None else request.plan
+    encoded = json.dumps(options, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class DatabaseResultStore:
+    """Persistent cache tier backed by the application database."""
+
+    def __init__(self) -> None:
+        self._table_ready = False
+        self._lock = threading.Lock()
+
+    def _ensure_table(self) -> None:
+        with self._lock:
+            if not self._table_ready:
+                Base.metadata.create_all(
+                    bind=engine, tables=[CachedScrapeResult.__table__]
+                )
+                self._table_ready = True
+
+    def get(self, key: str) -> tuple[float, ScrapeResponse] | None:
+        """Load a cached response and the time it was stored."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            row = db.get(CachedScrapeResult, key)
+            if row is None:
+                return None
+            response = ScrapeResponse.model_validate_json(row.response)
+            return row.stored_at, response
+
+    def set(
+        self, key: str, response: ScrapeResponse, stored_at: float
+    ) -> None:
+        """Store a response under a key."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            db.merge(
+                CachedScrapeResult(
+                    key=key,
+                    url=response.url,
+                    response=response.model_dump_json(),
+                    stored_at=stored_at,
+                )
+            )
+            db.commit()
+
+    def purge(self, before: float) -> int:
+        """Delete responses stored before a time, returning their count."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            deleted = (
+                db.query(CachedScrapeResult)
+                .filter(CachedScrapeResult.stored_at < before)
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return deleted
+
+
+class ResultCache:
+    """Two-tier scrape result cache: in-memory LRU over the database."""
+
+    def __init__(
+        self,
+        ttl: float = 300,
+        max_entries: int = 1000,
+        store: DatabaseResultStore | None = None,
+    ) -> None:
+        """
+        Initialize result cache.
+
+        Args:
+            ttl: Seconds a result stays cached
+            max_entries: Maximum results kept in memory
+            store: Optional persistent tier
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.store = store
+
+        self._entries: OrderedDict[str, tuple[float, ScrapeResponse]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._purged_at = 0.0
+
+    def get(
+        self, key: str, max_age: float | None = None
+    ) -> tuple[ScrapeResponse, str, float] | None:
+        """
+        Look up a cached response no older than max_age.
+
+        Args:
+            key: Request cache key
+            max_age: Maximum acceptable age in seconds, defaults to the TTL
+
+        Returns:
+            Tuple of (response, tier, age) or None on a miss
+        """
+        max_age = self.ttl if max_age is None else min(max_age, self.ttl)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, response = entry
+                age = now - stored_at
+                if age <= max_age:
+                    self._entries.move_to_end(key)
+                    return response.model_copy(deep=True), "memory", age
+                if age > self.ttl:
+                    del self._entries[key]
+
+        if self.store is None:
+            return None
+
+        try:
+            stored = self.store.get(key)
+        except Exception as e:
+            logger.warning("Persistent cache lookup failed: %s", e)
+            return None
+        if stored is None:
+            return None
+
+        stored_at, response = stored
+        age = now - stored_at
+        if age > max_age:
+            return None
+
+        self._remember(key, stored_at, response)
+        return response.model_copy(deep=True), "database", age
+
+    def set(self, key: str, response: ScrapeResponse) -> None:
+        """
+        Cache a response under a key.
+
+        Args:
+            key: Request cache key
+            response: ScrapeResponse to cache
+        """
+        stored_at = time.time()
+        response = response.model_copy(deep=True)
+        self._remember(key, stored_at, response)
+
+        if self.store is None:
+            return
+        try:
+            self.store.set(key, response, stored_at)
+        except Exception as e:
+            logger.warning("Persistent cache write failed: %s", e)
+        self._purge_expired(self.store, stored_at)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def _purge_expired(self, store: DatabaseResultStore, now: float) -> None:
+        # Expired rows are never read again; delete them at most once per
+        # TTL rather than on every write.
+        with self._lock:
+            if now - self._purged_at < self.ttl:
+                return
+            self._purged_at = now
+        try:
+            store.purge(now - self.ttl)
+        except Exception as e:
+            logger.warning("Persistent cache purge failed: %s", e)
+
+    def _remember(
+        self, key: str, stored_at: float, response: ScrapeResponse
+    ) -> None:
+        with self._lock:
+            self._entries[key] = (stored_at, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+result_cache = ResultCache(
+    ttl=settings.cache_ttl,
+    max_entries=settings.cache_max_entries,
+    store=DatabaseResultStore() if settings.cache_persistent else None,
+)
@@ -0,0 +1,298 @@
+"""
+Change detection across repeated scrapes of a URL.
+"""
+
+import difflib
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from http import HTTPStatus
+from typing import Any
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.settings import settings
+from app.models.pages import PageVersion as PageVersionRow
+from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.services.page_store import (
+    compress,
+    decompress,
+    resolve_codec,
+    url_key,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(text: str) -> str:
+    """
+    Fingerprint page text, ignoring whitespace differences.
+
+    Args:
+        text: Extracted page text
+
+    Returns:
+        Hex SHA-256 of the whitespace-normalized text
+    """
+    return hashlib.sha256(" ".join(text.split()).encode()).hexdigest()
+
+
+@dataclass
+class PageVersion:
+    """What was last seen at a URL."""
+
+    url: str
+    fingerprint: str | None
+    checked_at: float
+    changed_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    text: str | None = None
+
+
+class DatabaseVersionStore:
+    """Persistent page versions backed by the application database."""
+
+    def __init__(self, codec: str = "auto") -> None:
+        self.codec = resolve_codec(codec)
+        self._table_ready = False
+        self._lock = threading.Lock()
+
+    def _ensure_table(self) -> None:
+        with self._lock:
+            if not self._table_ready:
+                Base.metadata.create_all(
+                    bind=engine, tables=[PageVersionRow.__table__]
+                )
+                self._table_ready = True
+
+    def get(self, key: str) -> PageVersion | None:
+        """Load the version stored under a URL key."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            row = db.get(PageVersionRow, key)
+            if row is None:
+                return None
+            return PageVersion(
+                url=row.url,
+                fingerprint=row.fingerprint,
+                checked_at=row.checked_at,
+                changed_at=row.changed_at,
+                etag=row.etag,
+                last_modified=row.last_modified,
+                text=(
+                    None
+                    if row.text is None or row.codec is None
+                    else decompress(row.codec, row.text)
+                ),
+            )
+
+    def set(self, key: str, version: PageVersion) -> None:
+        """Store a version under a URL key."""
+        self._ensure_table()
+        codec, text = (
+            (None, None)
+            if version.text is None
+            else compress(version.text, self.codec)
+        )
+        with SessionLocal() as db:
+            db.merge(
+                PageVersionRow(
+                    url_key=key,
+                    url=version.url,
+                    fingerprint=version.fingerprint,
+                    etag=version.etag,
+                    last_modified=version.last_modified,
+                    codec=codec,
+                    text=text,
+                    checked_at=version.checked_at,
+                    changed_at=version.changed_at,
+                )
+            )
+            db.commit()
+
+
+class ChangeTracker:
+    """
+    Remember each URL's validators and text fingerprint between scrapes.
+
+    The HTTP engine revalidates with If-None-Match and If-Modified-Since,
+    and browsers compare the fingerprint before extracting the rest of the
+    page, so an unchanged page costs a 304 or a single text read.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        diff_max_lines: int = 500,
+        store: DatabaseVersionStore | None = None,
+    ) -> None:
+        """
+        Initialize change tracker.
+
+        Args:
+            max_entries: Versions kept in memory
+            diff_max_lines: Longest diff reported, in lines
+            store: Optional persistent tier
+        """
+        self.max_entries = max_entries
+        self.diff_max_lines = diff_max_lines
+        self.store = store
+
+        self._versions: OrderedDict[str, PageVersion] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> PageVersion | None:
+        """Last version seen at a URL."""
+        key = url_key(url)
+        with self._lock:
+            version = self._versions.get(key)
+            if version is not None:
+                self._versions.move_to_end(key)
+                return version
+
+        if self.store is None:
+            return None
+        try:
+            version = self.store.get(key)
+        except Exception as e:
+            logger.warning("Page version lookup failed: %s", e)
+            return None
+        if version is not None:
+            self._remember(key, version)
+        return version
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified."""
+        version = self.get(url)
+        headers: dict[str, str] = {}
+        if version is None or version.fingerprint is None:
+            return headers
+        if version.etag:
+            headers["If-None-Match"] = version.etag
+        if version.last_modified:
+            headers["If-Modified-Since"] = version.last_modified
+        return headers
+
+    def is_current(self, url: str, digest: str) -> bool:
+        """Whether a fingerprint matches the last version of a URL."""
+        version = self.get(url)
+        return version is not None and version.fingerprint == digest
+
+    def observe(
+        self, request: ScrapeRequest, response: ScrapeResponse
+    ) -> ScrapeResponse:
+        """
+        Compare a scrape with the last version of its URL and remember it.
+
+        Args:
+            request: ScrapeRequest as sent by the client
+            response: ScrapeResponse scraped with text extraction
+
+        Returns:
+            The response with 'unchanged', 'fingerprint' and 'changed_at'
+            metadata, its content dropped when unchanged, and a 'diff' when
+            requested and the page changed, None without a previous text
+        """
+        url = str(request.url)
+        now = time.time()
+        previous = self.get(url)
+        metadata = dict(response.metadata)
+
+        not_modified = metadata.get("status_code") == HTTPStatus.NOT_MODIFIED
+        if not_modified and previous is not None:
+            digest = previous.fingerprint
+        elif metadata.get("fingerprint"):
+            digest = metadata["fingerprint"]
+        else:
+            digest = fingerprint(response.text or response.html or "")
+        unchanged = previous is not None and previous.fingerprint == digest
+
+        etag = metadata.get("etag")
+        last_modified = metadata.get("last_modified")
+        if previous is not None and unchanged:
+            version = replace(
+                previous,
+                checked_at=now,
+                etag=etag or previous.etag,
+                last_modified=last_modified or previous.last_modified,
+            )
+        else:
+            version = PageVersion(
+                url=url,
+                fingerprint=digest,
+                checked_at=now,
+                changed_at=now,
+                etag=etag,
+                last_modified=last_modified,
+                text=response.text if request.include_diff else None,
+            )
+            if request.include_diff:
+                metadata["diff"] = self._diff(previous, response.text)
+        self._save(url, version)
+
+        metadata.update(
+            {
+                "unchanged": unchanged,
+                "fingerprint": digest,
+                "changed_at": version.changed_at,
+            }
+        )
+        update: dict[str, Any] = {"metadata": metadata}
+        if unchanged:
+            update.update(text=None, html=None, links=[], images=[], data=None)
+        elif not request.extract_text:
+            update["text"] = None
+        return response.model_copy(update=update)
+
+    def clear(self) -> None:
+        """Drop every in-memory version."""
+        with self._lock:
+            self._versions.clear()
+
+    def _diff(
+        self, previous: PageVersion | None, text: str | None
+    ) -> str | None:
+        # Nothing to compare with on the first scrape, or when the last
+        # version was recorded without its text.
+        if previous is None or previous.text is None:
+            return None
+        lines = difflib.unified_diff(
+            previous.text.splitlines(),
+            (text or "").splitlines(),
+            fromfile="previous",
+            tofile="current",
+            lineterm="",
+        )
+        return "\n".join(itertools.islice(lines, self.diff_max_lines))
+
+    def _save(self, url: str, version: PageVersion) -> None:
+        key = url_key(url)
+        self._remember(key, version)
+        if self.store is None:
+            return
+        try:
+            self.store.set(key, version)
+        except Exception as e:
+            logger.warning("Page version write failed: %s", e)
+
+    def _remember(self, key: str, version: PageVersion) -> None:
+        with self._lock:
+            self._versions[key] = version
+            self._versions.move_to_end(key)
+            while len(self._versions) > self.max_entries:
+                self._versions.popitem(last=False)
+
+
+change_tracker = ChangeTracker(
+    max_entries=settings.change_tracking_max_entries,
+    diff_max_lines=settings.change_diff_max_lines,
+    store=(
+        DatabaseVersionStore(settings.page_store_codec)
+        if settings.change_tracking_persistent
+        else None
+    ),
+)
@@ -0,0 +1,337 @@
+"""
+Recursive crawling: seen-URL filter, frontier and per-host politeness.
+"""
+
+import hashlib
+import logging
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from pydantic import BaseModel, HttpUrl
+
+from app.core.settings import settings
+from app.serializers.scraper import (
+    CrawlRequest,
+    CrawlStreamDone,
+    CrawlStreamItem,
+    ScrapeBatchItem,
+    ScrapeRequest,
+)
+from app.services.cache import normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Compact set of seen strings with a bounded false positive rate.
+
+    Membership tests may wrongly answer yes, never wrongly no; for a crawl
+    that means an unseen URL is skipped now and then, while millions of
+    URLs fit in a few megabytes.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """
+        Initialize an empty filter.
+
+        Args:
+            capacity: Items the error rate holds for
+            error_rate: False positive rate at capacity
+        """
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: str) -> bool:
+        """
+        Add an item.
+
+        Returns:
+            True if the item was not in the filter yet
+        """
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        """Whether an item was probably added."""
+        return all(
+            self._bits[position // 8] & (1 << position % 8)
+            for position in self._positions(item)
+        )
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing derives every position from one digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+
+@dataclass
+class CrawlEntry:
+    """URL waiting in, or taken from, the frontier."""
+
+    url: str
+    depth: int
+    parent: str | None = None
+
+    @property
+    def host(self) -> str:
+        """Host the URL is scraped from."""
+        return (urlsplit(self.url).hostname or "").lower()
+
+
+class CrawlFrontier:
+    """
+    URLs waiting to be scraped, queued per host.
+
+    A host gets at most host_concurrency scrapes at once and a new one
+    only host_delay seconds after the last one started. Hosts take turns,
+    so one large site does not starve the others.
+    """
+
+    def __init__(self, host_concurrency: int = 1, host_delay: float = 0):
+        """
+        Initialize an empty frontier.
+
+        Args:
+            host_concurrency: Scrapes of one host allowed at once
+            host_delay: Seconds between scrapes of one host starting
+        """
+        self.host_concurrency = host_concurrency
+        self.host_delay = host_delay
+        self._queues: OrderedDict[str, deque[CrawlEntry]] = OrderedDict()
+        self._active: dict[str, int] = {}
+        self._next_start: dict[str, float] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        """URLs waiting."""
+        return self._size
+
+    def push(self, entry: CrawlEntry) -> None:
+        """Queue a URL behind the others of its host."""
+        self._queues.setdefault(entry.host, deque()).append(entry)
+        self._size += 1
+
+    def pop(self, now: float | None = None) -> tuple[CrawlEntry | None, float]:
+        """
+        Take the next URL whose host may be scraped now.
+
+        Args:
+            now: Current monotonic time
+
+        Returns:
+            Tuple of (entry or None, seconds until a waiting host is due,
+            inf when every waiting host is at its concurrency limit)
+        """
+        now = time.monotonic() if now is None else now
+        wait_for = math.inf
+        for host in list(self._queues):
+            if self._active.get(host, 0) >= self.host_concurrency:
+                continue
+            due = self._next_start.get(host, 0) - now
+            if due > 0:
+                wait_for = min(wait_for, due)
+                continue
+
+            queue = self._queues.pop(host)
+            entry = queue.popleft()
+            if queue:
+                # Back of the line for the host's next URL.
+                self._queues[host] = queue
+            self._size -= 1
+            self._active[host] = self._active.get(host, 0) + 1
+            self._next_start[host] = now + self.host_delay
+            return entry, 0
+        return None, wait_for
+
+    def done(self, entry: CrawlEntry) -> None:
+        """Mark a scrape taken with pop as finished."""
+        self._active[entry.host] -= 1
+
+
+class Crawler:
+    """
+    Crawl from seed URLs, following links breadth first per host.
+
+    Found links are resolved, normalized and scoped, then checked against
+    a Bloom filter so each URL is queued once. The frontier never holds
+    more URLs than the page budget has room for.
+    """
+
+    def __init__(
+        self,
+        request: CrawlRequest,
+        scrape: Callable[[ScrapeRequest], ScrapeBatchItem],
+        concurrency: int,
+    ) -> None:
+        """
+        Initialize crawler.
+
+        Args:
+            request: CrawlRequest with seeds, budgets and scope
+            scrape: Scrapes one page, reporting failures in the item
+            concurrency: Pages scraped in parallel
+        """
+        self.request = request
+        self.scrape = scrape
+        self.concurrency = concurrency
+        self.max_pages = min(request.max_pages, settings.crawl_max_pages)
+
+        self.seen = BloomFilter(
+            settings.crawl_seen_capacity, settings.crawl_seen_error_rate
+        )
+        self.frontier = CrawlFrontier(
+            request.host_concurrency, request.host_delay
+        )
+        self.hosts = {
+            (urlsplit(str(seed)).hostname or "").lower()
+            for seed in request.seeds
+        }
+        self.include = [re.compile(pattern) for pattern in request.include]
+        self.exclude = [re.compile(pattern) for pattern in request.exclude]
+        self.started = 0
+        self._options = request.options.model_dump()
+        self._options["extract_links"] = True
+
+    def run(self) -> Iterator[BaseModel]:
+        """
+        Crawl, yielding each page as soon as it is scraped.
+
+        Yields:
+            One CrawlStreamItem per page in completion order, then a
+            CrawlStreamDone summary
+        """
+        for seed in self.request.seeds:
+            self._discover(str(seed), depth=0, parent=None)
+
+        succeeded = failed = 0
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="crawl"
+        ) as executor:
+            pending: dict[Future, CrawlEntry] = {}
+            while True:
+                wait_for = self._submit(executor, pending)
+                if not pending:
+                    if not self.frontier or self.started >= self.max_pages:
+                        break
+                    time.sleep(wait_for)
+                    continue
+
+                done, _ = wait(
+                    pending,
+                    timeout=None if math.isinf(wait_for) else wait_for,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    entry = pending.pop(future)
+                    self.frontier.done(entry)
+                    item = future.result()
+                    if item.success:
+                        succeeded += 1
+                        self._follow(entry, item)
+                    else:
+                        failed += 1
+                    yield CrawlStreamItem(
+                        depth=entry.depth, parent=entry.parent, **dict(item)
+                    )
+
+        yield CrawlStreamDone(
+            succeeded=succeeded,
+            failed=failed,
+            discovered=self.seen.count,
+            unvisited=len(self.frontier),
+        )
+
+    def in_scope(self, url: str) -> bool:
+        """Whether a URL may be crawled under the request's scope."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            return False
+        if self.request.same_host and (
+            (parts.hostname or "").lower() not in self.hosts
+        ):
+            return False
+        if self.include and not any(p.search(url) for p in self.include):
+            return False
+        return not any(p.search(url) for p in self.exclude)
+
+    def _submit(
+        self, executor: ThreadPoolExecutor, pending: dict[Future, CrawlEntry]
+    ) -> float:
+        """
+        Start scrapes while workers, budget and hosts allow.
+
+        Returns:
+            Seconds until a waiting host is due, inf when only a finished
+            scrape can make progress
+        """
+        wait_for = math.inf
+        while len(pending) < self.concurrency and (
+            self.started < self.max_pages
+        ):
+            entry, wait_for = self.frontier.pop()
+            if entry is None:
+                break
+            request = ScrapeRequest(url=HttpUrl(entry.url), **self._options)
+            pending[executor.submit(self.scrape, request)] = entry
+            self.started += 1
+            wait_for = math.inf
+        return wait_for
+
+    def _follow(self, entry: CrawlEntry, item: ScrapeBatchItem) -> None:
+        """Queue the in-scope links of a scraped page."""
+        if entry.depth >= self.request.max_depth or item.result is None:
+            return
+        for link in item.result.links:
+            self._discover(
+                link,
+                depth=entry.depth + 1,
+                parent=entry.url,
+                base=item.result.url,
+            )
+
+    def _discover(
+        self, url: str, depth: int, parent: str | None, base: str = ""
+    ) -> None:
+        # Links Python cannot parse, or that a scrape request would refuse,
+        # are skipped rather than ending the crawl when they are scraped.
+        try:
+            url = urldefrag(urljoin(base, url)).url
+            if not self.in_scope(url):
+                return
+            HttpUrl(url)
+        except ValueError:
+            logger.debug("Skipping invalid link: %r", url)
+            return
+        if not self.seen.add(normalize_url(url)):
+            return
+        # Scrapes started plus URLs queued never shrinks, so URLs past the
+        # budget could never be scraped.
+        if self.started + len(self.frontier) >= self.max_pages:
+            return
+        self.frontier.push(CrawlEntry(url=url, depth=depth, parent=parent))
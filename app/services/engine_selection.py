@@ -0,0 +1,125 @@
+"""
+Engine selection for automatic scraping mode.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Literal
+
+from app.core.settings import settings
+from app.serializers.scraper import ScrapeResponse
+
+Engine = Literal["http", "browser"]
+
+BLOCKED_STATUS_CODES = {401, 403, 429, 503}
+
+JS_REQUIRED_MARKERS = re.compile(
+    r"(enable|turn on|activate)\s+javascript"
+    r"|javascript\s+(is\s+)?(required|disabled|must be enabled)"
+    r"|requires\s+javascript"
+    r"|<div[^>]+id=[\"'](root|app|__next|__nuxt)[\"'][^>]*>\s*</div>",
+    re.IGNORECASE,
+)
+
+NOSCRIPT = re.compile(
+    r"<noscript[^>]*>(.*?)</noscript>", re.IGNORECASE | re.DOTALL
+)
+
+SCRIPT = re.compile(r"<script\b", re.IGNORECASE)
+
+
+def needs_browser(
+    response: ScrapeResponse,
+    min_text_length: int = 200,
+    min_text_ratio: float = 0.02,
+) -> str | None:
+    """
+    Decide whether an HTTP fetch looks incomplete without JavaScript.
+
+    Args:
+        response: HTTP engine response fetched with html and text
+        min_text_length: Visible characters below which a page is empty
+        min_text_ratio: Text to HTML size ratio below which a script-heavy
+            page is treated as a client-side rendered shell
+
+    Returns:
+        Reason to escalate to a browser, or None if the fetch is enough
+    """
+    status_code = response.metadata.get("status_code")
+    if status_code == HTTPStatus.NOT_MODIFIED:
+        # Revalidated against a page scraped before; nothing to render.
+        return None
+
+    content_type = response.metadata.get("content_type") or ""
+    if content_type and "html" not in content_type:
+        return None
+
+    html = response.html or ""
+    text = (response.text or "").strip()
+
+    if JS_REQUIRED_MARKERS.search(html) and len(text) < min_text_length * 5:
+        return "javascript required marker"
+
+    for noscript in NOSCRIPT.findall(html):
+        if "javascript" in noscript.lower() and len(text) < min_text_length:
+            return "noscript wall"
+
+    if len(text) < min_text_length:
+        return "empty body"
+
+    if SCRIPT.search(html) and len(text) < len(html) * min_text_ratio:
+        return "low text ratio"
+
+    return None
+
+
+class EngineSelector:
+    """Per-domain memory of which engine a site needs."""
+
+    def __init__(self, ttl: float = 3600, max_domains: int = 10000) -> None:
+        """
+        Initialize engine selector.
+
+        Args:
+            ttl: Seconds a per-domain decision is remembered
+            max_domains: Maximum domains remembered
+        """
+        self.ttl = ttl
+        self.max_domains = max_domains
+
+        self._decisions: OrderedDict[str, tuple[float, Engine]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> Engine | None:
+        """Remembered engine for a domain, if the decision is fresh."""
+        with self._lock:
+            decision = self._decisions.get(host)
+            if decision is None:
+                return None
+            decided_at, engine = decision
+            if time.monotonic() - decided_at > self.ttl:
+                del self._decisions[host]
+                return None
+            return engine
+
+    def remember(self, host: str, engine: Engine) -> None:
+        """Remember the engine a domain needs."""
+        with self._lock:
+            self._decisions[host] = (time.monotonic(), engine)
+            self._decisions.move_to_end(host)
+            while len(self._decisions) > self.max_domains:
+                self._decisions.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget every decision."""
+        with self._lock:
+            self._decisions.clear()
+
+
+engine_selector = EngineSelector(
+    ttl=settings.auto_engine_ttl,
+    max_domains=settings.auto_engine_max_domains,
+)
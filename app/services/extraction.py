@@ -0,0 +1,144 @@
+"""
+In-page extraction script for scraping operations.
+"""
+
+from typing import Any
+
+from app.serializers.scraper import ScrapeRequest
+from app.services.extraction_plans import ExtractionPlan
+
+EXTRACTION_SCRIPT = """
+const options = arguments[0];
+const root = document.documentElement;
+
+function selectAll(context, spec) {
+    if (spec.type !== "xpath") {
+        return Array.from(context.querySelectorAll(spec.selector));
+    }
+    const snapshot = document.evaluate(
+        spec.selector,
+        context,
+        null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE,
+        null
+    );
+    const nodes = [];
+    for (let index = 0; index < snapshot.snapshotLength; index++) {
+        nodes.push(snapshot.snapshotItem(index));
+    }
+    return nodes;
+}
+
+function readNode(node, spec, errors, path) {
+    if (spec.fields) {
+        return extractFields(node, spec.fields, errors, path + ".");
+    }
+    if (spec.attribute) {
+        // Properties resolve URLs and expose innerHTML/outerHTML.
+        const property = node[spec.attribute];
+        if (typeof property === "string") {
+            return property;
+        }
+        return node.getAttribute ? node.getAttribute(spec.attribute) : null;
+    }
+    const text =
+        node.innerText !== undefined ? node.innerText : node.textContent;
+    return text === null ? null : text.trim();
+}
+
+function extractFields(context, fields, errors, prefix) {
+    const values = {};
+    for (const [name, spec] of Object.entries(fields)) {
+        const path = prefix + name;
+        try {
+            const nodes = selectAll(context, spec);
+            if (spec.multiple) {
+                values[name] = nodes.map(
+                    (node) => readNode(node, spec, errors, path)
+                );
+            } else {
+                values[name] = nodes.length
+                    ? readNode(nodes[0], spec, errors, path)
+                    : null;
+            }
+        } catch (error) {
+            values[name] = spec.multiple ? [] : null;
+            errors[path] = String((error && error.message) || error);
+        }
+    }
+    return values;
+}
+function linkUrl(link) {
+    // SVG anchors expose href as an SVGAnimatedString, not a URL.
+    if (typeof link.href === "string") {
+        return link.href;
+    }
+    try {
+        return new URL(link.getAttribute("href"), document.baseURI).href;
+    } catch (error) {
+        return null;
+    }
+}
+
+const result = {
+    title: document.title,
+    current_url: window.location.href,
+    meta: {},
+};
+
+for (const meta of document.querySelectorAll("meta[content]")) {
+    const key = meta.getAttribute("name") || meta.getAttribute("property");
+    if (key) {
+        result.meta[key] = meta.getAttribute("content");
+    }
+}
+
+if (options.text) {
+    result.text = document.body ? document.body.innerText : null;
+}
+if (options.html) {
+    const doctype = document.doctype
+        ? new XMLSerializer().serializeToString(document.doctype)
+        : "";
+    result.html = root ? doctype + root.outerHTML : null;
+}
+if (options.links) {
+    result.links = Array.from(
+        document.querySelectorAll("a[href]"), linkUrl
+    ).filter(Boolean);
+}
+if (options.images) {
+    result.images = Array.from(
+        document.querySelectorAll("img[src]"), (img) => img.src
+    ).filter(Boolean);
+}
+if (options.selectors) {
+    result.selector_errors = {};
+    result.data = extractFields(
+        document, options.selectors, result.selector_errors, ""
+    );
+}
+return result;
+"""
+
+
+def extraction_options(
+    request: ScrapeRequest, plan: ExtractionPlan | None = None
+) -> dict[str, Any]:
+    """
+    Build the argument passed to EXTRACTION_SCRIPT.
+
+    Args:
+        request: ScrapeRequest with extraction options
+        plan: Compiled selectors of the request, if any
+
+    Returns:
+        Dictionary of fields the script should collect
+    """
+    return {
+        "text": request.extract_text,
+        "html": request.extract_html,
+        "links": request.extract_links,
+        "images": request.extract_images,
+        "selectors": plan.schema if plan is not None else None,
+    }
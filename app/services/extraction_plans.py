@@ -0,0 +1,278 @@
+"""
+Compiled extraction plans: cached per schema and registered by name.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.settings import settings
+from app.models.plans import ExtractionPlanRecord
+from app.serializers.scraper import ExtractionPlanResponse, SelectorField
+
+SCHEMA_ADAPTER = TypeAdapter(dict[str, SelectorField])
+
+# Seconds a plan loaded from the database is trusted before it is read
+# again, so plans re-registered by another worker are picked up.
+PLAN_REFRESH_INTERVAL = 30
+
+
+@dataclass(frozen=True)
+class ExtractionPlan:
+    """Selector schema translated once for the extraction script."""
+
+    key: str
+    fields: dict[str, SelectorField]
+    schema: dict[str, Any]
+    defaults: dict[str, Any]
+    name: str | None = None
+
+    def finalize(self, data: Any) -> dict[str, Any]:
+        """
+        Shape extracted values like the schema.
+
+        Args:
+            data: Values returned by the script or the command fallback
+
+        Returns:
+            Every field of the schema, missing ones with their empty value
+        """
+        values = data if isinstance(data, dict) else {}
+        return {**self.defaults, **values}
+
+    def to_response(self) -> ExtractionPlanResponse:
+        """Build the API response of a named plan."""
+        return ExtractionPlanResponse(
+            name=self.name or "", key=self.key, selectors=self.fields
+        )
+
+
+def schema_key(encoded: bytes) -> str:
+    """Hex SHA-256 of an encoded selector schema."""
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def compile_plan(
+    fields: dict[str, SelectorField], name: str | None = None
+) -> ExtractionPlan:
+    """
+    Translate a selector schema into a plan.
+
+    Args:
+        fields: Named selectors
+        name: Registered plan name, if any
+
+    Returns:
+        ExtractionPlan keyed by the schema hash
+    """
+    return _build_plan(fields, SCHEMA_ADAPTER.dump_json(fields), name)
+
+
+def _build_plan(
+    fields: dict[str, SelectorField], encoded: bytes, name: str | None
+) -> ExtractionPlan:
+    return ExtractionPlan(
+        key=schema_key(encoded),
+        fields=fields,
+        schema=json.loads(encoded),
+        defaults={
+            field_name: [] if field.multiple else None
+            for field_name, field in fields.items()
+        },
+        name=name,
+    )
+
+
+class ExtractionPlanCache:
+    """LRU of compiled plans keyed by schema hash."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """
+        Initialize plan cache.
+
+        Args:
+            max_entries: Plans kept
+        """
+        self.max_entries = max_entries
+        self._plans: OrderedDict[str, ExtractionPlan] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compile(self, fields: dict[str, SelectorField]) -> ExtractionPlan:
+        """
+        Get the plan of a selector schema, compiling it on a miss.
+
+        Args:
+            fields: Named selectors of a request
+
+        Returns:
+            Cached or newly compiled ExtractionPlan
+        """
+        encoded = SCHEMA_ADAPTER.dump_json(fields)
+        key = schema_key(encoded)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+
+        plan = _build_plan(fields, encoded, name=None)
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        """Drop every cached plan."""
+        with self._lock:
+            self._plans.clear()
+
+
+class DatabasePlanStore:
+    """Named plans shared by every worker through the database."""
+
+    def __init__(self) -> None:
+        self._table_ready = False
+        self._lock = threading.Lock()
+
+    def _ensure_table(self) -> None:
+        with self._lock:
+            if not self._table_ready:
+                Base.metadata.create_all(
+                    bind=engine, tables=[ExtractionPlanRecord.__table__]
+                )
+                self._table_ready = True
+
+    def get(self, name: str) -> dict[str, SelectorField] | None:
+        """Load the selectors registered under a name."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            row = db.get(ExtractionPlanRecord, name)
+            if row is None:
+                return None
+            return SCHEMA_ADAPTER.validate_json(row.schema)
+
+    def names(self) -> list[str]:
+        """Names of every registered plan."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            return list(db.scalars(select(ExtractionPlanRecord.name)))
+
+    def set(self, name: str, fields: dict[str, SelectorField]) -> None:
+        """Register selectors under a name."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            db.merge(
+                ExtractionPlanRecord(
+                    name=name,
+                    schema=SCHEMA_ADAPTER.dump_json(fields).decode(),
+                    updated_at=time.time(),
+                )
+            )
+            db.commit()
+
+    def delete(self, name: str) -> bool:
+        """Remove a plan, returning whether it existed."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            row = db.get(ExtractionPlanRecord, name)
+            if row is None:
+                return False
+            db.delete(row)
+            db.commit()
+            return True
+
+
+class ExtractionPlanRegistry:
+    """Named plans registered once and referenced by scrape requests."""
+
+    def __init__(self, store: DatabasePlanStore | None = None) -> None:
+        """
+        Initialize plan registry.
+
+        Args:
+            store: Optional database tier shared across workers
+        """
+        self.store = store
+        self._plans: dict[str, tuple[float, ExtractionPlan]] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self, name: str, fields: dict[str, SelectorField]
+    ) -> ExtractionPlan:
+        """
+        Register or replace a named plan.
+
+        Args:
+            name: Plan name
+            fields: Named selectors
+
+        Returns:
+            Compiled ExtractionPlan
+        """
+        plan = compile_plan(fields, name=name)
+        if self.store is not None:
+            self.store.set(name, fields)
+        with self._lock:
+            self._plans[name] = (time.monotonic(), plan)
+        return plan
+
+    def get(self, name: str) -> ExtractionPlan | None:
+        """Plan registered under a name."""
+        with self._lock:
+            entry = self._plans.get(name)
+        if entry is not None:
+            loaded_at, plan = entry
+            if (
+                self.store is None
+                or time.monotonic() - loaded_at < PLAN_REFRESH_INTERVAL
+            ):
+                return plan
+
+        if self.store is None:
+            return None
+        fields = self.store.get(name)
+        with self._lock:
+            if fields is None:
+                self._plans.pop(name, None)
+                return None
+            plan = compile_plan(fields, name=name)
+            self._plans[name] = (time.monotonic(), plan)
+        return plan
+
+    def names(self) -> list[str]:
+        """Names of every registered plan, sorted."""
+        if self.store is not None:
+            return sorted(self.store.names())
+        with self._lock:
+            return sorted(self._plans)
+
+    def delete(self, name: str) -> bool:
+        """
+        Remove a named plan.
+
+        Returns:
+            Whether the plan existed
+        """
+        with self._lock:
+            existed = self._plans.pop(name, None) is not None
+        if self.store is not None:
+            existed = self.store.delete(name)
+        return existed
+
+
+plan_cache = ExtractionPlanCache(
+    max_entries=settings.extraction_plan_cache_size
+)
+
+extraction_plans = ExtractionPlanRegistry(
+    store=DatabasePlanStore() if settings.extraction_plans_persistent else None
+)
@@ -0,0 +1,314 @@
+"""
+Lightweight HTTP fetch engine for pages that need no browser.
+"""
+
+import codecs
+import contextlib
+import importlib.util
+import logging
+import re
+import threading
+from html.parser import HTMLParser
+from typing import Any
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.errors import (
+    HttpConnectionError,
+    HttpStatusError,
+    ScrapingError,
+)
+from app.core.settings import settings
+from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+
+logger = logging.getLogger(__name__)
+
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+
+BLOCK_TAGS = {
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "br",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "fieldset",
+    "figcaption",
+    "figure",
+    "footer",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hr",
+    "li",
+    "main",
+    "nav",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "td",
+    "th",
+    "tr",
+    "ul",
+}
+
+WHITESPACE = re.compile(r"\s+")
+
+META_CHARSET = re.compile(rb"<meta[^>]+charset=[\"']?([\w-]+)", re.IGNORECASE)
+
+
+class PageParser(HTMLParser):
+    """Collect title, visible text, links, images and meta tags."""
+
+    def __init__(self, base_url: str) -> None:
+        """
+        Initialize parser.
+
+        Args:
+            base_url: URL relative links and images are resolved against
+        """
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.title: str | None = None
+        self.links: list[str] = []
+        self.images: list[str] = []
+        self.meta: dict[str, str] = {}
+
+        self._chunks: list[str] = []
+        self._title: list[str] | None = None
+        self._skip_depth = 0
+
+    @property
+    def text(self) -> str:
+        """Visible text with one line per block element."""
+        lines = (line.strip() for line in "".join(self._chunks).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def handle_starttag(
+        self, tag: str, attrs: list[tuple[str, str | None]]
+    ) -> None:
+        """Track skipped sections and collect tag attributes."""
+        values = {name: value for name, value in attrs if value is not None}
+        if tag == "title" and self.title is None:
+            self._title = []
+        elif tag == "base" and values.get("href"):
+            self.base_url = urljoin(self.base_url, values["href"])
+        elif tag == "meta" and "content" in values:
+            key = values.get("name") or values.get("property")
+            if key:
+                self.meta[key] = values["content"]
+        elif tag == "a" and values.get("href"):
+            self.links.append(urljoin(self.base_url, values["href"]))
+        elif tag == "img" and values.get("src"):
+            self.images.append(urljoin(self.base_url, values["src"]))
+
+        if tag == "body":
+            self._skip_depth = 0
+        elif tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._chunks.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        """Close skipped sections and the title."""
+        if tag == "title" and self._title is not None:
+            self.title = WHITESPACE.sub(" ", "".join(self._title)).strip()
+            self._title = None
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._chunks.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        """Collect title and visible text."""
+        if self._title is not None:
+            self._title.append(data)
+        elif not self._skip_depth:
+            self._chunks.append(WHITESPACE.sub(" ", data))
+
+
+class HttpEngine:
+    """Fetch pages over pooled keep-alive HTTP sessions."""
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: float = 30,
+        max_bytes: int = 10 * 1024 * 1024,
+        user_agent: str | None = None,
+    ) -> None:
+        """
+        Initialize HTTP engine.
+
+        Args:
+            pool_size: Keep-alive connections kept per host
+            timeout: Request timeout in seconds
+            max_bytes: Largest response body read
+            user_agent: User-Agent header sent with requests
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.user_agent = user_agent
+
+        self._sessions: dict[int | None, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def fetch(
+        self,
+        request: ScrapeRequest,
+        socks_port: int | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> ScrapeResponse:
+        """
+        Fetch and parse a page without a browser.
+
+        Args:
+            request: ScrapeRequest with extraction options
+            socks_port: Local Tor SOCKS port to route the request through
+            headers: Extra request headers, such as conditional ones
+
+        Returns:
+            ScrapeResponse shaped like a browser scrape
+
+        Raises:
+            ValueError: If SOCKS support is not installed
+            HttpStatusError: If the server answers with an error status
+            HttpConnectionError: If the server or proxy cannot be reached
+            ScrapingError: If the page cannot be fetched
+        """
+        session = self._session(socks_port)
+        try:
+            with session.get(
+                str(request.url),
+                headers=headers,
+                timeout=self.timeout,
+                stream=True,
+            ) as response:
+                if response.status_code >= 400:
+                    raise HttpStatusError(
+                        f"HTTP fetch failed: {response.status_code} "
+                        f"{response.reason}",
+                        response.status_code,
+                    )
+                body = self._read(response)
+                html = body.decode(self._encoding(response, body), "replace")
+        except requests.ConnectionError as e:
+            raise HttpConnectionError(f"HTTP fetch failed: {str(e)}") from e
+        except requests.RequestException as e:
+            raise ScrapingError(f"HTTP fetch failed: {str(e)}") from e
+
+        content_type = response.headers.get("Content-Type", "")
+        parser = PageParser(response.url)
+        if "html" in content_type or not content_type:
+            parser.feed(html)
+            parser.close()
+            text = parser.text
+        else:
+            text = html
+
+        response_data: dict[str, Any] = {
+            "url": str(request.url),
+            "title": parser.title,
+            "text": text if request.extract_text else None,
+            "html": html if request.extract_html else None,
+            "links": parser.links if request.extract_links else [],
+            "images": parser.images if request.extract_images else [],
+            "metadata": {
+                "current_url": response.url,
+                "wait_time": request.wait_time,
+                "headless": request.headless,
+                "browser_type": request.browser_type,
+                "extraction": "http",
+                "status_code": response.status_code,
+                "content_type": content_type,
+            },
+        }
+        if parser.meta:
+            response_data["metadata"]["page_meta"] = parser.meta
+        for header, key in (
+            ("ETag", "etag"),
+            ("Last-Modified", "last_modified"),
+        ):
+            if response.headers.get(header):
+                response_data["metadata"][key] = response.headers[header]
+        return ScrapeResponse(**response_data)
+
+    def close(self) -> None:
+        """Close every pooled session."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+    def _session(self, socks_port: int | None) -> requests.Session:
+        if socks_port is not None and not importlib.util.find_spec("socks"):
+            raise ValueError(
+                "Fetching over Tor requires SOCKS support: "
+                "install requests[socks]"
+            )
+
+        with self._lock:
+            session = self._sessions.get(socks_port)
+            if session is not None:
+                return session
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_size, pool_maxsize=self.pool_size
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            if self.user_agent:
+                session.headers["User-Agent"] = self.user_agent
+            if socks_port is not None:
+                proxy = f"socks5h://127.0.0.1:{socks_port}"
+                session.proxies = {"http": proxy, "https": proxy}
+                session.trust_env = False
+            self._sessions[socks_port] = session
+            return session
+
+    def _read(self, response: requests.Response) -> bytes:
+        """Read the response body, stopping at max_bytes."""
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                logger.warning(
+                    "Truncated %s at %d bytes", response.url, self.max_bytes
+                )
+                break
+        return b"".join(chunks)[: self.max_bytes]
+
+    def _encoding(self, response: requests.Response, body: bytes) -> str:
+        """Charset from the Content-Type header or a meta tag."""
+        if "charset" in response.headers.get("Content-Type", "").lower():
+            return response.encoding or "utf-8"
+        match = META_CHARSET.search(body[:2048])
+        if match:
+            encoding = match.group(1).decode("ascii")
+            with contextlib.suppress(LookupError):
+                return codecs.lookup(encoding).name
+        return "utf-8"
+
+
+http_engine = HttpEngine(
+    pool_size=settings.http_pool_size,
+    timeout=settings.http_timeout,
+    max_bytes=settings.http_max_bytes,
+    user_agent=settings.http_user_agent,
+)
@@ -0,0 +1,288 @@
+"""
+Job queue for asynchronous scraping operations.
+"""
+
+import contextlib
+import logging
+import queue
+import threading
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.errors import JobQueueFullError
+from app.core.settings import settings
+from app.models.jobs import ScrapeJobRecord
+from app.serializers.scraper import (
+    ScrapeJobResponse,
+    ScrapeJobStatus,
+    ScrapeRequest,
+    ScrapeResponse,
+)
+from app.services.scraper_service import ScraperService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScrapeJob:
+    """Scrape request tracked through the job queue."""
+
+    request: ScrapeRequest
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: ScrapeJobStatus = "queued"
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: ScrapeResponse | None = None
+    error: str | None = None
+
+    def to_response(self) -> ScrapeJobResponse:
+        """Serialize the job for the API."""
+        return ScrapeJobResponse(
+            id=self.id,
+            status=self.status,
+            url=str(self.request.url),
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            result=self.result,
+            error=self.error,
+        )
+
+
+class DatabaseJobStore:
+    """Job state shared by every worker through the database."""
+
+    def __init__(self) -> None:
+        self._table_ready = False
+        self._lock = threading.Lock()
+
+    def _ensure_table(self) -> None:
+        with self._lock:
+            if not self._table_ready:
+                Base.metadata.create_all(
+                    bind=engine, tables=[ScrapeJobRecord.__table__]
+                )
+                self._table_ready = True
+
+    def get(self, job_id: str) -> ScrapeJob | None:
+        """Load a job by id."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            row = db.get(ScrapeJobRecord, job_id)
+            if row is None:
+                return None
+            state = ScrapeJobResponse.model_validate_json(row.state)
+            return ScrapeJob(
+                request=ScrapeRequest.model_validate_json(row.request),
+                id=state.id,
+                status=state.status,
+                created_at=state.created_at,
+                started_at=state.started_at,
+                finished_at=state.finished_at,
+                result=state.result,
+                error=state.error,
+            )
+
+    def set(self, job: ScrapeJob) -> None:
+        """Store the current state of a job."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            db.merge(
+                ScrapeJobRecord(
+                    id=job.id,
+                    request=job.request.model_dump_json(),
+                    state=job.to_response().model_dump_json(),
+                    finished_at=(
+                        job.finished_at.timestamp()
+                        if job.finished_at is not None
+                        else None
+                    ),
+                )
+            )
+            db.commit()
+
+    def delete(self, job_id: str) -> None:
+        """Remove a job."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            row = db.get(ScrapeJobRecord, job_id)
+            if row is not None:
+                db.delete(row)
+                db.commit()
+
+    def purge(self, before: float) -> int:
+        """Delete jobs finished before a time, returning their count."""
+        self._ensure_table()
+        with SessionLocal() as db:
+            deleted = (
+                db.query(ScrapeJobRecord)
+                .filter(ScrapeJobRecord.finished_at < before)
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return deleted
+
+
+class ScrapeJobQueue:
+    """In-process queue of scrape jobs drained by worker threads."""
+
+    def __init__(
+        self,
+        runner: Callable[[ScrapeRequest], ScrapeResponse],
+        workers: int = 2,
+        max_size: int = 100,
+        result_ttl: float = 3600,
+        store: DatabaseJobStore | None = None,
+    ) -> None:
+        """
+        Initialize job queue.
+
+        Jobs run in the process they were submitted to. With a store, their
+        state is also written to the database, so a poll answered by any
+        worker process finds them.
+
+        Args:
+            runner: Callable performing the scrape for a request
+            workers: Worker threads draining the queue
+            max_size: Maximum queued jobs
+            result_ttl: Seconds finished jobs are kept for retrieval
+            store: Optional database tier shared across workers
+        """
+        self.runner = runner
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.store = store
+
+        self._queue: queue.Queue[ScrapeJob] = queue.Queue(maxsize=max_size)
+        self._jobs: dict[str, ScrapeJob] = {}
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def submit(self, request: ScrapeRequest) -> ScrapeJob:
+        """
+        Queue a scrape request.
+
+        Args:
+            request: ScrapeRequest to run in the background
+
+        Returns:
+            Queued ScrapeJob
+
+        Raises:
+            JobQueueFullError: If the queue is at capacity
+        """
+        self._start_workers()
+        self._purge_expired()
+
+        job = ScrapeJob(request=request)
+        with self._lock:
+            self._jobs[job.id] = job
+        # Stored before it is queued, so a worker's update cannot be
+        # overwritten by the queued state.
+        self._save(job)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full as e:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            if self.store is not None:
+                with contextlib.suppress(Exception):
+                    self.store.delete(job.id)
+            raise JobQueueFullError(
+                f"Job queue is full ({self._queue.maxsize} jobs)"
+            ) from e
+
+        logger.info("Queued scrape job %s for %s", job.id, request.url)
+        return job
+
+    def get(self, job_id: str) -> ScrapeJob | None:
+        """Get a job by id, if it is still retained."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None or self.store is None:
+            return job
+        try:
+            return self.store.get(job_id)
+        except Exception as e:
+            logger.warning("Persistent job lookup failed: %s", e)
+            return None
+
+    def _start_workers(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"scrape-job-worker-{index}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: ScrapeJob) -> None:
+        job.status = "running"
+        job.started_at = datetime.now(UTC)
+        self._save(job)
+        try:
+            result = self.runner(job.request)
+        except Exception as e:
+            logger.error("Scrape job %s failed: %s", job.id, e)
+            job.error = f"{type(e).__name__}: {str(e)}"
+            job.finished_at = datetime.now(UTC)
+            job.status = "failed"
+            self._save(job)
+            return
+
+        job.result = result
+        job.finished_at = datetime.now(UTC)
+        job.status = "succeeded"
+        self._save(job)
+
+    def _save(self, job: ScrapeJob) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.set(job)
+        except Exception as e:
+            logger.warning("Persistent job write failed: %s", e)
+
+    def _purge_expired(self) -> None:
+        """Drop finished jobs older than the result TTL."""
+        cutoff = datetime.now(UTC) - timedelta(seconds=self.result_ttl)
+        with self._lock:
+            expired = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+        if self.store is None:
+            return
+        try:
+            self.store.purge(cutoff.timestamp())
+        except Exception as e:
+            logger.warning("Persistent job purge failed: %s", e)
+
+
+scrape_jobs = ScrapeJobQueue(
+    runner=lambda request: ScraperService().scrape(request),
+    workers=settings.job_workers,
+    max_size=settings.job_queue_max_size,
+    result_ttl=settings.job_result_ttl,
+    store=DatabaseJobStore() if settings.jobs_persistent else None,
+)
@@ -0,0 +1,468 @@
+"""
+Content-addressed store of scraped pages.
+"""
+
+import gzip
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, func, insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, engine
+from app.core.settings import settings
+from app.models.pages import PageContent, PageFetch
+from app.serializers.scraper import ScrapeResponse
+from app.services.cache import normalize_url
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    ZSTANDARD = False
+else:
+    ZSTANDARD = True
+
+logger = logging.getLogger(__name__)
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def content_hash(content: str) -> str:
+    """Hex SHA-256 of a page's content, its key in the store."""
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def url_key(url: str) -> str:
+    """Hex SHA-256 of a normalized URL, the index of its fetches."""
+    return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+
+def resolve_codec(codec: str) -> str:
+    """
+    Pick the codec new content is compressed with.
+
+    Args:
+        codec: 'auto', 'zstd' or 'gzip'
+
+    Returns:
+        'zstd' when requested or automatic and zstandard is installed,
+        otherwise 'gzip'
+    """
+    if codec == "gzip":
+        return "gzip"
+    if not ZSTANDARD:
+        if codec == "zstd":
+            logger.warning("zstandard is not installed, using gzip")
+        return "gzip"
+    return "zstd"
+
+
+def compress(content: str, codec: str) -> tuple[str, bytes]:
+    """
+    Compress page content.
+
+    Content that does not shrink, such as tiny pages, is kept as is.
+
+    Args:
+        content: Page content
+        codec: 'zstd' or 'gzip'
+
+    Returns:
+        Tuple of (codec actually used, blob)
+    """
+    raw = content.encode()
+    if codec == "zstd":
+        blob = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    else:
+        blob = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    if len(blob) >= len(raw):
+        return "identity", raw
+    return codec, blob
+
+
+def decompress(codec: str, blob: bytes) -> str:
+    """
+    Restore page content from a stored blob.
+
+    Raises:
+        ValueError: If the codec is unknown or unavailable
+    """
+    if codec == "identity":
+        raw = blob
+    elif codec == "gzip":
+        raw = gzip.decompress(blob)
+    elif codec == "zstd" and ZSTANDARD:
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    else:
+        raise ValueError(f"Cannot decompress page content with {codec!r}")
+    return raw.decode()
+
+
+@dataclass
+class StoredPage:
+    """One fetch of a URL with its content."""
+
+    url: str
+    fetched_at: float
+    title: str | None = None
+    html: str | None = None
+    text: str | None = None
+    html_hash: str | None = None
+    text_hash: str | None = None
+
+
+@dataclass
+class _PendingFetch:
+    """Fetch buffered until the next bulk insert."""
+
+    row: dict[str, Any]
+    contents: dict[str, str] = field(default_factory=dict)
+    size: int = 0
+
+
+class PageStore:
+    """
+    Scraped pages stored once per distinct content.
+
+    Each fetch records the URL, time and content hashes; the HTML and text
+    themselves are compressed and stored under their hash, so mirrors and
+    unchanged re-fetches cost one small row. Fetches are buffered and
+    written in bulk, by a background thread or when the buffer fills.
+    """
+
+    def __init__(
+        self,
+        bind: Engine = engine,
+        codec: str = "auto",
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        known_hashes: int = 10000,
+        max_pending_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        """
+        Initialize page store.
+
+        Args:
+            bind: Database engine the tables live in
+            codec: 'auto', 'zstd' or 'gzip'
+            batch_size: Fetches buffered before a bulk insert
+            flush_interval: Seconds fetches wait at most, 0 to only flush
+                when the buffer fills or on demand
+            known_hashes: Stored hashes remembered to skip lookups
+            max_pending_bytes: Bytes of page content kept for another
+                try while writes fail, the oldest fetches are dropped
+                beyond it
+        """
+        self.bind = bind
+        self.codec = resolve_codec(codec)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.known_hashes = known_hashes
+        self.max_pending_bytes = max_pending_bytes
+
+        self._sessions = sessionmaker(
+            autocommit=False, autoflush=False, bind=bind
+        )
+        self._pending: list[_PendingFetch] = []
+        self._known: OrderedDict[str, None] = OrderedDict()
+        self._tables_ready = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._flusher: threading.Thread | None = None
+
+    def add(
+        self, response: ScrapeResponse, fetched_at: float | None = None
+    ) -> str | None:
+        """
+        Buffer a scraped page for storage.
+
+        Args:
+            response: ScrapeResponse whose HTML and text are stored
+            fetched_at: Unix time of the fetch, defaults to now
+
+        Returns:
+            Hash of the page's HTML, or of its text when there is no HTML
+        """
+        contents: dict[str, str] = {}
+        hashes: dict[str, str | None] = {}
+        for name in ("html", "text"):
+            value = getattr(response, name)
+            hashes[name] = None
+            if value is not None:
+                hashes[name] = digest = content_hash(value)
+                contents[digest] = value
+
+        pending = _PendingFetch(
+            row={
+                "url": response.url,
+                "url_key": url_key(response.url),
+                "title": response.title,
+                "html_hash": hashes["html"],
+                "text_hash": hashes["text"],
+                "fetched_at": time.time()
+                if fetched_at is None
+                else fetched_at,
+            },
+            contents=contents,
+            size=sum(len(value.encode()) for value in contents.values()),
+        )
+        with self._lock:
+            self._pending.append(pending)
+            full = len(self._pending) >= self.batch_size
+            if self.flush_interval and self._flusher is None:
+                self._start_flusher()
+        if full and self._flusher is not None:
+            self._wakeup.set()
+        elif full:
+            self.flush()
+        return hashes["html"] or hashes["text"]
+
+    def flush(self) -> int:
+        """
+        Write buffered fetches and their new content in one transaction.
+
+        Fetches of a failed write go back to the buffer for the next
+        flush, up to max_pending_bytes of content.
+
+        Returns:
+            Number of fetches written
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                self._write(batch)
+            except SQLAlchemyError as e:
+                logger.warning(
+                    "Page store write of %d fetches failed: %s", len(batch), e
+                )
+                self._requeue(batch)
+                return 0
+            return len(batch)
+
+    def latest(self, url: str) -> StoredPage | None:
+        """Most recent stored fetch of a URL."""
+        pages = self.history(url, limit=1)
+        return pages[0] if pages else None
+
+    def history(self, url: str, limit: int = 10) -> list[StoredPage]:
+        """
+        Stored fetches of a URL, newest first.
+
+        Args:
+            url: URL in any equivalent spelling
+            limit: Maximum fetches returned
+
+        Returns:
+            StoredPage entries with their content restored
+        """
+        self._ensure_tables()
+        with self._sessions() as db:
+            fetches = db.scalars(
+                select(PageFetch)
+                .where(PageFetch.url_key == url_key(url))
+                .order_by(PageFetch.fetched_at.desc(), PageFetch.id.desc())
+                .limit(limit)
+            ).all()
+            hashes = {
+                value
+                for fetch in fetches
+                for value in (fetch.html_hash, fetch.text_hash)
+                if value is not None
+            }
+            contents = self._load(db, hashes)
+            return [
+                StoredPage(
+                    url=fetch.url,
+                    fetched_at=fetch.fetched_at,
+                    title=fetch.title,
+                    html=contents.get(fetch.html_hash)
+                    if fetch.html_hash
+                    else None,
+                    text=contents.get(fetch.text_hash)
+                    if fetch.text_hash
+                    else None,
+                    html_hash=fetch.html_hash,
+                    text_hash=fetch.text_hash,
+                )
+                for fetch in fetches
+            ]
+
+    def content(self, digest: str) -> str | None:
+        """Content stored under a hash."""
+        self._ensure_tables()
+        with self._sessions() as db:
+            return self._load(db, {digest}).get(digest)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Storage totals.
+
+        Returns:
+            Dict with fetch and content counts, the bytes fetched, the
+            distinct bytes and the bytes actually stored
+        """
+        self._ensure_tables()
+        with self._sessions() as db:
+            contents, size, stored_size = db.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(PageContent.size), 0),
+                    func.coalesce(func.sum(PageContent.stored_size), 0),
+                )
+            ).one()
+            fetches = db.scalar(select(func.count()).select_from(PageFetch))
+            fetched_size = sum(
+                db.scalar(
+                    select(func.coalesce(func.sum(PageContent.size), 0)).join(
+                        PageFetch, column == PageContent.hash
+                    )
+                )
+                for column in (PageFetch.html_hash, PageFetch.text_hash)
+            )
+        return {
+            "fetches": fetches,
+            "contents": contents,
+            "fetched_bytes": fetched_size,
+            "content_bytes": size,
+            "stored_bytes": stored_size,
+            "pending": len(self._pending),
+        }
+
+    def close(self) -> None:
+        """Stop the background flusher and write what is buffered."""
+        self._closed = True
+        self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=10)
+            self._flusher = None
+        self.flush()
+
+    def _start_flusher(self) -> None:
+        self._closed = False
+        self._flusher = threading.Thread(
+            target=self._run_flusher, name="page-store-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _ensure_tables(self) -> None:
+        with self._lock:
+            if not self._tables_ready:
+                Base.metadata.create_all(
+                    bind=self.bind,
+                    tables=[PageContent.__table__, PageFetch.__table__],
+                )
+                self._tables_ready = True
+
+    def _write(self, batch: list[_PendingFetch]) -> None:
+        self._ensure_tables()
+        contents: dict[str, str] = {}
+        for pending in batch:
+            contents.update(pending.contents)
+        with self._lock:
+            unknown = [
+                digest for digest in contents if digest not in self._known
+            ]
+
+        # Another worker may store the same content between our lookup and
+        # insert; the retry sees its row and skips it.
+        for attempt in range(2):
+            with self._sessions() as db:
+                existing = set(
+                    db.scalars(
+                        select(PageContent.hash).where(
+                            PageContent.hash.in_(unknown)
+                        )
+                    )
+                    if unknown
+                    else ()
+                )
+                now = time.time()
+                rows = [
+                    self._content_row(digest, contents[digest], now)
+                    for digest in unknown
+                    if digest not in existing
+                ]
+                try:
+                    if rows:
+                        db.execute(insert(PageContent), rows)
+                    db.execute(
+                        insert(PageFetch), [pending.row for pending in batch]
+                    )
+                    db.commit()
+                    break
+                except IntegrityError:
+                    db.rollback()
+                    if attempt:
+                        raise
+        self._remember(unknown)
+
+    def _content_row(
+        self, digest: str, content: str, now: float
+    ) -> dict[str, Any]:
+        codec, blob = compress(content, self.codec)
+        return {
+            "hash": digest,
+            "codec": codec,
+            "data": blob,
+            "size": len(content.encode()),
+            "stored_size": len(blob),
+            "created_at": now,
+        }
+
+    def _load(self, db: Any, hashes: set[str]) -> dict[str, str]:
+        if not hashes:
+            return {}
+        rows = db.execute(
+            select(
+                PageContent.hash, PageContent.codec, PageContent.data
+            ).where(PageContent.hash.in_(hashes))
+        )
+        return {
+            digest: decompress(codec, data) for digest, codec, data in rows
+        }
+
+    def _requeue(self, batch: list[_PendingFetch]) -> None:
+        with self._lock:
+            self._pending[:0] = batch
+            size = sum(pending.size for pending in self._pending)
+            dropped = 0
+            while size > self.max_pending_bytes and self._pending[dropped:]:
+                size -= self._pending[dropped].size
+                dropped += 1
+            del self._pending[:dropped]
+        if dropped:
+            logger.warning("Page store dropped %d unwritten fetches", dropped)
+
+    def _remember(self, hashes: list[str]) -> None:
+        with self._lock:
+            for digest in hashes:
+                self._known[digest] = None
+                self._known.move_to_end(digest)
+            while len(self._known) > self.known_hashes:
+                self._known.popitem(last=False)
+
+
+page_store = PageStore(
+    codec=settings.page_store_codec,
+    batch_size=settings.page_store_batch_size,
+    flush_interval=settings.page_store_flush_interval,
+    max_pending_bytes=settings.page_store_max_pending_bytes,
+)
@@ -0,0 +1,235 @@
+"""
+Page readiness strategies for scraping operations.
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from app.serializers.scraper import ScrapeRequest
+
+READY_STATE_SCRIPT = "return document.readyState"
+
+NETWORK_ACTIVITY_SCRIPT = """
+if (!window.__scraperNetwork) {
+    const state = {pending: 0, last: performance.now()};
+    const touch = () => {
+        state.last = performance.now();
+    };
+    const start = () => {
+        state.pending += 1;
+        touch();
+    };
+    const done = () => {
+        state.pending = Math.max(0, state.pending - 1);
+        touch();
+    };
+    new PerformanceObserver(touch).observe({type: "resource"});
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function () {
+            start();
+            return fetch.apply(this, arguments).finally(done);
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        start();
+        this.addEventListener("loadend", done, {once: true});
+        try {
+            return send.apply(this, arguments);
+        } catch (e) {
+            done();
+            throw e;
+        }
+    };
+    window.__scraperNetwork = state;
+}
+return [
+    document.readyState,
+    window.__scraperNetwork.pending,
+    performance.now() - window.__scraperNetwork.last,
+];
+"""
+
+DOM_QUIET_SCRIPT = """
+if (!window.__scraperMutations) {
+    const state = {last: performance.now()};
+    new MutationObserver(() => {
+        state.last = performance.now();
+    }).observe(document, {
+        subtree: true,
+        childList: true,
+        attributes: true,
+        characterData: true,
+    });
+    window.__scraperMutations = state;
+}
+return [
+    document.readyState,
+    performance.now() - window.__scraperMutations.last,
+];
+"""
+
+SELECTOR_SCRIPT = "return document.querySelector(arguments[0]) !== null"
+
+
+class ReadinessStrategy(ABC):
+    """Condition deciding when a loaded page is ready for extraction."""
+
+    poll_interval: float = 0.1
+
+    def __init__(self, request: ScrapeRequest) -> None:
+        """
+        Initialize readiness strategy.
+
+        Args:
+            request: ScrapeRequest with readiness options
+        """
+        self.request = request
+
+    @abstractmethod
+    def probe(self) -> tuple[Any, ...]:
+        """Script, and its arguments, reporting the page state."""
+        pass
+
+    @abstractmethod
+    def check(self, state: Any) -> bool:
+        """Decide from the probe result whether the page is ready."""
+        pass
+
+    def is_ready(self, driver) -> bool:
+        """Check whether the page is ready."""
+        return self.check(driver.execute_script(*self.probe()))
+
+    async def wait_async(self, driver, timeout: float) -> bool:
+        """
+        Poll an AsyncWebDriver until the page is ready or time runs out.
+
+        Args:
+            driver: AsyncWebDriver instance
+            timeout: Upper bound in seconds
+
+        Returns:
+            True if the page became ready before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if self.check(await driver.execute_script(*self.probe())):
+                    return True
+            except JavascriptException:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(self.poll_interval, remaining))
+
+    def wait(self, driver, timeout: float) -> bool:
+        """
+        Poll until the page is ready or the timeout elapses.
+
+        Args:
+            driver: WebDriver instance
+            timeout: Upper bound in seconds
+
+        Returns:
+            True if the page became ready before the timeout
+        """
+        try:
+            WebDriverWait(
+                driver,
+                timeout,
+                poll_frequency=self.poll_interval,
+                ignored_exceptions=(JavascriptException,),
+            ).until(self.is_ready)
+        except TimeoutException:
+            return False
+        return True
+
+
+class ReadyStateStrategy(ReadinessStrategy):
+    """Ready once document.readyState is complete."""
+
+    def probe(self) -> tuple[Any, ...]:
+        """Read document.readyState."""
+        return (READY_STATE_SCRIPT,)
+
+    def check(self, state: Any) -> bool:
+        """Check document.readyState."""
+        return bool(state == "complete")
+
+
+class NetworkIdleStrategy(ReadinessStrategy):
+    """
+    Ready once no request is pending and none finished for idle_time_ms.
+
+    The probe wraps fetch and XMLHttpRequest to count requests in flight and
+    observes resource timing entries as they arrive, so activity is still
+    seen once the page fills the resource timing buffer.
+    """
+
+    def probe(self) -> tuple[Any, ...]:
+        """Read the ready state, pending requests and the quiet period."""
+        return (NETWORK_ACTIVITY_SCRIPT,)
+
+    def check(self, state: Any) -> bool:
+        """Check for requests in flight and recent network activity."""
+        ready_state, pending, quiet_ms = state
+        return bool(
+            ready_state == "complete"
+            and pending == 0
+            and quiet_ms >= self.request.idle_time_ms
+        )
+
+
+class DomQuietStrategy(ReadinessStrategy):
+    """Ready once the DOM has not mutated for idle_time_ms."""
+
+    def probe(self) -> tuple[Any, ...]:
+        """Read the ready state and the time since the last mutation."""
+        return (DOM_QUIET_SCRIPT,)
+
+    def check(self, state: Any) -> bool:
+        """Check the time since the last observed DOM mutation."""
+        ready_state, quiet_ms = state
+        return bool(
+            ready_state == "complete" and quiet_ms >= self.request.idle_time_ms
+        )
+
+
+class SelectorStrategy(ReadinessStrategy):
+    """Ready once an element matches wait_selector."""
+
+    def probe(self) -> tuple[Any, ...]:
+        """Look up the CSS selector."""
+        return (SELECTOR_SCRIPT, self.request.wait_selector)
+
+    def check(self, state: Any) -> bool:
+        """Check for an element matching the CSS selector."""
+        return bool(state)
+
+
+READINESS_STRATEGIES: dict[str, type[ReadinessStrategy]] = {
+    "ready_state": ReadyStateStrategy,
+    "network_idle": NetworkIdleStrategy,
+    "dom_quiet": DomQuietStrategy,
+    "selector": SelectorStrategy,
+}
+
+
+def get_readiness_strategy(request: ScrapeRequest) -> ReadinessStrategy:
+    """
+    Build the readiness strategy selected by a request.
+
+    Args:
+        request: ScrapeRequest with readiness options
+
+    Returns:
+        ReadinessStrategy instance
+    """
+    return READINESS_STRATEGIES[request.wait_strategy](request)
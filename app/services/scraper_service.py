@@ -2,33 +2,171 @@
 Scraper service for web scraping operations using Tor Browser.
 """
 
+import asyncio
+import atexit
 import contextlib
+import functools
+import itertools
 import logging
+import math
+import os
 import time
+from collections.abc import Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from http import HTTPStatus
 from typing import Any
+from urllib.parse import urlsplit
 
+from anyio import to_thread
+from pydantic import BaseModel
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 
 from app.core.browsers.chrome import Chrome
+from app.core.browsers.lifecycle import DriverLifecycle
+from app.core.browsers.pool import BrowserPool, BrowserPoolRegistry
+from app.core.browsers.resources import (
+    RESOURCE_KINDS,
+    TRACKER_DOMAINS,
+    ResourceBlocking,
+    apply_resource_blocking,
+)
+from app.core.browsers.slots import BrowserSlots
+from app.core.browsers.tabs import TabPoolRegistry
 from app.core.browsers.tor import TorBrowser
-from app.core.errors import ScrapingError
-from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.core.browsers.tor_circuits import TorCircuitManager
+from app.core.browsers.tor_process import TorProcess
+from app.core.browsers.webdriver_async import AsyncWebDriver
+from app.core.errors import (
+    AdmissionRejectedError,
+    HttpConnectionError,
+    HttpStatusError,
+    ScrapingError,
+)
+from app.core.metrics import (
+    CommandStats,
+    StageTimings,
+    instrument_driver,
+    scrape_stage_seconds,
+    scrapes_total,
+)
+from app.core.settings import settings
+from app.serializers.scraper import (
+    CrawlRequest,
+    ScrapeBatchItem,
+    ScrapeBatchRequest,
+    ScrapeBatchResponse,
+    ScrapeBatchStreamItem,
+    ScrapeRequest,
+    ScrapeResponse,
+    ScrapeStreamDone,
+    ScrapeStreamField,
+    ScrapeStreamFieldName,
+    ScrapeStreamPage,
+    SelectorField,
+)
+from app.services.admission import admission
+from app.services.cache import request_cache_key, result_cache
+from app.services.change_tracking import change_tracker, fingerprint
+from app.services.crawler import Crawler
+from app.services.engine_selection import (
+    BLOCKED_STATUS_CODES,
+    engine_selector,
+    needs_browser,
+)
+from app.services.extraction import EXTRACTION_SCRIPT, extraction_options
+from app.services.extraction_plans import (
+    ExtractionPlan,
+    extraction_plans,
+    plan_cache,
+)
+from app.services.http_engine import http_engine
+from app.services.page_store import page_store
+from app.services.readiness import get_readiness_strategy
+from app.services.singleflight import AsyncSingleFlight, SingleFlight
 
 logger = logging.getLogger(__name__)
 
+STREAM_FIELDS: tuple[ScrapeStreamFieldName, ...] = (
+    "links",
+    "images",
+    "text",
+    "html",
+)
+
+browser_slots = BrowserSlots(
+    settings.browser_slot_dir, settings.browser_host_max
+)
+
+browser_pools = BrowserPoolRegistry(slots=browser_slots)
+atexit.register(browser_pools.close)
+
+driver_lifecycle = DriverLifecycle(
+    max_age=settings.browser_max_age, max_rss_mb=settings.browser_max_rss_mb
+)
+
+tab_pools = TabPoolRegistry()
+
+scrape_flights = SingleFlight()
+
+async_scrape_flights = AsyncSingleFlight()
+
+# Async scrapes lease and release browsers on threads of their own, so
+# handlers blocked in the shared thread pool cannot hold up the releases
+# that free browsers. Leases only wait on releases, never the reverse.
+browser_lease_executor = ThreadPoolExecutor(
+    max_workers=2 * settings.browser_pool_max_size,
+    thread_name_prefix="browser-lease",
+)
+browser_release_executor = ThreadPoolExecutor(
+    max_workers=2 * settings.browser_pool_max_size,
+    thread_name_prefix="browser-release",
+)
+
+atexit.register(http_engine.close)
+
+atexit.register(page_store.close)
+
+shared_tor = TorProcess(
+    tor_binary=settings.tor_binary_path,
+    socks_port=settings.tor_socks_port,
+    control_port=settings.tor_control_port,
+    data_dir=settings.tor_shared_data_dir,
+    bootstrap_timeout=settings.tor_bootstrap_timeout,
+    extra_socks_ports=settings.tor_circuit_ports[1:],
+)
+atexit.register(shared_tor.stop)
+
+tor_circuits = TorCircuitManager(
+    settings.tor_circuit_ports,
+    strategy=settings.tor_circuit_strategy,
+    max_failures=settings.tor_circuit_max_failures,
+    slow_factor=settings.tor_circuit_slow_factor,
+    rotate=shared_tor.signal_newnym,
+)
+
 
 class ScraperService:
     """Service for web scraping operations."""
 
-    def _initialize_browser(self, browser_type: str, headless: bool):
+    def _initialize_browser(
+        self,
+        browser_type: str,
+        headless: bool,
+        socks_port: int | None = None,
+    ):
         """
         Initialize browser (Tor or Chrome).
 
         Args:
             browser_type: Type of browser to use ('tor' or 'chrome')
             headless: Run browser in headless mode
+            socks_port: Shared tor SOCKS port (circuit) to connect through
 
         Returns:
             WebDriver instance
@@ -36,6 +174,7 @@ class ScraperService:
         Raises:
             ValueError: If browser is not configured
             WebDriverException: If browser fails to initialize
+            TorProcessError: If the shared tor process cannot start
         """
         if browser_type.lower() == "chrome":
             browser: Any = Chrome(
@@ -43,6 +182,16 @@ class ScraperService:
                 multi_instances=True,
             )
             browser_name = "Chrome"
+        elif settings.tor_shared_process:
+            browser = TorBrowser(
+                headless=headless,
+                multi_instances=True,
+                use_running_tor=True,
+                socks_port=socks_port or shared_tor.socks_port,
+                control_port=shared_tor.control_port,
+            )
+            shared_tor.ensure_running(browser.tor_browser_path)
+            browser_name = "Tor Browser"
         else:
             browser = TorBrowser(
                 headless=headless,
@@ -50,24 +199,237 @@ class ScraperService:
             )
             browser_name = "Tor Browser"
 
+        started = time.perf_counter()
         driver = browser.get_instance()
+        scrape_stage_seconds.observe(
+            time.perf_counter() - started,
+            browser_type=browser_type.lower(),
+            stage="launch",
+        )
         logger.info("%s initialized successfully", browser_name)
         return driver
 
-    def _wait_for_page_load(self, driver, wait_time: int):
+    def _get_browser_pool(
+        self,
+        browser_type: str,
+        headless: bool,
+        socks_port: int | None = None,
+    ) -> BrowserPool:
+        """
+        Get the shared pool of warm drivers for a browser configuration.
+
+        Each Tor circuit gets its own pool, sized so that the circuit pools
+        together hold about browser_pool_max_size drivers.
+
+        Args:
+            browser_type: Type of browser to use ('tor' or 'chrome')
+            headless: Run browser in headless mode
+            socks_port: Shared tor SOCKS port (circuit) of the drivers
+
+        Returns:
+            BrowserPool instance
+        """
+        browser_type = browser_type.lower()
+        key: tuple = (browser_type, headless)
+        name = browser_type
+        min_size = settings.browser_pool_min_size
+        max_size = settings.browser_pool_max_size
+        if socks_port is not None:
+            key = (browser_type, headless, socks_port)
+            name = f"{browser_type}:{socks_port}"
+            circuits = len(tor_circuits.ports)
+            min_size = math.ceil(min_size / circuits)
+            max_size = max(1, math.ceil(max_size / circuits))
+
+        return browser_pools.get(
+            key,
+            lambda: self._initialize_browser(
+                browser_type, headless, socks_port
+            ),
+            min_size=min_size,
+            max_size=max_size,
+            max_uses=settings.browser_pool_max_uses,
+            idle_timeout=settings.browser_pool_idle_timeout,
+            lease_timeout=settings.browser_pool_lease_timeout,
+            name=name,
+            slots=browser_slots,
+            lifecycle=driver_lifecycle,
+        )
+
+    @contextlib.contextmanager
+    def _lease_browser(self, browser_type: str, headless: bool) -> Iterator:
+        """
+        Lease a driver, assigning Tor scrapes to a shared tor circuit.
+
+        The time spent using the driver is recorded against the circuit so
+        slow or failing circuits can be avoided and rotated.
+
+        Args:
+            browser_type: Type of browser to use ('tor' or 'chrome')
+            headless: Run browser in headless mode
+
+        Yields:
+            WebDriver instance
+        """
+        if browser_type.lower() != "tor" or not settings.tor_shared_process:
+            with self._lease_driver(browser_type, headless) as driver:
+                yield driver
+            return
+
+        circuit = tor_circuits.acquire()
+        started: float | None = None
+        success = False
+        try:
+            with self._lease_driver(
+                browser_type, headless, circuit.port
+            ) as driver:
+                started = time.monotonic()
+                yield driver
+            success = True
+        finally:
+            elapsed = None if started is None else time.monotonic() - started
+            tor_circuits.release(circuit, elapsed, success)
+
+    @contextlib.contextmanager
+    def _lease_driver(
+        self,
+        browser_type: str,
+        headless: bool,
+        socks_port: int | None = None,
+    ) -> Iterator:
+        """
+        Lease a driver from the pool, or launch a one-off driver.
+
+        With browser_max_tabs above 1, pooled browsers serve that many
+        scrapes at once and the driver is bound to one of their tabs.
+        Every live driver holds one of the host-wide browser slots, so
+        worker processes together stay within browser_host_max.
+
+        Args:
+            browser_type: Type of browser to use ('tor' or 'chrome')
+            headless: Run browser in headless mode
+            socks_port: Shared tor SOCKS port (circuit) to connect through
+
+        Yields:
+            WebDriver instance
+        """
+        if settings.browser_pool_enabled:
+            pool = self._get_browser_pool(browser_type, headless, socks_port)
+            lease = pool.lease
+            if settings.browser_max_tabs > 1:
+                lease = tab_pools.get(
+                    pool,
+                    max_tabs=settings.browser_max_tabs,
+                    isolate=settings.browser_tab_isolation,
+                    page_load_timeout=settings.browser_tab_load_timeout,
+                ).lease
+            with lease() as driver:
+                yield driver
+            return
+
+        with browser_slots.hold(settings.browser_pool_lease_timeout):
+            driver = self._initialize_browser(
+                browser_type, headless, socks_port
+            )
+            try:
+                yield driver
+            finally:
+                with contextlib.suppress(Exception):
+                    driver.quit()
+
+    def _resource_blocking(self, request: ScrapeRequest) -> ResourceBlocking:
+        """Translate the request resource policy for the browser."""
+        policy = request.resources
+        kinds = frozenset(
+            kind for kind in RESOURCE_KINDS if getattr(policy, f"block_{kind}")
+        )
+        domains = list(policy.block_domains)
+        if policy.block_trackers:
+            domains += TRACKER_DOMAINS
+        return ResourceBlocking(
+            kinds=kinds, domains=tuple(dict.fromkeys(domains))
+        )
+
+    def _navigate(self, driver, request: ScrapeRequest) -> dict[str, Any]:
+        """
+        Apply the request resource policy, then load the page.
+
+        Args:
+            driver: WebDriver instance
+            request: ScrapeRequest with the URL and resource policy
+
+        Returns:
+            Resource blocking details for the response metadata
+        """
+        blocking = self._apply_resource_blocking(driver, request)
+        driver.get(str(request.url))
+        return blocking
+
+    def _apply_resource_blocking(
+        self, driver, request: ScrapeRequest
+    ) -> dict[str, Any]:
+        """Install the request resource policy, returning its metadata."""
+        blocking = self._resource_blocking(request)
+        applied = apply_resource_blocking(
+            driver, blocking, timeout=settings.browser_tab_load_timeout
+        )
+        if blocking.is_empty:
+            return {}
+        return {"resource_blocking": applied}
+
+    def _wait_for_page_load(
+        self, driver, request: ScrapeRequest
+    ) -> dict[str, Any]:
         """
-        Wait for page to load completely.
+        Wait until the page satisfies the requested readiness strategy.
+
+        wait_time is an upper bound: the wait returns as soon as the page is
+        ready, and extraction proceeds on a best-effort basis if it never is.
 
         Args:
             driver: WebDriver instance
-            wait_time: Time to wait in seconds
+            request: ScrapeRequest with readiness options
+
+        Returns:
+            Readiness details for the response metadata
         """
-        if wait_time > 0:
-            time.sleep(wait_time)
-            WebDriverWait(driver, 10).until(
-                lambda d: d.execute_script("return document.readyState")
-                == "complete"
+        if request.wait_time <= 0:
+            return {"wait_strategy": None, "ready": None}
+
+        strategy = get_readiness_strategy(request)
+        started = time.monotonic()
+        ready = strategy.wait(driver, request.wait_time)
+        return self._readiness_metadata(request, ready, started)
+
+    async def _wait_for_page_load_async(
+        self, session: AsyncWebDriver, request: ScrapeRequest
+    ) -> dict[str, Any]:
+        """Async variant of _wait_for_page_load, sleeping between polls."""
+        if request.wait_time <= 0:
+            return {"wait_strategy": None, "ready": None}
+
+        strategy = get_readiness_strategy(request)
+        started = time.monotonic()
+        ready = await strategy.wait_async(session, request.wait_time)
+        return self._readiness_metadata(request, ready, started)
+
+    def _readiness_metadata(
+        self, request: ScrapeRequest, ready: bool, started: float
+    ) -> dict[str, Any]:
+        """Readiness details of a wait that began at started."""
+        waited = round(time.monotonic() - started, 3)
+        if not ready:
+            logger.warning(
+                "Page %s not ready (%s) after %ss, extracting anyway",
+                request.url,
+                request.wait_strategy,
+                request.wait_time,
             )
+        return {
+            "wait_strategy": request.wait_strategy,
+            "ready": ready,
+            "waited_seconds": waited,
+        }
 
     def _extract_title(self, driver) -> str | None:
         """Extract page title."""
@@ -95,11 +457,8 @@ class ScraperService:
         """Extract all links from page."""
         try:
             links = driver.find_elements(By.TAG_NAME, "a")
-            return [
-                link.get_attribute("href")
-                for link in links
-                if link.get_attribute("href")
-            ]
+            hrefs = [link.get_attribute("href") for link in links]
+            return [href for href in hrefs if href]
         except Exception:
             return []
 
@@ -107,14 +466,143 @@ class ScraperService:
         """Extract all image URLs from page."""
         try:
             images = driver.find_elements(By.TAG_NAME, "img")
-            return [
-                img.get_attribute("src")
-                for img in images
-                if img.get_attribute("src")
-            ]
+            sources = [img.get_attribute("src") for img in images]
+            return [src for src in sources if src]
         except Exception:
             return []
 
+    def _extract_with_script(
+        self,
+        driver,
+        request: ScrapeRequest,
+        plan: ExtractionPlan | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Extract all requested fields with a single in-page script call.
+
+        Args:
+            driver: WebDriver instance
+            request: ScrapeRequest with extraction options
+            plan: Compiled selectors to evaluate, if any
+
+        Returns:
+            Script payload, or None when the script could not run
+        """
+        try:
+            payload = driver.execute_script(
+                EXTRACTION_SCRIPT, extraction_options(request, plan)
+            )
+        except WebDriverException as e:
+            logger.warning("In-page extraction failed, falling back: %s", e)
+            return None
+        return self._script_payload(payload)
+
+    def _script_payload(self, payload: Any) -> dict[str, Any] | None:
+        """Accept the result of the extraction script if well formed."""
+        if not isinstance(payload, dict):
+            logger.warning("In-page extraction returned %r", type(payload))
+            return None
+        return payload
+
+    def _extract_with_commands(
+        self,
+        driver,
+        request: ScrapeRequest,
+        plan: ExtractionPlan | None = None,
+    ) -> dict[str, Any]:
+        """
+        Extract all requested fields with individual WebDriver commands.
+
+        Args:
+            driver: WebDriver instance
+            request: ScrapeRequest with extraction options
+            plan: Compiled selectors to evaluate, if any
+
+        Returns:
+            Payload shaped like the in-page extraction script result
+        """
+        payload: dict[str, Any] = {"title": self._extract_title(driver)}
+
+        if request.extract_text:
+            payload["text"] = self._extract_text(driver)
+
+        if request.extract_html:
+            payload["html"] = self._extract_html(driver)
+
+        if request.extract_links:
+            payload["links"] = self._extract_links(driver)
+
+        if request.extract_images:
+            payload["images"] = self._extract_images(driver)
+
+        if plan is not None:
+            payload["selector_errors"] = {}
+            payload["data"] = self._extract_selectors(
+                driver, plan.fields, payload["selector_errors"]
+            )
+
+        payload["current_url"] = driver.current_url
+        return payload
+
+    def _extract_selectors(
+        self,
+        context,
+        selectors: dict[str, SelectorField],
+        errors: dict[str, str],
+        prefix: str = "",
+    ) -> dict[str, Any]:
+        """
+        Evaluate named selectors with WebDriver commands.
+
+        Mirrors the in-page script for drivers that cannot run it, at one
+        or more commands per element.
+
+        Args:
+            context: WebDriver or element the selectors are relative to
+            selectors: Named selectors to evaluate
+            errors: Collects the failure of each field by its dotted path
+            prefix: Dotted path of the enclosing field
+
+        Returns:
+            Field values by name
+        """
+        values: dict[str, Any] = {}
+        for name, field in selectors.items():
+            path = prefix + name
+            by = By.XPATH if field.type == "xpath" else By.CSS_SELECTOR
+            try:
+                elements = context.find_elements(by, field.selector)
+                if not field.multiple:
+                    elements = elements[:1]
+                found = [
+                    self._read_selector(element, field, errors, path)
+                    for element in elements
+                ]
+            except WebDriverException as e:
+                errors[path] = e.msg or type(e).__name__
+                found = []
+            if field.multiple:
+                values[name] = found
+            else:
+                values[name] = found[0] if found else None
+        return values
+
+    def _read_selector(
+        self,
+        element,
+        field: SelectorField,
+        errors: dict[str, str],
+        path: str,
+    ) -> Any:
+        """Read the value of one element matched by a selector."""
+        if field.fields:
+            return self._extract_selectors(
+                element, field.fields, errors, path + "."
+            )
+        if field.attribute:
+            return element.get_attribute(field.attribute)
+        return element.text.strip()
+
     def _extract_data(self, driver, request: ScrapeRequest) -> dict[str, Any]:
         """
         Extract all requested data from the page.
@@ -126,9 +614,60 @@ class ScraperService:
         Returns:
             Dictionary with extracted data
         """
+        plan = self._extraction_plan(request)
+        payload = self._extract_with_script(driver, request, plan)
+        extraction = "script"
+        if payload is None:
+            payload = self._extract_with_commands(driver, request, plan)
+            extraction = "commands"
+        return self._response_data(request, plan, payload, extraction)
+
+    async def _extract_data_async(
+        self, driver, session: AsyncWebDriver, request: ScrapeRequest
+    ) -> dict[str, Any]:
+        """
+        Async variant of _extract_data.
+
+        The extraction script is awaited over the session; the WebDriver
+        command fallback runs on the Selenium driver in a worker thread.
+
+        Args:
+            driver: WebDriver instance owning the session
+            session: AsyncWebDriver attached to the driver's session
+            request: ScrapeRequest with extraction options
+
+        Returns:
+            Dictionary with extracted data
+        """
+        plan = self._extraction_plan(request)
+        try:
+            payload = self._script_payload(
+                await session.execute_script(
+                    EXTRACTION_SCRIPT, extraction_options(request, plan)
+                )
+            )
+        except WebDriverException as e:
+            logger.warning("In-page extraction failed, falling back: %s", e)
+            payload = None
+        extraction = "script"
+        if payload is None:
+            payload = await to_thread.run_sync(
+                self._extract_with_commands, driver, request, plan
+            )
+            extraction = "commands"
+        return self._response_data(request, plan, payload, extraction)
+
+    def _response_data(
+        self,
+        request: ScrapeRequest,
+        plan: ExtractionPlan | None,
+        payload: dict[str, Any],
+        extraction: str,
+    ) -> dict[str, Any]:
+        """Shape an extraction payload into ScrapeResponse fields."""
         response_data: dict[str, Any] = {
             "url": str(request.url),
-            "title": None,
+            "title": payload.get("title"),
             "text": None,
             "html": None,
             "links": [],
@@ -136,32 +675,95 @@ class ScraperService:
             "metadata": {},
         }
 
-        response_data["title"] = self._extract_title(driver)
-
         if request.extract_text:
-            response_data["text"] = self._extract_text(driver)
+            response_data["text"] = payload.get("text")
 
         if request.extract_html:
-            response_data["html"] = self._extract_html(driver)
+            response_data["html"] = payload.get("html")
 
         if request.extract_links:
-            response_data["links"] = self._extract_links(driver)
+            response_data["links"] = payload.get("links") or []
 
         if request.extract_images:
-            response_data["images"] = self._extract_images(driver)
+            response_data["images"] = payload.get("images") or []
+
+        if plan is not None:
+            response_data["data"] = plan.finalize(payload.get("data"))
 
         response_data["metadata"] = {
-            "current_url": driver.current_url,
+            "current_url": payload.get("current_url"),
             "wait_time": request.wait_time,
             "headless": request.headless,
             "browser_type": request.browser_type,
+            "extraction": extraction,
         }
+        if payload.get("meta"):
+            response_data["metadata"]["page_meta"] = payload["meta"]
+        if payload.get("selector_errors"):
+            response_data["metadata"]["selector_errors"] = payload[
+                "selector_errors"
+            ]
 
         return response_data
 
+    def _extraction_plan(
+        self, request: ScrapeRequest
+    ) -> ExtractionPlan | None:
+        """
+        Resolve the selectors of a request to a compiled plan.
+
+        Args:
+            request: ScrapeRequest with inline selectors or a plan name
+
+        Returns:
+            The named or cached plan, or None without selectors
+
+        Raises:
+            ValueError: If the named plan is not registered
+        """
+        if request.plan is not None:
+            plan = extraction_plans.get(request.plan)
+            if plan is None:
+                raise ValueError(f"Unknown extraction plan: {request.plan}")
+            return plan
+        if request.selectors:
+            return plan_cache.compile(request.selectors)
+        return None
+
+    def _extract_if_changed(
+        self, driver, request: ScrapeRequest
+    ) -> dict[str, Any]:
+        """
+        Extract a page only if its text differs from the last scrape.
+
+        Unchanged pages get just their title and metadata, with the text
+        fingerprint the change tracker compares.
+        """
+        text = self._extract_text(driver)
+        digest = fingerprint(text or "")
+        if not change_tracker.is_current(str(request.url), digest):
+            # The text is read already; extract the rest of the page.
+            response_data = self._extract_data(
+                driver, request.model_copy(update={"extract_text": False})
+            )
+            if request.extract_text:
+                response_data["text"] = text
+            return response_data
+
+        response_data = self._extract_data(
+            driver, self._narrow_request(request)
+        )
+        response_data["metadata"]["fingerprint"] = digest
+        return response_data
+
     def scrape(self, request: ScrapeRequest) -> ScrapeResponse:
         """
-        Scrape a webpage using Tor Browser or Chrome.
+        Scrape a webpage using Tor Browser, Chrome or the HTTP engine.
+
+        Results are served from the result cache when an equivalent request
+        was scraped recently enough, and concurrent equivalent requests share
+        a single browser session. Other scrapes wait for admission to their
+        browser type and are rejected when it is saturated.
 
         Args:
             request: ScrapeRequest with scraping parameters
@@ -173,38 +775,735 @@ class ScraperService:
             ValueError: If browser configuration is invalid
             WebDriverException: If browser fails to initialize
             TimeoutException: If page load times out
+            AdmissionRejectedError: If the browser type is saturated
             ScrapingError: For other scraping errors
         """
-        driver = None
+        key = request_cache_key(request)
+        cached = self._cached_response(request, key)
+        if cached is not None:
+            return cached
+
+        if settings.coalesce_requests:
+            response, shared = scrape_flights.do(
+                key, lambda: self._scrape_and_cache(request, key)
+            )
+        else:
+            response, shared = self._scrape_and_cache(request, key), False
+        return self._served_response(request, response, shared)
+
+    async def scrape_async(self, request: ScrapeRequest) -> ScrapeResponse:
+        """
+        Scrape a webpage without holding a thread while the browser works.
+
+        Browser scrapes are driven over an AsyncWebDriver attached to the
+        leased driver's session: admission, navigation, readiness polling
+        and extraction are awaited, so one event loop supervises many
+        sessions. Leasing and releasing browsers, which may launch or quit
+        them, and cache and store access still take a worker thread
+        briefly. Scrapes this path does not cover run scrape in a worker
+        thread: the 'http' and 'auto' engines, change detection, browsers
+        shared between tabs, and everything when async_scraping is off.
+
+        Args:
+            request: ScrapeRequest with scraping parameters
+
+        Returns:
+            ScrapeResponse with scraped data
+
+        Raises:
+            ValueError: If browser configuration is invalid
+            WebDriverException: If browser fails to initialize
+            TimeoutException: If page load times out
+            AdmissionRejectedError: If the browser type is saturated
+            ScrapingError: For other scraping errors
+        """
+        if not self._scrapes_async(request):
+            return await to_thread.run_sync(self.scrape, request)
+
+        key, cached = await to_thread.run_sync(self._cache_lookup, request)
+        if cached is not None:
+            return cached
+
+        if settings.coalesce_requests:
+            response, shared = await async_scrape_flights.do(
+                key, lambda: self._scrape_and_cache_async(request, key)
+            )
+        else:
+            response = await self._scrape_and_cache_async(request, key)
+            shared = False
+        return self._served_response(request, response, shared)
+
+    def _scrapes_async(self, request: ScrapeRequest) -> bool:
+        """Whether scrape_async drives the request on the event loop."""
+        return (
+            settings.async_scraping
+            and request.browser_type in ("tor", "chrome")
+            and not request.detect_changes
+            and settings.browser_max_tabs == 1
+        )
+
+    def _cache_lookup(
+        self, request: ScrapeRequest
+    ) -> tuple[str, ScrapeResponse | None]:
+        """Cache key of a request and its fresh cached response, if any."""
+        key = request_cache_key(request)
+        return key, self._cached_response(request, key)
+
+    def _served_response(
+        self, request: ScrapeRequest, response: ScrapeResponse, shared: bool
+    ) -> ScrapeResponse:
+        """Add the coalescing and cache outcome to a scraped response."""
+        metadata = {**response.metadata, "coalesced": shared}
+        if settings.cache_enabled:
+            metadata["cache"] = (
+                "bypass"
+                if request.bypass_cache or request.detect_changes
+                else "miss"
+            )
+        return response.model_copy(update={"metadata": metadata})
+
+    def _cached_response(
+        self, request: ScrapeRequest, key: str
+    ) -> ScrapeResponse | None:
+        """Look up a fresh enough cached response for a request."""
+        if (
+            not settings.cache_enabled
+            or request.bypass_cache
+            or request.detect_changes
+        ):
+            return None
+        cached = result_cache.get(key, request.cache_max_age)
+        if cached is None:
+            return None
+
+        response, tier, age = cached
+        logger.info("Cache hit (%s) for URL: %s", tier, request.url)
+        response.metadata.update(
+            {
+                "cache": "hit",
+                "cache_tier": tier,
+                "cache_age": round(age, 3),
+            }
+        )
+        return response
+
+    def _scrape_and_cache(
+        self, request: ScrapeRequest, key: str
+    ) -> ScrapeResponse:
+        """
+        Scrape a webpage once admitted and store the result in the cache.
+
+        With the page store enabled the page is also kept there, and its
+        content hash is added to the metadata. Change detection results
+        depend on the previous scrape, so they are compared with it instead
+        of being cached, and unchanged pages are not stored again.
+        """
+        with self._admit(request.browser_type):
+            if request.detect_changes:
+                # The fingerprint is taken from the text.
+                scraped = self._scrape_page(
+                    request.model_copy(update={"extract_text": True})
+                )
+                response = change_tracker.observe(request, scraped)
+            else:
+                response = self._scrape_page(request)
+        self._store_response(request, key, response)
+        return response
+
+    @staticmethod
+    def _admit(browser_type: str) -> contextlib.AbstractContextManager:
+        """Admission of a scrape; 'auto' admits each engine it uses."""
+        if browser_type == "auto":
+            return contextlib.nullcontext()
+        return admission.admit(browser_type)
+
+    async def _scrape_and_cache_async(
+        self, request: ScrapeRequest, key: str
+    ) -> ScrapeResponse:
+        """Async variant of _scrape_and_cache for browser scrapes."""
+        async with admission.admit_async(request.browser_type):
+            response = await self._scrape_page_async(request)
+        await to_thread.run_sync(self._store_response, request, key, response)
+        return response
+
+    def _store_response(
+        self, request: ScrapeRequest, key: str, response: ScrapeResponse
+    ) -> None:
+        """Keep a scraped response in the page store and result cache."""
+        if settings.page_store_enabled and not response.metadata.get(
+            "unchanged"
+        ):
+            digest = page_store.add(response)
+            if digest is not None:
+                response.metadata["content_hash"] = digest
+        if settings.cache_enabled and not request.detect_changes:
+            result_cache.set(key, response)
+
+    def _scrape_page(self, request: ScrapeRequest) -> ScrapeResponse:
+        """
+        Load and extract a webpage with a leased browser or the HTTP engine.
+
+        Args:
+            request: ScrapeRequest with scraping parameters
+
+        Returns:
+            ScrapeResponse with scraped data
+        """
         try:
+            self._extraction_plan(request)
+            if request.browser_type == "http":
+                return self._fetch_page(request)
+            if request.browser_type == "auto":
+                return self._scrape_auto(request)
+
             logger.info(
-                "Initializing %s browser for URL: %s",
+                "Leasing %s browser for URL: %s",
                 request.browser_type,
                 request.url,
             )
-            driver = self._initialize_browser(
-                request.browser_type, request.headless
+            return self._scrape_with_browser(request)
+        except Exception as e:
+            error = self._scrape_error(e)
+            if error is e:
+                raise
+            raise error from e
+
+    async def _scrape_page_async(
+        self, request: ScrapeRequest
+    ) -> ScrapeResponse:
+        """Async variant of _scrape_page for 'tor' and 'chrome' scrapes."""
+        try:
+            self._extraction_plan(request)
+            logger.info(
+                "Leasing %s browser for async URL: %s",
+                request.browser_type,
+                request.url,
             )
+            return await self._scrape_with_browser_async(request)
+        except Exception as e:
+            error = self._scrape_error(e)
+            if error is e:
+                raise
+            raise error from e
 
-            driver.get(str(request.url))
-            self._wait_for_page_load(driver, request.wait_time)
+    def _scrape_error(self, error: Exception) -> Exception:
+        """Log a scrape failure, wrapping unexpected errors."""
+        if isinstance(error, ValueError):
+            logger.error("Configuration error: %s", error, exc_info=True)
+        elif isinstance(error, TimeoutException):
+            logger.error("Page load timeout: %s", error, exc_info=True)
+        elif isinstance(error, WebDriverException):
+            logger.error("Browser error: %s", error, exc_info=True)
+        elif isinstance(error, ScrapingError):
+            logger.error("Scraping error: %s", error, exc_info=True)
+        else:
+            logger.error("Scraping error: %s", error, exc_info=True)
+            return ScrapingError(f"Scraping error: {str(error)}")
+        return error
 
-            response_data = self._extract_data(driver, request)
-            return ScrapeResponse(**response_data)
+    def _scrape_with_browser(self, request: ScrapeRequest) -> ScrapeResponse:
+        """
+        Load and extract a webpage with a leased browser, timing each stage.
 
-        except ValueError as e:
-            logger.error("Configuration error: %s", e, exc_info=True)
-            raise
-        except TimeoutException as e:
-            logger.error("Page load timeout: %s", e, exc_info=True)
-            raise
-        except WebDriverException as e:
-            logger.error("Browser error: %s", e, exc_info=True)
+        Args:
+            request: ScrapeRequest with scraping parameters
+
+        Returns:
+            ScrapeResponse with stage timings and WebDriver command counts
+            in its metadata
+        """
+        timings = StageTimings()
+        stats = None
+        outcome = "error"
+        try:
+            with contextlib.ExitStack() as stack:
+                with timings.stage("lease"):
+                    driver = stack.enter_context(
+                        self._lease_browser(
+                            request.browser_type, request.headless
+                        )
+                    )
+                stats = instrument_driver(driver)
+
+                with timings.stage("navigate"):
+                    blocking = self._navigate(driver, request)
+                with timings.stage("wait"):
+                    readiness = self._wait_for_page_load(driver, request)
+                with timings.stage("extract"):
+                    if request.detect_changes:
+                        response_data = self._extract_if_changed(
+                            driver, request
+                        )
+                    else:
+                        response_data = self._extract_data(driver, request)
+
+                with timings.stage("release"):
+                    stack.close()
+            outcome = "success"
+        finally:
+            scrapes_total.inc(
+                browser_type=request.browser_type, outcome=outcome
+            )
+            timings.observe(request.browser_type)
+            if stats is not None:
+                stats.observe(request.browser_type)
+
+        return self._browser_response(
+            response_data, readiness, blocking, timings, stats
+        )
+
+    async def _scrape_with_browser_async(
+        self, request: ScrapeRequest
+    ) -> ScrapeResponse:
+        """
+        Async variant of _scrape_with_browser.
+
+        The driver is leased and released on dedicated threads; everything
+        in between is awaited over an AsyncWebDriver attached to its
+        session, so waiting on the browser holds no thread.
+
+        Args:
+            request: ScrapeRequest with scraping parameters
+
+        Returns:
+            ScrapeResponse with stage timings and WebDriver command counts
+            in its metadata
+        """
+        timings = StageTimings()
+        stats = None
+        outcome = "error"
+        lease = self._lease_browser(request.browser_type, request.headless)
+        try:
+            with timings.stage("lease"):
+                driver = await self._enter_lease(lease)
+            try:
+                stats = instrument_driver(driver)
+                session = AsyncWebDriver.from_driver(driver, stats=stats)
+                try:
+                    with timings.stage("navigate"):
+                        blocking = await to_thread.run_sync(
+                            self._apply_resource_blocking, driver, request
+                        )
+                        await session.get(str(request.url))
+                    with timings.stage("wait"):
+                        readiness = await self._wait_for_page_load_async(
+                            session, request
+                        )
+                    with timings.stage("extract"):
+                        response_data = await self._extract_data_async(
+                            driver, session, request
+                        )
+                finally:
+                    await session.close()
+            except BaseException as e:
+                await self._exit_lease(lease, e)
+                raise
+
+            with timings.stage("release"):
+                await self._exit_lease(lease)
+            outcome = "success"
+        finally:
+            scrapes_total.inc(
+                browser_type=request.browser_type, outcome=outcome
+            )
+            timings.observe(request.browser_type)
+            if stats is not None:
+                stats.observe(request.browser_type)
+
+        return self._browser_response(
+            response_data, readiness, blocking, timings, stats
+        )
+
+    async def _enter_lease(self, lease: Any) -> Any:
+        """
+        Enter a browser lease on the lease executor.
+
+        A cancelled scrape cannot stop the thread entering the lease, so
+        the browser it gets is handed back as soon as it has one.
+        """
+        entering = asyncio.get_running_loop().run_in_executor(
+            browser_lease_executor, lease.__enter__
+        )
+        try:
+            return await asyncio.shield(entering)
+        except asyncio.CancelledError:
+            entering.add_done_callback(
+                functools.partial(self._release_abandoned, lease)
+            )
             raise
-        except Exception as e:
-            logger.error("Scraping error: %s", e, exc_info=True)
-            raise ScrapingError(f"Scraping error: {str(e)}") from e
+
+    @staticmethod
+    def _release_abandoned(lease: Any, entering: asyncio.Future) -> None:
+        """Release a lease entered for a scrape that was cancelled."""
+        if not entering.cancelled() and entering.exception() is None:
+            browser_release_executor.submit(lease.__exit__, None, None, None)
+
+    async def _exit_lease(
+        self, lease: Any, error: BaseException | None = None
+    ) -> None:
+        """Exit a browser lease on the release executor."""
+        await asyncio.get_running_loop().run_in_executor(
+            browser_release_executor,
+            lease.__exit__,
+            None if error is None else type(error),
+            error,
+            None if error is None else error.__traceback__,
+        )
+
+    def _browser_response(
+        self,
+        response_data: dict[str, Any],
+        readiness: dict[str, Any],
+        blocking: dict[str, Any],
+        timings: StageTimings,
+        stats: CommandStats,
+    ) -> ScrapeResponse:
+        """Build a browser ScrapeResponse with its scrape details."""
+        response_data["metadata"].update(readiness)
+        response_data["metadata"].update(blocking)
+        response_data["metadata"].update(
+            {
+                "timings_ms": timings.as_milliseconds(),
+                "webdriver_commands": sum(stats.commands.values()),
+                "webdriver_bytes": stats.bytes,
+            }
+        )
+        return ScrapeResponse(**response_data)
+
+    def _fetch_page(self, request: ScrapeRequest) -> ScrapeResponse:
+        """
+        Fetch a webpage with the HTTP engine, optionally over Tor.
+
+        Args:
+            request: ScrapeRequest with scraping parameters
+
+        Returns:
+            ScrapeResponse with scraped data
+        """
+        logger.info("Fetching URL over HTTP: %s", request.url)
+        headers = (
+            change_tracker.conditional_headers(str(request.url))
+            if request.detect_changes
+            else None
+        )
+        response = self._fetch_http(request, headers)
+        if (
+            headers
+            and response.metadata.get("status_code") == HTTPStatus.NOT_MODIFIED
+            and change_tracker.get(str(request.url)) is None
+        ):
+            # The version revalidated against was evicted since, leaving
+            # the 304 nothing to compare with; fetch the page itself.
+            response = self._fetch_http(request, None)
+        return response
+
+    def _fetch_http(
+        self, request: ScrapeRequest, headers: dict[str, str] | None
+    ) -> ScrapeResponse:
+        """Fetch a webpage once with the HTTP engine."""
+        timings = StageTimings()
+        outcome = "error"
+        try:
+            with timings.stage("fetch"):
+                if not request.http_via_tor:
+                    response = http_engine.fetch(request, headers=headers)
+                else:
+                    with tor_circuits.lease() as circuit:
+                        response = self._fetch_via_tor(
+                            request, circuit.port, headers
+                        )
+            outcome = "success"
         finally:
-            if driver:
-                with contextlib.suppress(Exception):
-                    driver.quit()
+            scrapes_total.inc(browser_type="http", outcome=outcome)
+            timings.observe("http")
+
+        response.metadata["timings_ms"] = timings.as_milliseconds()
+        return response
+
+    def _fetch_via_tor(
+        self,
+        request: ScrapeRequest,
+        socks_port: int,
+        headers: dict[str, str] | None,
+    ) -> ScrapeResponse:
+        """
+        Fetch a webpage through a shared tor SOCKS port.
+
+        Tor is only checked when the port cannot be connected to, so
+        healthy fetches never wait on its control connection. A tor that
+        is down is started or restarted and the fetch is tried once more.
+        """
+        try:
+            return http_engine.fetch(
+                request, socks_port=socks_port, headers=headers
+            )
+        except HttpConnectionError:
+            if shared_tor.is_healthy():
+                # Tor is up; the page itself could not be reached.
+                raise
+        shared_tor.ensure_running(os.environ.get("TOR_BROWSER_PATH"))
+        return http_engine.fetch(
+            request, socks_port=socks_port, headers=headers
+        )
+
+    def _scrape_auto(self, request: ScrapeRequest) -> ScrapeResponse:
+        """
+        Fetch over HTTP, escalating to a browser when the page needs one.
+
+        The decision is remembered per domain, so domains known to need a
+        browser skip the HTTP attempt until the decision expires. Requests
+        with selectors go straight to a browser, which evaluates them. The
+        HTTP attempt and the browser scrape are each admitted under the
+        engine that runs them.
+
+        Args:
+            request: ScrapeRequest with browser_type 'auto'
+
+        Returns:
+            ScrapeResponse with the engine choice in its metadata
+        """
+        host = urlsplit(str(request.url)).hostname or ""
+        browser_type = "tor" if request.http_via_tor else "chrome"
+        remembered = engine_selector.get(host)
+
+        reason: str | None
+        if request.selectors or request.plan:
+            reason = "selectors"
+        elif remembered == "browser":
+            reason = "remembered"
+        else:
+            try:
+                with admission.admit("http"):
+                    fetched = self._fetch_page(
+                        request.model_copy(update={"extract_html": True})
+                    )
+                reason = needs_browser(
+                    fetched, min_text_length=settings.auto_min_text_length
+                )
+            except AdmissionRejectedError:
+                raise
+            except HttpStatusError as e:
+                # A browser sees the same missing page, but may get past
+                # a bot wall.
+                if e.status_code not in BLOCKED_STATUS_CODES:
+                    raise
+                reason = f"status {e.status_code}"
+                engine_selector.remember(host, "browser")
+            except ScrapingError as e:
+                # A failed fetch says nothing about the page, so the
+                # escalation is not remembered for the domain.
+                reason = f"http fetch failed: {str(e)}"
+            else:
+                if reason is None:
+                    engine_selector.remember(host, "http")
+                    metadata = {**fetched.metadata, "engine": "http"}
+                    return fetched.model_copy(
+                        update={
+                            "html": (
+                                fetched.html if request.extract_html else None
+                            ),
+                            "metadata": metadata,
+                        }
+                    )
+                engine_selector.remember(host, "browser")
+
+        logger.info(
+            "Escalating %s to %s browser: %s",
+            request.url,
+            browser_type,
+            reason,
+        )
+        with admission.admit(browser_type):
+            response = self._scrape_page(
+                request.model_copy(update={"browser_type": browser_type})
+            )
+        response.metadata.update(
+            {"engine": browser_type, "escalation_reason": reason}
+        )
+        return response
+
+    def _scrape_batch_item(self, request: ScrapeRequest) -> ScrapeBatchItem:
+        """Scrape one batch URL, capturing failures instead of raising."""
+        try:
+            result = self.scrape(request)
+        except Exception as e:
+            return ScrapeBatchItem(
+                url=str(request.url),
+                success=False,
+                error=f"{type(e).__name__}: {str(e)}",
+            )
+        return ScrapeBatchItem(
+            url=str(request.url), success=True, result=result
+        )
+
+    def _batch_concurrency(self, batch: ScrapeBatchRequest) -> int:
+        """Number of browser sessions a batch may use in parallel."""
+        concurrency = min(
+            batch.concurrency,
+            settings.batch_max_concurrency,
+            len(batch.urls),
+        )
+        return self._session_concurrency(
+            concurrency, batch.options.browser_type
+        )
+
+    def _session_concurrency(self, concurrency: int, browser_type: str) -> int:
+        """Cap parallel scrapes of a browser type at what the pool serves."""
+        if browser_type == "http":
+            return concurrency
+        if settings.browser_pool_enabled:
+            concurrency = min(
+                concurrency,
+                settings.browser_pool_max_size * settings.browser_max_tabs,
+            )
+        return concurrency
+
+    def iter_batch(
+        self, batch: ScrapeBatchRequest
+    ) -> Iterator[tuple[int, ScrapeBatchItem]]:
+        """
+        Scrape several webpages, yielding each result as soon as it is done.
+
+        At most the batch concurrency of URLs is in flight at a time, so
+        finished pages do not pile up while the caller consumes results.
+
+        Args:
+            batch: ScrapeBatchRequest with URLs and shared options
+
+        Yields:
+            Tuples of (index in the batch, ScrapeBatchItem) in completion
+            order
+        """
+        requests = enumerate(batch.to_requests())
+        concurrency = self._batch_concurrency(batch)
+        logger.info(
+            "Scraping batch of %d URLs with %d %s sessions",
+            len(batch.urls),
+            concurrency,
+            batch.options.browser_type,
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="scrape-batch"
+        ) as executor:
+            pending: dict[Future, int] = {}
+
+            def submit(count: int) -> None:
+                for index, request in itertools.islice(requests, count):
+                    future = executor.submit(self._scrape_batch_item, request)
+                    pending[future] = index
+
+            submit(concurrency)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                submit(len(done))
+                for future in done:
+                    yield pending.pop(future), future.result()
+
+    def scrape_batch(self, batch: ScrapeBatchRequest) -> ScrapeBatchResponse:
+        """
+        Scrape several webpages over parallel browser sessions.
+
+        Failures are reported per URL so one broken page does not fail the
+        whole batch.
+
+        Args:
+            batch: ScrapeBatchRequest with URLs and shared options
+
+        Returns:
+            ScrapeBatchResponse with per-URL results in request order
+        """
+        results: list[Any] = [None] * len(batch.urls)
+        for index, item in self.iter_batch(batch):
+            results[index] = item
+
+        succeeded = sum(1 for item in results if item.success)
+        return ScrapeBatchResponse(
+            results=results,
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+        )
+
+    def stream_batch(self, batch: ScrapeBatchRequest) -> Iterator[BaseModel]:
+        """
+        Scrape several webpages as a stream of results.
+
+        Args:
+            batch: ScrapeBatchRequest with URLs and shared options
+
+        Yields:
+            One ScrapeBatchStreamItem per URL in completion order, then a
+            ScrapeStreamDone summary
+        """
+        succeeded = failed = 0
+        for index, item in self.iter_batch(batch):
+            if item.success:
+                succeeded += 1
+            else:
+                failed += 1
+            yield ScrapeBatchStreamItem(index=index, **dict(item))
+        yield ScrapeStreamDone(succeeded=succeeded, failed=failed)
+
+    def stream_crawl(self, crawl: CrawlRequest) -> Iterator[BaseModel]:
+        """
+        Crawl from seed URLs as a stream of results.
+
+        Every page goes through scrape, so the cache, coalescing and
+        admission apply per page.
+
+        Args:
+            crawl: CrawlRequest with seeds, budgets, scope and politeness
+
+        Yields:
+            One CrawlStreamItem per page in completion order, then a
+            CrawlStreamDone summary
+        """
+        concurrency = self._session_concurrency(
+            min(crawl.concurrency, settings.batch_max_concurrency),
+            crawl.options.browser_type,
+        )
+        logger.info(
+            "Crawling from %d seeds with %d %s sessions",
+            len(crawl.seeds),
+            concurrency,
+            crawl.options.browser_type,
+        )
+        crawler = Crawler(crawl, self._scrape_batch_item, concurrency)
+        yield from crawler.run()
+
+    def stream_scrape(self, request: ScrapeRequest) -> Iterator[BaseModel]:
+        """
+        Scrape a webpage as a stream of its fields.
+
+        The page is scraped as by scrape, so it is cached, coalesced, timed
+        and stored the same way, and the browser and its admission slot
+        are released before the first line is sent. The title, selector
+        data and metadata come first, then each requested field on a line
+        of its own, so clients can start on the page before large fields.
+
+        Args:
+            request: ScrapeRequest with scraping parameters
+
+        Yields:
+            ScrapeStreamPage, one ScrapeStreamField per requested field,
+            then ScrapeStreamDone
+        """
+        response = self.scrape(request)
+        yield ScrapeStreamPage(
+            url=response.url,
+            title=response.title,
+            data=response.data,
+            metadata=response.metadata,
+        )
+        for name in STREAM_FIELDS:
+            if getattr(request, f"extract_{name}"):
+                yield ScrapeStreamField(
+                    name=name, value=getattr(response, name)
+                )
+        yield ScrapeStreamDone()
+
+    def _narrow_request(self, request: ScrapeRequest) -> ScrapeRequest:
+        """Copy a request so it extracts none of the streamable fields."""
+        return request.model_copy(
+            update={f"extract_{field}": False for field in STREAM_FIELDS}
+        )
@@ -0,0 +1 @@
+"""Benchmarks for core-scraper-service."""
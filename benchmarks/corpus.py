@@ -0,0 +1,226 @@
+"""
+Synthetic page corpus served from a local HTTP server.
+"""
+
+import html
+import http.server
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+from benchmarks.fake_driver import FakeDriver, FakePage
+
+WORDS = [
+    "onion",
+    "relay",
+    "circuit",
+    "guard",
+    "exit",
+    "bridge",
+    "consensus",
+    "descriptor",
+    "hidden",
+    "service",
+    "directory",
+    "bandwidth",
+    "latency",
+    "stream",
+    "cell",
+]
+
+CORPUS_DOMAIN = ".corpus.test"
+
+
+@dataclass
+class CorpusPage:
+    """One synthetic page of the benchmark corpus."""
+
+    path: str
+    title: str
+    text: str
+    links: list[str] = field(default_factory=list)
+    images: list[str] = field(default_factory=list)
+    js_rendered: bool = False
+
+    @property
+    def host(self) -> str:
+        """Host of its own, so per-domain state is not shared by pages."""
+        return self.path.strip("/").replace("/", "-") + CORPUS_DOMAIN
+
+    @property
+    def base_url(self) -> str:
+        """Origin the page is served from."""
+        return f"http://{self.host}"
+
+    def render(self) -> str:
+        """HTML as served over HTTP; JS pages ship an empty mount point."""
+        anchors = "".join(
+            f'<li><a href="{link}">{html.escape(link)}</a></li>'
+            for link in self.links
+        )
+        images = "".join(f'<img src="{src}" alt="">' for src in self.images)
+        body = f"<p>{html.escape(self.text)}</p><ul>{anchors}</ul>{images}"
+        if self.js_rendered:
+            body = (
+                '<div id="app"></div>'
+                "<script>document.getElementById('app').innerHTML = "
+                f"{json.dumps(body)};</script>"
+            )
+        return (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            f"<title>{html.escape(self.title)}</title></head>"
+            f"<body>{body}</body></html>"
+        )
+
+    def to_fake_page(self) -> FakePage:
+        """Page as a browser sees it after scripts have run."""
+        return FakePage(
+            url=self.base_url + self.path,
+            title=self.title,
+            text=self.text,
+            links=[self.base_url + link for link in self.links],
+            images=[self.base_url + src for src in self.images],
+        )
+
+
+def build_corpus(
+    sizes: tuple[int, ...] = (200, 5000, 50000),
+    link_counts: tuple[int, ...] = (10, 200, 2000),
+    pages_per_kind: int = 3,
+) -> list[CorpusPage]:
+    """
+    Build pages covering every combination of size, links and rendering.
+
+    Args:
+        sizes: Approximate visible text sizes in characters
+        link_counts: Number of links per page
+        pages_per_kind: Pages generated per combination
+
+    Returns:
+        Deterministic list of CorpusPage
+    """
+    pages = []
+    for size in sizes:
+        for links in link_counts:
+            for js_rendered in (False, True):
+                for index in range(pages_per_kind):
+                    kind = "js" if js_rendered else "static"
+                    path = f"/{kind}/{size}/{links}/{index}"
+                    words = " ".join(
+                        WORDS[(index + i) % len(WORDS)]
+                        for i in range(size // 7 + 1)
+                    )
+                    pages.append(
+                        CorpusPage(
+                            path=path,
+                            title=f"{kind} page {size}/{links}/{index}",
+                            text=words[:size],
+                            links=[f"{path}/link/{i}" for i in range(links)],
+                            images=[
+                                f"{path}/img/{i}.png"
+                                for i in range(max(1, links // 10))
+                            ],
+                            js_rendered=js_rendered,
+                        )
+                    )
+    return pages
+
+
+class CorpusServer:
+    """
+    Serve a corpus on 127.0.0.1 in a background thread.
+
+    Every page has a host of its own under CORPUS_DOMAIN, which does not
+    resolve: clients reach the pages through the server as an HTTP proxy.
+    """
+
+    def __init__(self, pages: list[CorpusPage]) -> None:
+        """
+        Initialize server.
+
+        Args:
+            pages: Pages to serve by path
+        """
+        self.pages = {page.path: page for page in pages}
+        self._rendered = {
+            path: page.render().encode() for path, page in self.pages.items()
+        }
+        self._server: http.server.ThreadingHTTPServer | None = None
+
+    @property
+    def proxy_url(self) -> str:
+        """URL of the running server, to use as HTTP proxy."""
+        if self._server is None:
+            raise RuntimeError("Corpus server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def urls(self) -> list[str]:
+        """URL of every page."""
+        return [page.base_url + page.path for page in self.pages.values()]
+
+    def fake_pages(self) -> dict[str, FakePage]:
+        """Rendered pages by URL, for fake drivers."""
+        return {
+            page.base_url + page.path: page.to_fake_page()
+            for page in self.pages.values()
+        }
+
+    def __enter__(self) -> "CorpusServer":
+        rendered = self._rendered
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                # Proxied requests carry the absolute URL.
+                body = rendered.get(urlsplit(self.path).path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_args: Any) -> None:
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), Handler
+        )
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        ).start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class CorpusDriver(FakeDriver):
+    """Fake driver that navigates between corpus pages."""
+
+    def __init__(self, pages: dict[str, FakePage], latency: float = 0.0):
+        """
+        Initialize corpus driver.
+
+        Args:
+            pages: Rendered pages by URL
+            latency: Seconds added to every command
+        """
+        super().__init__(FakePage(url="about:blank"), latency=latency)
+        self.pages = pages
+
+    def get(self, url: str) -> None:
+        """Navigate to a corpus page."""
+        super().get(url)
+        self.page = self.pages.get(url, FakePage(url=url))
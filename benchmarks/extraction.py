@@ -0,0 +1,105 @@
+"""
+Compare WebDriver command counts and wall time of extraction strategies.
+
+Usage:
+    python -m benchmarks.extraction --links 2000 --latency-ms 5
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import HttpUrl
+from selenium.webdriver.common.by import By
+
+from app.serializers.scraper import ScrapeRequest
+from app.services.scraper_service import ScraperService
+from benchmarks.fake_driver import FakeDriver, FakePage
+
+
+def legacy_extract(driver: Any, request: ScrapeRequest) -> dict[str, Any]:
+    """Per-element extraction as shipped before the in-page script."""
+    payload: dict[str, Any] = {"title": driver.title}
+    if request.extract_text:
+        payload["text"] = driver.find_element(By.TAG_NAME, "body").text
+    if request.extract_links:
+        links = driver.find_elements(By.TAG_NAME, "a")
+        payload["links"] = [
+            link.get_attribute("href")
+            for link in links
+            if link.get_attribute("href")
+        ]
+    if request.extract_images:
+        images = driver.find_elements(By.TAG_NAME, "img")
+        payload["images"] = [
+            img.get_attribute("src")
+            for img in images
+            if img.get_attribute("src")
+        ]
+    payload["current_url"] = driver.current_url
+    return payload
+
+
+def build_page(links: int, images: int) -> FakePage:
+    """Build a synthetic page with the given element counts."""
+    return FakePage(
+        url="http://example.onion/",
+        title="Benchmark page",
+        text="lorem ipsum " * 500,
+        links=[f"http://example.onion/page/{i}" for i in range(links)],
+        images=[f"http://example.onion/img/{i}.png" for i in range(images)],
+    )
+
+
+def run(
+    name: str,
+    extract: Callable[[Any, ScrapeRequest], Any],
+    page: FakePage,
+    request: ScrapeRequest,
+    latency: float,
+) -> tuple[str, int, float]:
+    """Run one extraction strategy and measure it."""
+    driver = FakeDriver(page, latency=latency)
+    started = time.perf_counter()
+    extract(driver, request)
+    return name, driver.commands, time.perf_counter() - started
+
+
+def main() -> None:
+    """Run the extraction benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--links", type=int, default=2000)
+    parser.add_argument("--images", type=int, default=200)
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=2.0,
+        help="Simulated WebDriver round trip per command",
+    )
+    args = parser.parse_args()
+
+    page = build_page(args.links, args.images)
+    request = ScrapeRequest(
+        url=HttpUrl(page.url),
+        extract_links=True,
+        extract_images=True,
+    )
+    service = ScraperService()
+    latency = args.latency_ms / 1000
+
+    rows = [
+        run("legacy", legacy_extract, page, request, latency),
+        run(
+            "commands", service._extract_with_commands, page, request, latency
+        ),
+        run("script", service._extract_with_script, page, request, latency),
+    ]
+
+    print(f"{'strategy':<10} {'commands':>10} {'seconds':>10}")
+    for name, commands, seconds in rows:
+        print(f"{name:<10} {commands:>10} {seconds:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
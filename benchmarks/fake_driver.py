@@ -0,0 +1,159 @@
+"""
+In-memory WebDriver stand-in that counts commands.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from selenium.webdriver.common.by import By
+
+from app.services.extraction import EXTRACTION_SCRIPT
+from app.services.readiness import (
+    DOM_QUIET_SCRIPT,
+    NETWORK_ACTIVITY_SCRIPT,
+    READY_STATE_SCRIPT,
+    SELECTOR_SCRIPT,
+)
+
+
+@dataclass
+class FakePage:
+    """Synthetic page served by FakeDriver."""
+
+    url: str
+    title: str = ""
+    text: str = ""
+    links: list[str] = field(default_factory=list)
+    images: list[str] = field(default_factory=list)
+    meta: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def html(self) -> str:
+        """Render the page as HTML."""
+        anchors = "".join(f'<a href="{link}">link</a>' for link in self.links)
+        images = "".join(f'<img src="{src}">' for src in self.images)
+        return (
+            f"<html><head><title>{self.title}</title></head>"
+            f"<body><p>{self.text}</p>{anchors}{images}</body></html>"
+        )
+
+
+class FakeElement:
+    """Element handle whose attribute reads are WebDriver commands."""
+
+    def __init__(
+        self, driver: "FakeDriver", attributes: dict[str, str], text: str = ""
+    ) -> None:
+        self._driver = driver
+        self._attributes = attributes
+        self._text = text
+
+    @property
+    def text(self) -> str:
+        """Visible element text."""
+        self._driver._command()
+        return self._text
+
+    def get_attribute(self, name: str) -> str | None:
+        """Read an attribute."""
+        self._driver._command()
+        return self._attributes.get(name)
+
+
+class FakeDriver:
+    """WebDriver stand-in with simulated per-command latency."""
+
+    def __init__(self, page: FakePage, latency: float = 0.0) -> None:
+        """
+        Initialize fake driver.
+
+        Args:
+            page: Page returned for every navigation
+            latency: Seconds added to every command (network round trip)
+        """
+        self.page = page
+        self.latency = latency
+        self.commands = 0
+        self.requested_url: str | None = None
+
+    def _command(self) -> None:
+        self.commands += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def get(self, url: str) -> None:
+        """Navigate to a URL."""
+        self._command()
+        self.requested_url = url
+
+    @property
+    def title(self) -> str:
+        """Page title."""
+        self._command()
+        return self.page.title
+
+    @property
+    def current_url(self) -> str:
+        """Current page URL."""
+        self._command()
+        return self.page.url
+
+    @property
+    def page_source(self) -> str:
+        """Serialized page HTML."""
+        self._command()
+        return self.page.html
+
+    def find_element(self, by: str, value: str) -> FakeElement:
+        """Find the first element matching a locator."""
+        self._command()
+        if by == By.TAG_NAME and value == "body":
+            return FakeElement(self, {}, text=self.page.text)
+        raise ValueError(f"Unsupported locator: {by}={value}")
+
+    def find_elements(self, by: str, value: str) -> list[FakeElement]:
+        """Find all elements matching a locator."""
+        self._command()
+        if by == By.TAG_NAME and value == "a":
+            return [FakeElement(self, {"href": h}) for h in self.page.links]
+        if by == By.TAG_NAME and value == "img":
+            return [FakeElement(self, {"src": s}) for s in self.page.images]
+        return []
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        """Run one of the scripts the scraper service sends."""
+        self._command()
+        if script == EXTRACTION_SCRIPT:
+            options = args[0]
+            payload: dict[str, Any] = {
+                "title": self.page.title,
+                "current_url": self.page.url,
+                "meta": dict(self.page.meta),
+            }
+            if options.get("text"):
+                payload["text"] = self.page.text
+            if options.get("html"):
+                payload["html"] = self.page.html
+            if options.get("links"):
+                payload["links"] = list(self.page.links)
+            if options.get("images"):
+                payload["images"] = list(self.page.images)
+            return payload
+        if script == READY_STATE_SCRIPT:
+            return "complete"
+        if script == NETWORK_ACTIVITY_SCRIPT:
+            return ["complete", 0]
+        if script == DOM_QUIET_SCRIPT:
+            return ["complete", float("inf")]
+        if script == SELECTOR_SCRIPT:
+            return True
+        return None
+
+    def delete_all_cookies(self) -> None:
+        """Clear cookies."""
+        self._command()
+
+    def quit(self) -> None:
+        """Close the browser."""
+        self._command()
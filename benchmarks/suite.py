@@ -0,0 +1,321 @@
+"""
+End-to-end scrape benchmark against a local synthetic corpus.
+
+Runs ScraperService.scrape over every corpus page with each engine and
+reports pages/sec, p50/p99 latency, WebDriver commands per page and peak
+RSS. Needs no network: pages are served from 127.0.0.1, through which
+requests for their per-page hosts are proxied, and the "fake" engines use
+an in-memory WebDriver.
+
+Usage:
+    python -m benchmarks.suite --engine fake --engine http
+    python -m benchmarks.suite --save benchmarks/baselines/local.json
+    python -m benchmarks.suite --compare benchmarks/baselines/local.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from unittest.mock import patch
+
+from pydantic import HttpUrl
+from selenium.common.exceptions import WebDriverException
+
+from app.core.browsers.pool import BrowserPoolRegistry
+from app.core.errors import ScrapingError
+from app.core.settings import settings
+from app.serializers.scraper import ScrapeRequest
+from app.services import scraper_service
+from app.services.admission import admission
+from app.services.engine_selection import engine_selector
+from app.services.scraper_service import ScraperService
+from benchmarks.corpus import CorpusDriver, CorpusServer, build_corpus
+
+ENGINES = {
+    "fake": "chrome",
+    "fake-auto": "auto",
+    "http": "http",
+    "chrome": "chrome",
+}
+
+HIGHER_IS_BETTER = {"pages_per_second"}
+
+COMPARED_METRICS = (
+    "pages_per_second",
+    "p50_ms",
+    "p99_ms",
+    "commands_per_page",
+)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> dict[str, float]:
+    """Peak resident set size of this process and its children in MiB."""
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {
+        "peak_rss_mb": round(own * 1024 / scale / 1024, 1),
+        "peak_children_rss_mb": round(children * 1024 / scale / 1024, 1),
+    }
+
+
+def run_engine(
+    engine: str,
+    server: CorpusServer,
+    concurrency: int,
+    latency: float,
+) -> dict[str, Any]:
+    """
+    Scrape every corpus page with one engine.
+
+    Args:
+        engine: Key of ENGINES
+        server: Running corpus server
+        concurrency: Scrapes run in parallel
+        latency: Simulated seconds per fake WebDriver command
+
+    Returns:
+        Measurements of the run
+    """
+    fake_pages = server.fake_pages()
+    drivers: list[CorpusDriver] = []
+    lock = threading.Lock()
+
+    def fake_browser(*_args: Any) -> CorpusDriver:
+        driver = CorpusDriver(fake_pages, latency=latency)
+        with lock:
+            drivers.append(driver)
+        return driver
+
+    requests = [
+        ScrapeRequest(
+            url=HttpUrl(url),
+            browser_type=ENGINES[engine],
+            wait_time=5,
+            extract_links=True,
+            extract_images=True,
+            bypass_cache=True,
+        )
+        for url in server.urls()
+    ]
+    service = ScraperService()
+    latencies: list[float] = []
+    commands: list[int] = []
+    engines: dict[str, int] = {}
+    errors: list[str] = []
+
+    def scrape(request: ScrapeRequest) -> None:
+        started = time.perf_counter()
+        try:
+            response = service.scrape(request)
+        except (ScrapingError, WebDriverException) as e:
+            with lock:
+                errors.append(str(e).strip())
+            return
+        elapsed = time.perf_counter() - started
+        used = response.metadata.get("engine") or request.browser_type
+        with lock:
+            latencies.append(elapsed)
+            commands.append(response.metadata.get("webdriver_commands", 0))
+            engines[used] = engines.get(used, 0) + 1
+
+    pools = BrowserPoolRegistry()
+    engine_selector.clear()
+    admission.clear()
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(
+            patch.object(scraper_service, "browser_pools", pools)
+        )
+        stack.enter_context(
+            patch.dict(
+                os.environ, {"http_proxy": server.proxy_url, "no_proxy": ""}
+            )
+        )
+        stack.enter_context(patch.object(settings, "cache_enabled", False))
+        stack.enter_context(patch.object(settings, "coalesce_requests", False))
+        stack.enter_context(
+            patch.object(settings, "browser_pool_max_size", concurrency)
+        )
+        if engine.startswith("fake"):
+            stack.enter_context(
+                patch.object(
+                    ScraperService,
+                    "_initialize_browser",
+                    side_effect=fake_browser,
+                )
+            )
+        # Warm up a browser first, and skip engines that cannot start.
+        scrape(requests[0])
+        if errors:
+            pools.close()
+            return {"engine": engine, "skipped": errors[0]}
+        latencies.clear()
+        commands.clear()
+        engines.clear()
+        warmup_commands = sum(driver.commands for driver in drivers)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(scrape, requests))
+        wall = time.perf_counter() - started
+        pools.close()
+
+    if drivers:
+        total_commands = (
+            sum(driver.commands for driver in drivers) - warmup_commands
+        )
+    else:
+        total_commands = sum(commands)
+
+    return {
+        "engine": engine,
+        "pages": len(requests),
+        "concurrency": concurrency,
+        "pages_per_second": round(len(requests) / wall, 2),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "commands_per_page": round(total_commands / len(requests), 2),
+        "engines_used": engines,
+        "errors": len(errors),
+        **peak_rss_mb(),
+    }
+
+
+def compare(
+    results: list[dict[str, Any]],
+    baseline: dict[str, Any],
+    tolerance: float,
+) -> list[str]:
+    """
+    Find metrics that regressed beyond the tolerance.
+
+    Args:
+        results: Current run results
+        baseline: Saved results to compare against
+        tolerance: Allowed relative change, e.g. 0.2 for 20%
+
+    Returns:
+        Human readable regressions
+    """
+    previous = {row["engine"]: row for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        before = previous.get(row["engine"])
+        if before is None or "skipped" in row:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), row.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > tolerance:
+                regressions.append(
+                    f"{row['engine']} {metric}: {old} -> {new} "
+                    f"({change:+.0%} worse)"
+                )
+    return regressions
+
+
+def print_table(results: list[dict[str, Any]]) -> None:
+    """Print results as an aligned table."""
+    columns = (
+        "engine",
+        "pages",
+        "pages_per_second",
+        "p50_ms",
+        "p99_ms",
+        "commands_per_page",
+        "peak_rss_mb",
+    )
+    print("  ".join(f"{column:>17}" for column in columns))
+    for row in results:
+        if "skipped" in row:
+            print(f"{row['engine']:>17}  skipped: {row['skipped']}")
+            continue
+        print("  ".join(f"{row[column]!s:>17}" for column in columns))
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--engine",
+        action="append",
+        choices=sorted(ENGINES),
+        help="Engine to run, repeatable (default: fake, fake-auto, http)",
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--pages-per-kind", type=int, default=3)
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=1.0,
+        help="Simulated WebDriver round trip of the fake engines",
+    )
+    parser.add_argument("--save", help="Write results to a baseline file")
+    parser.add_argument("--compare", help="Baseline file to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative change tolerated before a metric regresses",
+    )
+    args = parser.parse_args()
+    engines = args.engine or ["fake", "fake-auto", "http"]
+
+    corpus = build_corpus(pages_per_kind=args.pages_per_kind)
+    with CorpusServer(corpus) as server:
+        results = [
+            run_engine(
+                engine, server, args.concurrency, args.latency_ms / 1000
+            )
+            for engine in engines
+        ]
+
+    print_table(results)
+
+    if args.save:
+        report = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "latency_ms": args.latency_ms,
+            "results": results,
+        }
+        with open(args.save, "w", encoding="utf-8") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+            baseline_file.write("\n")
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Tests for admission control."""
+
+import threading
+import unittest
+from unittest.mock import patch
+
+from pydantic import HttpUrl
+
+from app.api.v1.endpoints.scraper import _scrape_http_error
+from app.core.errors import AdmissionRejectedError
+from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.services.admission import AdmissionController, admission
+from app.services.engine_selection import engine_selector
+from app.services.scraper_service import ScraperService
+
+
+class TestAdmissionController(unittest.TestCase):
+    """Test the concurrency limit and wait queue."""
+
+    def hold(self, controller):
+        """Occupy one slot from another thread until released."""
+        admitted, release = threading.Event(), threading.Event()
+
+        def run():
+            with controller.admit():
+                admitted.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.assertTrue(admitted.wait(5))
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(release.set)
+        return release
+
+    def test_full_queue_rejects_immediately(self):
+        """Test scrapes beyond the limit and queue are rejected."""
+        controller = AdmissionController(
+            "chrome", max_concurrent=1, max_queue=0, queue_timeout=5
+        )
+        self.hold(controller)
+
+        with (
+            self.assertRaises(AdmissionRejectedError) as context,
+            controller.admit(),
+        ):
+            pass
+        self.assertIn("queue full", str(context.exception))
+        self.assertEqual(context.exception.retry_after, 1)
+
+    def test_queue_timeout_rejects(self):
+        """Test queued scrapes give up after the queue timeout."""
+        controller = AdmissionController(
+            "chrome", max_concurrent=1, max_queue=1, queue_timeout=0.05
+        )
+        self.hold(controller)
+
+        with (
+            self.assertRaises(AdmissionRejectedError) as context,
+            controller.admit(),
+        ):
+            pass
+        self.assertIn("queue timeout", str(context.exception))
+        self.assertEqual(controller.snapshot()["waiting"], 0)
+
+    def test_queued_scrape_runs_when_slot_frees(self):
+        """Test a waiting scrape is admitted once a running one ends."""
+        controller = AdmissionController(
+            "chrome", max_concurrent=1, max_queue=1, queue_timeout=5
+        )
+        release = self.hold(controller)
+        threading.Timer(0.05, release.set).start()
+
+        with controller.admit():
+            self.assertEqual(controller.snapshot()["active"], 1)
+
+    def test_retry_after_uses_service_time(self):
+        """Test the estimate grows with service time and queue length."""
+        controller = AdmissionController(
+            "tor",
+            max_concurrent=2,
+            max_queue=4,
+            queue_timeout=5,
+            smoothing=1.0,
+        )
+        with (
+            patch(
+                "app.services.admission.time.monotonic",
+                side_effect=[0.0, 0.0, 10.0],
+            ),
+            controller.admit(),
+        ):
+            pass
+        self.assertEqual(controller.service_time, 10.0)
+        self.assertEqual(controller.retry_after(), 5)
+
+
+class TestScrapeAdmission(unittest.TestCase):
+    """Test admission in front of ScraperService.scrape."""
+
+    def setUp(self):
+        """Use fresh controllers."""
+        admission.clear()
+        self.addCleanup(admission.clear)
+
+    def test_saturated_browser_type_is_rejected(self):
+        """Test scrape raises once the browser type is saturated."""
+        request = ScrapeRequest(
+            url=HttpUrl("https://example.com/"),
+            browser_type="chrome",
+            bypass_cache=True,
+        )
+        response = ScrapeResponse(url="https://example.com/")
+        with (
+            patch("app.services.admission.settings.admission_max_queue", 0),
+            patch(
+                "app.services.admission.settings.admission_max_concurrent", 1
+            ),
+            patch.object(
+                ScraperService, "_scrape_page", return_value=response
+            ),
+            admission.admit("chrome"),
+            self.assertRaises(AdmissionRejectedError),
+        ):
+            ScraperService().scrape(request)
+
+    def test_auto_admitted_per_engine(self):
+        """Test 'auto' admits the HTTP attempt and escalation separately."""
+        request = ScrapeRequest(
+            url=HttpUrl("https://spa.example.com/"),
+            browser_type="auto",
+            bypass_cache=True,
+        )
+        shell = ScrapeResponse(
+            url="https://spa.example.com/",
+            html='<div id="app"></div>',
+            text="",
+            metadata={"status_code": 200, "content_type": "text/html"},
+        )
+        active = []
+
+        def scrape(_request):
+            active.append(
+                {
+                    name: admission.get(name).snapshot()["active"]
+                    for name in ("auto", "http", "chrome")
+                }
+            )
+            return shell.model_copy(deep=True)
+
+        engine_selector.clear()
+        self.addCleanup(engine_selector.clear)
+        with (
+            patch.object(ScraperService, "_fetch_page", side_effect=scrape),
+            patch.object(ScraperService, "_scrape_page", side_effect=scrape),
+        ):
+            ScraperService()._scrape_auto(request)
+
+        self.assertEqual(
+            active,
+            [
+                {"auto": 0, "http": 1, "chrome": 0},
+                {"auto": 0, "http": 0, "chrome": 1},
+            ],
+        )
+
+    def test_rejection_maps_to_429(self):
+        """Test rejections become 429 responses with Retry-After."""
+        error = _scrape_http_error(
+            AdmissionRejectedError("saturated", retry_after=7)
+        )
+        self.assertEqual(error.status_code, 429)
+        self.assertEqual(error.headers, {"Retry-After": "7"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,280 @@
+"""Tests for the async scraping path."""
+
+import asyncio
+import contextlib
+import http.server
+import json
+import threading
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pydantic import HttpUrl
+from selenium.common.exceptions import JavascriptException
+
+from app.core.browsers.webdriver_async import AsyncWebDriver
+from app.core.errors import AdmissionRejectedError
+from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.services.admission import AdmissionController
+from app.services.extraction import EXTRACTION_SCRIPT
+from app.services.readiness import ReadyStateStrategy
+from app.services.scraper_service import ScraperService
+from app.services.singleflight import AsyncSingleFlight
+
+SESSION = "s1"
+
+
+class WebDriverHandler(http.server.BaseHTTPRequestHandler):
+    """Answer the W3C WebDriver commands the async path sends."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    commands: list[tuple[str, str]] = []
+
+    def setup(self):
+        """Count connections to check keep-alive."""
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        """Answer Get Title."""
+        self.commands.append(("GET", self.path))
+        self.reply(200, {"value": "Fake page"})
+
+    def do_POST(self):
+        """Answer Navigate To and Execute Script."""
+        length = int(self.headers["Content-Length"])
+        params = json.loads(self.rfile.read(length))
+        self.commands.append(("POST", self.path))
+        if self.path.endswith("/url"):
+            self.reply(200, {"value": None})
+        elif params["script"] == EXTRACTION_SCRIPT:
+            self.reply(
+                200,
+                {
+                    "value": {
+                        "title": "Fake page",
+                        "text": "hello",
+                        "current_url": "https://example.com/",
+                    }
+                },
+            )
+        elif params["script"].startswith("throw"):
+            error = {"error": "javascript error", "message": "boom"}
+            self.reply(500, {"value": error})
+        else:
+            self.reply(200, {"value": "complete"})
+
+    def reply(self, status, payload):
+        """Send a JSON response on the kept-alive connection."""
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        """Keep test output quiet."""
+
+
+class WebDriverServerTestCase(unittest.TestCase):
+    """Run a fake WebDriver server for each test."""
+
+    def setUp(self):
+        """Start the server and reset its counters."""
+        WebDriverHandler.connections = 0
+        WebDriverHandler.commands = []
+        self.server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), WebDriverHandler
+        )
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def make_driver(self):
+        """Build a Selenium-like driver pointing at the fake server."""
+        driver = MagicMock()
+        driver.command_executor.client_config.remote_server_addr = self.url
+        driver.session_id = SESSION
+        return driver
+
+
+class TestAsyncWebDriver(WebDriverServerTestCase):
+    """Test AsyncWebDriver commands."""
+
+    def test_commands_share_connection(self):
+        """Test commands run over one keep-alive connection."""
+
+        async def run():
+            session = AsyncWebDriver.from_driver(self.make_driver())
+            try:
+                await session.get("https://example.com/")
+                state = await session.execute_script("return 1")
+                title = await session.title()
+            finally:
+                await session.close()
+            return session, state, title
+
+        session, state, title = asyncio.run(run())
+
+        self.assertEqual(state, "complete")
+        self.assertEqual(title, "Fake page")
+        self.assertEqual(WebDriverHandler.connections, 1)
+        self.assertEqual(
+            WebDriverHandler.commands[0], ("POST", f"/session/{SESSION}/url")
+        )
+        self.assertEqual(sum(session.stats.commands.values()), 3)
+
+    def test_errors_mapped(self):
+        """Test driver errors raise the matching Selenium exception."""
+
+        async def run():
+            session = AsyncWebDriver(self.url, SESSION)
+            try:
+                await session.execute_script("throw new Error()")
+            finally:
+                await session.close()
+
+        with self.assertRaisesRegex(JavascriptException, "boom"):
+            asyncio.run(run())
+
+
+class TestAsyncWaits(unittest.TestCase):
+    """Test waits that sleep on the event loop."""
+
+    def test_readiness_wait_async(self):
+        """Test readiness polls until ready and times out otherwise."""
+        strategy = ReadyStateStrategy(
+            ScrapeRequest(url=HttpUrl("https://example.com"))
+        )
+        strategy.poll_interval = 0.01
+        session = AsyncMock()
+        session.execute_script.side_effect = ["loading", "complete"]
+        self.assertTrue(asyncio.run(strategy.wait_async(session, 1)))
+
+        session.execute_script.side_effect = None
+        session.execute_script.return_value = "loading"
+        self.assertFalse(asyncio.run(strategy.wait_async(session, 0.05)))
+
+    def test_admission_async(self):
+        """Test async scrapes queue for slots and time out."""
+        controller = AdmissionController(
+            "chrome", max_concurrent=1, max_queue=1, queue_timeout=0.2
+        )
+        order = []
+
+        async def scrape(name, seconds):
+            async with controller.admit_async():
+                order.append(name)
+                await asyncio.sleep(seconds)
+
+        async def run():
+            return await asyncio.gather(
+                scrape("first", 0.1),
+                scrape("second", 0),
+                scrape("third", 0),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+
+        self.assertEqual(order, ["first", "second"])
+        self.assertIsInstance(results[2], AdmissionRejectedError)
+        self.assertEqual(controller.snapshot()["active"], 0)
+
+    def test_single_flight_async(self):
+        """Test concurrent equivalent coroutines share one call."""
+        flights = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "page"
+
+        async def run():
+            return await asyncio.gather(
+                flights.do("key", fetch), flights.do("key", fetch)
+            )
+
+        self.assertEqual(asyncio.run(run()), [("page", False), ("page", True)])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flights.in_flight(), 0)
+
+
+class TestScrapeAsync(WebDriverServerTestCase):
+    """Test ScraperService.scrape_async."""
+
+    def setUp(self):
+        """Start the fake server and create a service."""
+        super().setUp()
+        self.service = ScraperService()
+
+    def test_browser_scrape_awaited(self):
+        """Test browser scrapes are driven over the async session."""
+        driver = self.make_driver()
+        request = ScrapeRequest(
+            url=HttpUrl("https://example.com/"),
+            browser_type="chrome",
+            bypass_cache=True,
+        )
+
+        with patch.object(
+            self.service,
+            "_lease_browser",
+            return_value=contextlib.nullcontext(driver),
+        ):
+            response = asyncio.run(self.service.scrape_async(request))
+
+        self.assertEqual(response.text, "hello")
+        self.assertEqual(response.metadata["extraction"], "script")
+        self.assertTrue(response.metadata["ready"])
+        self.assertIn("extract", response.metadata["timings_ms"])
+        self.assertGreaterEqual(response.metadata["webdriver_commands"], 3)
+        driver.get.assert_not_called()
+        driver.execute_script.assert_not_called()
+
+    def test_cancelled_lease_released(self):
+        """Test a browser leased for a cancelled scrape is handed back."""
+        entering, proceed, released = (threading.Event() for _ in range(3))
+        lease = MagicMock()
+
+        def enter():
+            entering.set()
+            proceed.wait(5)
+            return self.make_driver()
+
+        lease.__enter__.side_effect = enter
+        lease.__exit__.side_effect = lambda *_args: released.set()
+
+        async def run():
+            task = asyncio.create_task(self.service._enter_lease(lease))
+            await asyncio.to_thread(entering.wait, 5)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            proceed.set()
+            await asyncio.to_thread(released.wait, 5)
+
+        asyncio.run(run())
+        lease.__exit__.assert_called_once_with(None, None, None)
+
+    def test_http_engine_runs_in_thread(self):
+        """Test scrapes outside the async path use the sync scrape."""
+        request = ScrapeRequest(
+            url=HttpUrl("https://example.com/"), browser_type="http"
+        )
+        response = ScrapeResponse(url="https://example.com/")
+        with patch.object(
+            self.service, "scrape", return_value=response
+        ) as scrape:
+            result = asyncio.run(self.service.scrape_async(request))
+
+        scrape.assert_called_once_with(request)
+        self.assertIs(result, response)
+
+
+if __name__ == "__main__":
+    unittest.main()
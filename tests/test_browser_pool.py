@@ -0,0 +1,148 @@
+"""Tests for the browser pool."""
+
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from selenium.common.exceptions import WebDriverException
+
+from app.core.browsers.pool import BrowserPool, BrowserPoolRegistry
+from app.core.browsers.slots import BrowserSlots
+from app.core.errors import BrowserPoolTimeoutError
+
+
+class TestBrowserPool(unittest.TestCase):
+    """Test BrowserPool lease/return semantics."""
+
+    def setUp(self):
+        """Create a pool backed by mock drivers."""
+        self.factory = MagicMock(side_effect=lambda: MagicMock())
+
+    def test_lease_reuses_driver(self):
+        """Test a returned driver is handed out again."""
+        pool = BrowserPool(self.factory, max_size=1)
+        with pool.lease() as first:
+            pass
+        with pool.lease() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(self.factory.call_count, 1)
+        first.quit.assert_not_called()
+
+    def test_driver_reset_on_return(self):
+        """Test returned drivers are cleared before reuse."""
+        pool = BrowserPool(self.factory)
+        with pool.lease() as driver:
+            pass
+        driver.delete_all_cookies.assert_called_once()
+        driver.get.assert_called_with("about:blank")
+
+    def test_max_uses_recycles_driver(self):
+        """Test drivers are quit after max_uses leases."""
+        pool = BrowserPool(self.factory, max_uses=2)
+        for _ in range(2):
+            with pool.lease() as driver:
+                pass
+        driver.quit.assert_called_once()
+        self.assertEqual(pool.size, 0)
+
+    def test_webdriver_error_discards_driver(self):
+        """Test drivers that fail while leased are not returned."""
+        pool = BrowserPool(self.factory)
+        with (
+            self.assertRaises(WebDriverException),
+            pool.lease() as driver,
+        ):
+            raise WebDriverException("crashed")
+        driver.quit.assert_called_once()
+        self.assertEqual(pool.idle_count, 0)
+
+    def test_unhealthy_driver_replaced(self):
+        """Test idle drivers failing the health check are replaced."""
+        pool = BrowserPool(self.factory)
+        with pool.lease() as driver:
+            pass
+        type(driver).current_url = property(
+            MagicMock(side_effect=WebDriverException("gone"))
+        )
+        with pool.lease() as replacement:
+            pass
+        self.assertIsNot(driver, replacement)
+        self.assertEqual(self.factory.call_count, 2)
+
+    def test_lease_timeout_when_exhausted(self):
+        """Test leasing beyond max_size times out."""
+        pool = BrowserPool(self.factory, max_size=1, lease_timeout=0)
+        with (
+            pool.lease(),
+            self.assertRaises(BrowserPoolTimeoutError),
+            pool.lease(),
+        ):
+            pass
+
+    def test_idle_eviction_keeps_min_size(self):
+        """Test idle drivers are evicted down to min_size."""
+        pool = BrowserPool(self.factory, min_size=1, idle_timeout=0)
+        pool.warm()
+        self.assertEqual(pool.idle_count, 1)
+        with pool.lease(), pool.lease():
+            pass
+        self.assertEqual(pool.idle_count, 2)
+        with pool.lease():
+            self.assertEqual(pool.idle_count, 0)
+        self.assertEqual(pool.size, 1)
+
+    def test_factory_failure_releases_slot(self):
+        """Test a failed launch does not leak pool capacity."""
+        factory = MagicMock(side_effect=RuntimeError("no browser"))
+        pool = BrowserPool(factory, max_size=1)
+        with self.assertRaises(RuntimeError), pool.lease():
+            pass
+        self.assertEqual(pool.size, 0)
+
+    def test_close_quits_idle_drivers(self):
+        """Test closing the pool quits idle drivers."""
+        pool = BrowserPool(self.factory)
+        with pool.lease() as driver:
+            pass
+        pool.close()
+        driver.quit.assert_called_once()
+        with self.assertRaises(BrowserPoolTimeoutError), pool.lease():
+            pass
+
+
+class TestBrowserPoolRegistry(unittest.TestCase):
+    """Test BrowserPoolRegistry."""
+
+    def test_get_returns_same_pool(self):
+        """Test pools are created once per key."""
+        registry = BrowserPoolRegistry()
+        factory = MagicMock()
+        first = registry.get(("chrome", True), factory)
+        second = registry.get(("chrome", True), factory)
+        other = registry.get(("tor", True), factory)
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        registry.close()
+
+    def test_sweep_frees_slots_of_unused_pools(self):
+        """Test idle drivers of a pool no longer leased from are quit."""
+        with tempfile.TemporaryDirectory() as directory:
+            slots = BrowserSlots(directory, limit=1)
+            registry = BrowserPoolRegistry(sweep_interval=0.05)
+            self.addCleanup(registry.close)
+
+            def make_pool(key):
+                return registry.get(
+                    key,
+                    lambda: MagicMock(),
+                    idle_timeout=0.1,
+                    lease_timeout=1,
+                    slots=slots,
+                )
+
+            with make_pool("headful").lease() as driver:
+                pass
+            with make_pool("headless").lease():
+                pass
+            driver.quit.assert_called_once()
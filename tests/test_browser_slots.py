@@ -0,0 +1,140 @@
+"""Tests for host-wide browser slots."""
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from app.core.browsers.pool import BrowserPool, BrowserPoolRegistry
+from app.core.browsers.slots import BrowserSlots
+from app.core.errors import BrowserPoolTimeoutError
+
+HOLD_SLOT = """
+import sys
+from app.core.browsers.slots import BrowserSlots
+BrowserSlots(sys.argv[1], limit=1).acquire(timeout=5)
+print("ready", flush=True)
+sys.stdin.read()
+"""
+
+
+class TestBrowserSlots(unittest.TestCase):
+    """Test the flock based slot limit."""
+
+    def setUp(self):
+        """Use a fresh slot directory."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_limit_shared_between_instances(self):
+        """Test slots held through one instance block another."""
+        first = BrowserSlots(self.directory, limit=2)
+        second = BrowserSlots(self.directory, limit=2)
+        held = [first.acquire(timeout=0), first.acquire(timeout=0)]
+
+        self.assertEqual(second.in_use(), 2)
+        with self.assertRaises(BrowserPoolTimeoutError):
+            second.acquire(timeout=0)
+
+        first.release(held[0])
+        slot = second.acquire(timeout=0)
+        self.assertEqual(
+            slot.index if slot else None, held[0].index if held[0] else None
+        )
+
+    def test_limit_shared_between_processes(self):
+        """Test a slot held by another process is not handed out."""
+        child = subprocess.Popen(
+            [sys.executable, "-c", HOLD_SLOT, self.directory],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        stdout, stdin = child.stdout, child.stdin
+        if stdout is None or stdin is None:
+            self.fail("Child pipes were not opened")
+        self.addCleanup(stdout.close)
+        self.addCleanup(stdin.close)
+        self.addCleanup(child.wait, 10)
+        self.addCleanup(child.kill)
+        self.assertEqual(stdout.readline().strip(), "ready")
+
+        slots = BrowserSlots(self.directory, limit=1)
+        with self.assertRaises(BrowserPoolTimeoutError):
+            slots.acquire(timeout=0.1)
+
+        # The kernel frees the lock when the holder dies.
+        child.kill()
+        child.wait(10)
+        slots.release(slots.acquire(timeout=1))
+
+    def test_disabled_without_limit(self):
+        """Test a zero limit never blocks."""
+        slots = BrowserSlots(self.directory, limit=0)
+        self.assertIsNone(slots.acquire(timeout=0))
+        self.assertEqual(slots.in_use(), 0)
+
+    def test_pool_drivers_hold_slots(self):
+        """Test pooled drivers hold a slot until they are quit."""
+        slots = BrowserSlots(self.directory, limit=1)
+        pool = BrowserPool(
+            MagicMock(side_effect=lambda: MagicMock()),
+            max_uses=1,
+            lease_timeout=0,
+            slots=slots,
+        )
+        other = BrowserPool(
+            MagicMock(side_effect=lambda: MagicMock()),
+            lease_timeout=0,
+            slots=slots,
+        )
+
+        with pool.lease():
+            self.assertEqual(slots.in_use(), 1)
+            with (
+                self.assertRaises(BrowserPoolTimeoutError),
+                other.lease(),
+            ):
+                pass
+        self.assertEqual(slots.in_use(), 0)
+        self.assertEqual(other.size, 0)
+
+    def test_idle_driver_gives_slot_to_other_pool(self):
+        """Test an idle driver of one pool does not starve another."""
+        slots = BrowserSlots(self.directory, limit=1)
+        registry = BrowserPoolRegistry()
+        self.addCleanup(registry.close)
+        first, second = (
+            registry.get(
+                key, lambda: MagicMock(), lease_timeout=0.5, slots=slots
+            )
+            for key in ("first", "second")
+        )
+
+        with first.lease() as idle:
+            pass
+        with second.lease():
+            self.assertEqual(slots.in_use(), 1)
+        idle.quit.assert_called_once()
+        self.assertEqual(first.size, 0)
+        self.assertEqual(second.idle_count, 1)
+
+    def test_idle_driver_gives_slot_to_other_process(self):
+        """Test idle drivers are quit for a slot wanted elsewhere."""
+        slots = BrowserSlots(self.directory, limit=1)
+        registry = BrowserPoolRegistry(slots=slots, reclaim_interval=0.05)
+        self.addCleanup(registry.close)
+        pool = registry.get("pool", lambda: MagicMock(), slots=slots)
+        with pool.lease() as idle:
+            pass
+
+        other = BrowserSlots(self.directory, limit=1)
+        other.release(other.acquire(timeout=5, reclaim=lambda: False))
+        idle.quit.assert_called_once()
+        self.assertEqual(pool.size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""Tests for the scrape result cache."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pydantic import HttpUrl
+
+from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.services.cache import (
+    ResultCache,
+    normalize_url,
+    request_cache_key,
+)
+
+
+def make_request(url="https://example.com/", **kwargs):
+    """Build a ScrapeRequest for cache tests."""
+    return ScrapeRequest(url=HttpUrl(url), **kwargs)
+
+
+def cache_hit(cache, key):
+    """Look up a key the test expects to be cached."""
+    hit = cache.get(key)
+    if hit is None:
+        raise AssertionError(f"Cache miss for {key}")
+    return hit
+
+
+class TestRequestCacheKey(unittest.TestCase):
+    """Test cache key normalization."""
+
+    def test_normalize_url(self):
+        """Test equivalent URL spellings normalize identically."""
+        self.assertEqual(
+            normalize_url("HTTPS://Example.com:443/a?b=2&a=1#frag"),
+            "https://example.com/a?a=1&b=2",
+        )
+        self.assertEqual(
+            normalize_url("http://example.com:8080"),
+            "http://example.com:8080/",
+        )
+
+    def test_equivalent_requests_share_key(self):
+        """Test cache control options do not change the key."""
+        self.assertEqual(
+            request_cache_key(make_request("https://EXAMPLE.com/?b=1&a=2")),
+            request_cache_key(
+                make_request("https://example.com/?a=2&b=1", bypass_cache=True)
+            ),
+        )
+
+    def test_options_change_key(self):
+        """Test extraction flags and browser type change the key."""
+        base = request_cache_key(make_request())
+        self.assertNotEqual(
+            base, request_cache_key(make_request(extract_links=True))
+        )
+        self.assertNotEqual(
+            base, request_cache_key(make_request(browser_type="chrome"))
+        )
+
+
+class TestResultCache(unittest.TestCase):
+    """Test ResultCache tiers and expiry."""
+
+    def setUp(self):
+        """Create a cached response."""
+        self.response = ScrapeResponse(url="https://example.com/", title="A")
+
+    def test_memory_hit_returns_copy(self):
+        """Test hits return a copy callers can mutate."""
+        cache = ResultCache(ttl=60)
+        cache.set("key", self.response)
+        response, tier, _age = cache_hit(cache, "key")
+        response.metadata["cache"] = "hit"
+        self.assertEqual(tier, "memory")
+        self.assertEqual(cache_hit(cache, "key")[0].metadata, {})
+
+    def test_max_age_and_ttl(self):
+        """Test entries older than max_age or the TTL miss."""
+        cache = ResultCache(ttl=60)
+        with patch("app.services.cache.time.time", return_value=1000.0):
+            cache.set("key", self.response)
+        with patch("app.services.cache.time.time", return_value=1030.0):
+            self.assertIsNotNone(cache.get("key"))
+            self.assertIsNone(cache.get("key", max_age=10))
+            self.assertIsNotNone(cache.get("key", max_age=600))
+        with patch("app.services.cache.time.time", return_value=1100.0):
+            self.assertIsNone(cache.get("key", max_age=600))
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted."""
+        cache = ResultCache(max_entries=2)
+        cache.set("a", self.response)
+        cache.set("b", self.response)
+        cache.get("a")
+        cache.set("c", self.response)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+
+    def test_persistent_tier(self):
+        """Test misses in memory fall through to the persistent store."""
+        store = MagicMock()
+        cache = ResultCache(ttl=60, store=store)
+        cache.set("key", self.response)
+        store.set.assert_called_once()
+
+        stored_at = store.set.call_args.args[2]
+        cache.clear()
+        store.get.return_value = (stored_at, self.response)
+        _response, tier, _age = cache_hit(cache, "key")
+        self.assertEqual(tier, "database")
+        self.assertEqual(cache_hit(cache, "key")[1], "memory")
+
+    def test_expired_rows_purged(self):
+        """Test writes delete expired rows at most once per TTL."""
+        store = MagicMock()
+        cache = ResultCache(ttl=60, store=store)
+        for now in (1000.0, 1030.0, 1070.0):
+            with patch("app.services.cache.time.time", return_value=now):
+                cache.set("key", self.response)
+        self.assertEqual(
+            [call.args for call in store.purge.call_args_list],
+            [(940.0,), (1010.0,)],
+        )
+
+    def test_persistent_tier_errors_ignored(self):
+        """Test database failures degrade to cache misses."""
+        store = MagicMock()
+        store.get.side_effect = RuntimeError("db down")
+        store.set.side_effect = RuntimeError("db down")
+        cache = ResultCache(store=store)
+        cache.set("key", self.response)
+        cache.clear()
+        self.assertIsNone(cache.get("key"))
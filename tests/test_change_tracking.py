@@ -0,0 +1,241 @@
+"""Tests for change detection across repeated scrapes."""
+
+import http.server
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pydantic import HttpUrl
+
+from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.services.change_tracking import (
+    ChangeTracker,
+    change_tracker,
+    fingerprint,
+)
+from app.services.http_engine import HttpEngine
+from app.services.scraper_service import ScraperService
+
+URL = "http://monitor.onion/status"
+
+
+def make_request(**kwargs):
+    """Build a change detecting ScrapeRequest."""
+    kwargs.setdefault("detect_changes", True)
+    return ScrapeRequest(url=HttpUrl(URL), **kwargs)
+
+
+def make_response(text, **metadata):
+    """Build a ScrapeResponse with text and HTML."""
+    return ScrapeResponse(
+        url=URL,
+        text=text,
+        html=f"<p>{text}</p>",
+        links=["http://monitor.onion/"],
+        metadata=metadata,
+    )
+
+
+class VersionedHandler(http.server.BaseHTTPRequestHandler):
+    """Serve a page with an ETag, honoring If-None-Match."""
+
+    body = b"<html><body><p>all systems up</p></body></html>"
+    etag = '"v1"'
+    requests: list[str | None] = []
+
+    def do_GET(self):
+        """Send the page, or 304 when the client has the current one."""
+        self.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *_args):
+        """Keep test output quiet."""
+
+
+class TestFingerprint(unittest.TestCase):
+    """Test text fingerprints."""
+
+    def test_ignores_whitespace(self):
+        """Test reflowed text keeps its fingerprint."""
+        self.assertEqual(fingerprint("a  b\n c"), fingerprint(" a b c "))
+        self.assertNotEqual(fingerprint("a b"), fingerprint("a c"))
+
+
+class TestChangeTracker(unittest.TestCase):
+    """Test ChangeTracker comparisons."""
+
+    def setUp(self):
+        """Create an empty in-memory tracker."""
+        self.tracker = ChangeTracker(max_entries=10)
+
+    def test_first_scrape_is_changed(self):
+        """Test a URL seen for the first time keeps its content."""
+        response = self.tracker.observe(make_request(), make_response("up"))
+        self.assertFalse(response.metadata["unchanged"])
+        self.assertEqual(response.text, "up")
+        self.assertEqual(response.metadata["fingerprint"], fingerprint("up"))
+
+    def test_unchanged_drops_content(self):
+        """Test a repeated page is reported without its payload."""
+        self.tracker.observe(make_request(), make_response("up"))
+        response = self.tracker.observe(make_request(), make_response("up"))
+
+        self.assertTrue(response.metadata["unchanged"])
+        self.assertIsNone(response.text)
+        self.assertIsNone(response.html)
+        self.assertEqual(response.links, [])
+
+    def test_changed_at_kept_while_unchanged(self):
+        """Test changed_at is the time of the last actual change."""
+        with patch(
+            "app.services.change_tracking.time.time", side_effect=[1.0, 2.0]
+        ):
+            self.tracker.observe(make_request(), make_response("up"))
+            response = self.tracker.observe(
+                make_request(), make_response("up")
+            )
+        self.assertEqual(response.metadata["changed_at"], 1.0)
+        version = self.tracker.get(URL)
+        self.assertEqual(version.checked_at if version else None, 2.0)
+
+    def test_diff(self):
+        """Test a changed page carries a unified diff of its text."""
+        request = make_request(include_diff=True)
+        first = self.tracker.observe(request, make_response("a\nup"))
+        self.assertIsNone(first.metadata["diff"])
+
+        response = self.tracker.observe(request, make_response("a\ndown"))
+        self.assertFalse(response.metadata["unchanged"])
+        self.assertIn("-up", response.metadata["diff"])
+        self.assertIn("+down", response.metadata["diff"])
+
+    def test_text_dropped_when_not_requested(self):
+        """Test text fetched only for the fingerprint is not returned."""
+        response = self.tracker.observe(
+            make_request(extract_text=False), make_response("up")
+        )
+        self.assertIsNone(response.text)
+        self.assertIsNotNone(response.html)
+
+    def test_not_modified(self):
+        """Test a 304 revalidation counts as unchanged."""
+        self.tracker.observe(make_request(), make_response("up", etag='"1"'))
+        self.assertEqual(
+            self.tracker.conditional_headers(URL), {"If-None-Match": '"1"'}
+        )
+        response = self.tracker.observe(
+            make_request(), make_response("", status_code=304)
+        )
+        self.assertTrue(response.metadata["unchanged"])
+        self.assertEqual(response.metadata["fingerprint"], fingerprint("up"))
+
+    def test_include_diff_requires_detection(self):
+        """Test diffs cannot be requested without change detection."""
+        with self.assertRaises(ValueError):
+            make_request(detect_changes=False, include_diff=True)
+
+
+class TestScrapeWithChangeDetection(unittest.TestCase):
+    """Test ScraperService change detection per engine."""
+
+    def setUp(self):
+        """Start a versioned local server and forget known versions."""
+        change_tracker.clear()
+        self.addCleanup(change_tracker.clear)
+        VersionedHandler.requests = []
+        self.server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), VersionedHandler
+        )
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def test_http_conditional_fetch(self):
+        """Test the HTTP engine revalidates with the remembered ETag."""
+        engine = HttpEngine(timeout=5)
+        self.addCleanup(engine.close)
+        request = ScrapeRequest(
+            url=HttpUrl(self.url), browser_type="http", detect_changes=True
+        )
+        service = ScraperService()
+        with patch("app.services.scraper_service.http_engine", engine):
+            first = service.scrape(request)
+            second = service.scrape(request)
+
+        self.assertEqual(VersionedHandler.requests, [None, '"v1"'])
+        self.assertFalse(first.metadata["unchanged"])
+        self.assertEqual(first.text, "all systems up")
+        self.assertTrue(second.metadata["unchanged"])
+        self.assertEqual(second.metadata["status_code"], 304)
+        self.assertIsNone(second.text)
+
+    def test_not_modified_without_version_refetched(self):
+        """Test a 304 for a version evicted meanwhile is fetched again."""
+        engine = HttpEngine(timeout=5)
+        self.addCleanup(engine.close)
+        request = ScrapeRequest(
+            url=HttpUrl(self.url), browser_type="http", detect_changes=True
+        )
+        with (
+            patch("app.services.scraper_service.http_engine", engine),
+            patch.object(
+                change_tracker,
+                "conditional_headers",
+                return_value={"If-None-Match": VersionedHandler.etag},
+            ),
+        ):
+            response = ScraperService().scrape(request)
+
+        self.assertEqual(VersionedHandler.requests, ['"v1"', None])
+        self.assertFalse(response.metadata["unchanged"])
+        self.assertEqual(response.text, "all systems up")
+
+    def test_browser_changed_page_text_read_once(self):
+        """Test a changed page's text is not extracted a second time."""
+        service = ScraperService()
+        with (
+            patch.object(service, "_extract_text", return_value="down"),
+            patch.object(
+                service,
+                "_extract_data",
+                return_value={"url": URL, "metadata": {}},
+            ) as extract,
+        ):
+            data = service._extract_if_changed(MagicMock(), make_request())
+
+        self.assertFalse(extract.call_args.args[1].extract_text)
+        self.assertEqual(data["text"], "down")
+
+    def test_browser_skips_extraction_when_unchanged(self):
+        """Test browsers only read the text of an unchanged page."""
+        service = ScraperService()
+        request = make_request(extract_html=True)
+        change_tracker.observe(request, make_response("up"))
+
+        with (
+            patch.object(service, "_extract_text", return_value="up"),
+            patch.object(
+                service,
+                "_extract_data",
+                return_value={"url": URL, "metadata": {}},
+            ) as extract,
+        ):
+            data = service._extract_if_changed(MagicMock(), request)
+
+        narrowed = extract.call_args.args[1]
+        self.assertFalse(narrowed.extract_text or narrowed.extract_html)
+        self.assertEqual(data["metadata"]["fingerprint"], fingerprint("up"))
+
+
+if __name__ == "__main__":
+    unittest.main()
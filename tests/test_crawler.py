@@ -0,0 +1,220 @@
+"""Tests for recursive crawling."""
+
+import threading
+import unittest
+
+from pydantic import HttpUrl
+
+from app.serializers.scraper import (
+    CrawlRequest,
+    CrawlStreamDone,
+    ScrapeBatchItem,
+    ScrapeResponse,
+)
+from app.services.crawler import (
+    BloomFilter,
+    CrawlEntry,
+    Crawler,
+    CrawlFrontier,
+)
+
+SITE = {
+    "http://a.onion/": ["/1", "/2", "http://b.onion/", "mailto:x@a.onion"],
+    "http://a.onion/1": ["/2#top", "/", "/1/deep"],
+    "http://a.onion/2": ["/1"],
+    "http://a.onion/1/deep": ["/1/deeper"],
+    "http://b.onion/": ["http://a.onion/"],
+}
+
+
+class FakeSite:
+    """Scrape function serving SITE, failing on unknown pages."""
+
+    def __init__(self, pages=None):
+        """Record scraped URLs."""
+        self.pages = SITE if pages is None else pages
+        self.scraped: list[str] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        """Scrape one page of SITE."""
+        url = str(request.url)
+        with self.lock:
+            self.scraped.append(url)
+        if url not in self.pages:
+            return ScrapeBatchItem(url=url, success=False, error="404")
+        assert request.extract_links
+        response = ScrapeResponse(url=url, links=self.pages[url])
+        return ScrapeBatchItem(url=url, success=True, result=response)
+
+
+def crawl(site, **kwargs):
+    """Run a crawl of the fake site, returning its results and summary."""
+    kwargs.setdefault("seeds", [HttpUrl("http://a.onion/")])
+    kwargs.setdefault("host_delay", 0)
+    request = CrawlRequest(**kwargs)
+    events = list(Crawler(request, site, concurrency=2).run())
+    return events[:-1], events[-1]
+
+
+def next_entry(frontier, now):
+    """Entry the frontier hands out next, failing when it has none."""
+    entry, _ = frontier.pop(now=now)
+    if entry is None:
+        raise AssertionError("frontier handed out no entry")
+    return entry
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Test the seen-URL Bloom filter."""
+
+    def test_no_false_negatives(self):
+        """Test every added item is reported as present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        urls = [f"http://site.onion/{n}" for n in range(1000)]
+        self.assertTrue(all(bloom.add(url) for url in urls[:10]))
+        for url in urls[10:]:
+            bloom.add(url)
+        self.assertTrue(all(url in bloom for url in urls))
+        self.assertFalse(bloom.add(urls[0]))
+
+    def test_false_positive_rate(self):
+        """Test the error rate holds at capacity."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for n in range(1000):
+            bloom.add(f"http://site.onion/{n}")
+        false_positives = sum(
+            f"http://other.onion/{n}" in bloom for n in range(10000)
+        )
+        self.assertLess(false_positives, 300)
+
+    def test_compact(self):
+        """Test a million URLs fit in a couple of megabytes."""
+        bloom = BloomFilter(capacity=1_000_000, error_rate=0.001)
+        self.assertLess(len(bloom._bits), 2 * 1024 * 1024)
+
+
+class TestCrawlFrontier(unittest.TestCase):
+    """Test per-host politeness scheduling."""
+
+    def test_hosts_take_turns(self):
+        """Test URLs of different hosts alternate."""
+        frontier = CrawlFrontier(host_concurrency=10)
+        for url in ("http://a/1", "http://a/2", "http://b/1"):
+            frontier.push(CrawlEntry(url=url, depth=0))
+        order = [next_entry(frontier, now=0).url for _ in range(3)]
+        self.assertEqual(order, ["http://a/1", "http://b/1", "http://a/2"])
+        self.assertEqual(len(frontier), 0)
+
+    def test_host_concurrency(self):
+        """Test a busy host waits for its scrape to finish."""
+        frontier = CrawlFrontier(host_concurrency=1)
+        frontier.push(CrawlEntry(url="http://a/1", depth=0))
+        frontier.push(CrawlEntry(url="http://a/2", depth=0))
+
+        first = next_entry(frontier, now=0)
+        self.assertEqual(frontier.pop(now=0), (None, float("inf")))
+        frontier.done(first)
+        self.assertEqual(next_entry(frontier, now=0).url, "http://a/2")
+
+    def test_host_delay(self):
+        """Test a host's scrapes start host_delay seconds apart."""
+        frontier = CrawlFrontier(host_concurrency=2, host_delay=5)
+        frontier.push(CrawlEntry(url="http://a/1", depth=0))
+        frontier.push(CrawlEntry(url="http://a/2", depth=0))
+
+        frontier.pop(now=100)
+        self.assertEqual(frontier.pop(now=102), (None, 3))
+        self.assertEqual(next_entry(frontier, now=105).url, "http://a/2")
+
+
+class TestCrawler(unittest.TestCase):
+    """Test crawl scope, budgets and deduplication."""
+
+    def test_follows_links_once(self):
+        """Test each in-scope URL is scraped once within the depth."""
+        site = FakeSite()
+        results, done = crawl(site, max_depth=2)
+
+        self.assertCountEqual(
+            site.scraped,
+            [
+                "http://a.onion/",
+                "http://a.onion/1",
+                "http://a.onion/2",
+                "http://a.onion/1/deep",
+            ],
+        )
+        self.assertIsInstance(done, CrawlStreamDone)
+        self.assertEqual((done.succeeded, done.failed), (4, 0))
+        self.assertEqual(done.discovered, 4)
+        depths = {result.url: result.depth for result in results}
+        self.assertEqual(depths["http://a.onion/1/deep"], 2)
+        parents = {result.url: result.parent for result in results}
+        self.assertEqual(parents["http://a.onion/1"], "http://a.onion/")
+        self.assertIsNone(parents["http://a.onion/"])
+
+    def test_depth_zero_scrapes_seeds(self):
+        """Test max_depth 0 follows no links."""
+        site = FakeSite()
+        crawl(site, max_depth=0)
+        self.assertEqual(site.scraped, ["http://a.onion/"])
+
+    def test_other_hosts(self):
+        """Test links to other hosts are followed without same_host."""
+        site = FakeSite()
+        crawl(site, max_depth=1, same_host=False)
+        self.assertIn("http://b.onion/", site.scraped)
+
+    def test_page_budget(self):
+        """Test the crawl stops at max_pages without queueing more."""
+        site = FakeSite()
+        results, done = crawl(site, max_depth=5, max_pages=2)
+        self.assertEqual(len(site.scraped), 2)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(done.unvisited, 0)
+
+    def test_include_exclude(self):
+        """Test regex scoping of followed links."""
+        site = FakeSite()
+        crawl(site, max_depth=3, include=[r"a\.onion/(1)?$"])
+        self.assertCountEqual(
+            site.scraped, ["http://a.onion/", "http://a.onion/1"]
+        )
+
+        site = FakeSite()
+        crawl(site, max_depth=3, exclude=["deep"])
+        self.assertNotIn("http://a.onion/1/deep", site.scraped)
+
+    def test_failures_reported(self):
+        """Test failed pages are streamed and not followed."""
+        site = FakeSite()
+        results, done = crawl(site, max_depth=3)
+        failed = [result.url for result in results if not result.success]
+        self.assertEqual(failed, ["http://a.onion/1/deeper"])
+        self.assertEqual(done.failed, 1)
+
+    def test_invalid_links_skipped(self):
+        """Test unparsable and overlong links do not end the crawl."""
+        links = [
+            "http://[broken/x",
+            "/" + "x" * 2100,
+            *SITE["http://a.onion/"],
+        ]
+        site = FakeSite({**SITE, "http://a.onion/": links})
+        results, done = crawl(site, max_depth=1)
+
+        self.assertCountEqual(
+            site.scraped,
+            ["http://a.onion/", "http://a.onion/1", "http://a.onion/2"],
+        )
+        self.assertEqual((done.succeeded, done.failed), (3, 0))
+
+    def test_invalid_pattern(self):
+        """Test invalid regexes are rejected at validation."""
+        with self.assertRaises(ValueError):
+            CrawlRequest(seeds=[HttpUrl("http://a.onion/")], include=["("])
+
+
+if __name__ == "__main__":
+    unittest.main()
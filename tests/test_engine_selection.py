@@ -0,0 +1,199 @@
+"""Tests for automatic engine selection."""
+
+import contextlib
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pydantic import HttpUrl
+
+from app.core.errors import HttpStatusError, ScrapingError
+from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.services.engine_selection import (
+    EngineSelector,
+    engine_selector,
+    needs_browser,
+)
+from app.services.scraper_service import ScraperService
+
+ARTICLE = "Static article text. " * 30
+
+
+def http_response(html, text, status_code=200, content_type="text/html"):
+    """Build a response like the HTTP engine returns."""
+    return ScrapeResponse(
+        url="https://example.com/",
+        html=html,
+        text=text,
+        metadata={"status_code": status_code, "content_type": content_type},
+    )
+
+
+class TestNeedsBrowser(unittest.TestCase):
+    """Test the escalation heuristics."""
+
+    def test_static_page_is_enough(self):
+        """Test a page with plenty of text stays on HTTP."""
+        html = f"<html><body><p>{ARTICLE}</p></body></html>"
+        self.assertIsNone(needs_browser(http_response(html, ARTICLE)))
+
+    def test_empty_mount_point(self):
+        """Test a client-side rendered shell escalates."""
+        html = '<body><div id="root"></div><script src="/app.js"></script>'
+        self.assertEqual(
+            needs_browser(http_response(html, "")),
+            "javascript required marker",
+        )
+
+    def test_noscript_wall(self):
+        """Test a noscript notice with little text escalates."""
+        html = "<body><noscript>This site needs JavaScript</noscript></body>"
+        self.assertEqual(
+            needs_browser(http_response(html, "Loading")), "noscript wall"
+        )
+
+    def test_empty_body(self):
+        """Test pages without visible text escalate."""
+        self.assertEqual(
+            needs_browser(http_response("<body></body>", "")), "empty body"
+        )
+
+    def test_low_text_ratio(self):
+        """Test script-heavy pages with little text escalate."""
+        html = f"<body><p>{ARTICLE}</p><script>{'x' * 50000}</script>"
+        self.assertEqual(
+            needs_browser(http_response(html, ARTICLE)), "low text ratio"
+        )
+
+    def test_non_html_never_escalates(self):
+        """Test non-HTML documents are left to the HTTP engine."""
+        response = http_response("", "", content_type="application/json")
+        self.assertIsNone(needs_browser(response))
+
+
+class TestEngineSelector(unittest.TestCase):
+    """Test per-domain decision memory."""
+
+    def test_decisions_expire(self):
+        """Test decisions older than the TTL are forgotten."""
+        selector = EngineSelector(ttl=0)
+        selector.remember("example.com", "browser")
+        with patch(
+            "app.services.engine_selection.time.monotonic",
+            return_value=float("inf"),
+        ):
+            self.assertIsNone(selector.get("example.com"))
+
+    def test_oldest_domain_evicted(self):
+        """Test the least recently decided domain is dropped first."""
+        selector = EngineSelector(max_domains=2)
+        for host in ("a.com", "b.com", "c.com"):
+            selector.remember(host, "http")
+        self.assertIsNone(selector.get("a.com"))
+        self.assertEqual(selector.get("c.com"), "http")
+
+
+class TestScrapeAuto(unittest.TestCase):
+    """Test ScraperService 'auto' mode."""
+
+    def setUp(self):
+        """Create a service with fresh engine decisions."""
+        engine_selector.clear()
+        self.addCleanup(engine_selector.clear)
+        self.service = ScraperService()
+        self.request = ScrapeRequest(
+            url=HttpUrl("https://spa.example.com/"),
+            browser_type="auto",
+            wait_time=0,
+            bypass_cache=True,
+        )
+        self.driver = MagicMock()
+        self.driver.execute_script.return_value = {
+            "title": "Rendered",
+            "current_url": "https://spa.example.com/",
+            "text": ARTICLE,
+        }
+
+    @contextlib.contextmanager
+    def lease(self, browser_type, _headless):
+        """Lease the fake driver, recording the browser type."""
+        self.leased = browser_type
+        yield self.driver
+
+    def test_escalation_is_remembered(self):
+        """Test a JS shell escalates once, then skips the HTTP attempt."""
+        shell = http_response('<div id="app"></div>', "")
+        with (
+            patch.object(
+                ScraperService, "_fetch_page", return_value=shell
+            ) as fetch,
+            patch.object(ScraperService, "_lease_browser", self.lease),
+        ):
+            first = self.service._scrape_page(self.request)
+            second = self.service._scrape_page(self.request)
+
+        fetch.assert_called_once()
+        self.assertEqual(self.leased, "chrome")
+        self.assertEqual(first.title, "Rendered")
+        self.assertEqual(first.metadata["engine"], "chrome")
+        self.assertEqual(
+            first.metadata["escalation_reason"], "javascript required marker"
+        )
+        self.assertEqual(second.metadata["escalation_reason"], "remembered")
+
+    def test_static_page_stays_on_http(self):
+        """Test a complete HTTP fetch is returned without its HTML."""
+        page = http_response(f"<p>{ARTICLE}</p>", ARTICLE)
+        with (
+            patch.object(ScraperService, "_fetch_page", return_value=page),
+            patch.object(ScraperService, "_lease_browser") as lease,
+        ):
+            response = self.service._scrape_page(self.request)
+
+        lease.assert_not_called()
+        self.assertEqual(response.metadata["engine"], "http")
+        self.assertIsNone(response.html)
+        self.assertEqual(engine_selector.get("spa.example.com"), "http")
+
+    def test_failed_fetch_not_remembered(self):
+        """Test an HTTP failure escalates without pinning the domain."""
+        with (
+            patch.object(
+                ScraperService,
+                "_fetch_page",
+                side_effect=ScrapingError("timed out"),
+            ),
+            patch.object(ScraperService, "_lease_browser", self.lease),
+        ):
+            response = self.service._scrape_page(self.request)
+
+        self.assertEqual(response.metadata["engine"], "chrome")
+        self.assertIsNone(engine_selector.get("spa.example.com"))
+
+    def test_error_status_handling(self):
+        """Test blocked statuses escalate and missing pages raise."""
+        with (
+            patch.object(
+                ScraperService,
+                "_fetch_page",
+                side_effect=HttpStatusError("HTTP fetch failed: 403", 403),
+            ),
+            patch.object(ScraperService, "_lease_browser", self.lease),
+        ):
+            response = self.service._scrape_page(self.request)
+        self.assertEqual(response.metadata["escalation_reason"], "status 403")
+        self.assertEqual(engine_selector.get("spa.example.com"), "browser")
+
+        engine_selector.clear()
+        with (
+            patch.object(
+                ScraperService,
+                "_fetch_page",
+                side_effect=HttpStatusError("HTTP fetch failed: 404", 404),
+            ),
+            self.assertRaises(HttpStatusError),
+        ):
+            self.service._scrape_page(self.request)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Tests for compiled and named extraction plans."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pydantic import HttpUrl
+
+from app.serializers.scraper import ScrapeRequest
+from app.services.cache import request_cache_key
+from app.services.extraction_plans import (
+    SCHEMA_ADAPTER,
+    ExtractionPlanCache,
+    ExtractionPlanRegistry,
+    compile_plan,
+    extraction_plans,
+)
+from app.services.scraper_service import ScraperService
+
+SELECTORS = SCHEMA_ADAPTER.validate_python(
+    {
+        "heading": {"selector": "h1"},
+        "tags": {"selector": ".tag", "multiple": True},
+    }
+)
+
+
+def make_request(**kwargs):
+    """Build a browser ScrapeRequest."""
+    kwargs.setdefault("browser_type", "chrome")
+    return ScrapeRequest(
+        url=HttpUrl("https://shop.example/"),
+        extract_text=False,
+        **kwargs,
+    )
+
+
+class TestExtractionPlanCache(unittest.TestCase):
+    """Test ExtractionPlanCache reuse and eviction."""
+
+    def test_equal_schemas_share_plan(self):
+        """Test a schema sent again reuses the compiled plan."""
+        cache = ExtractionPlanCache(max_entries=2)
+        first = cache.compile(SELECTORS)
+        again = cache.compile(
+            SCHEMA_ADAPTER.validate_json(SCHEMA_ADAPTER.dump_json(SELECTORS))
+        )
+        self.assertIs(first, again)
+        self.assertEqual(first.key, compile_plan(SELECTORS).key)
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest schema is dropped beyond max_entries."""
+        cache = ExtractionPlanCache(max_entries=1)
+        first = cache.compile(SELECTORS)
+        cache.compile({"title": SELECTORS["heading"]})
+        self.assertIsNot(cache.compile(SELECTORS), first)
+
+    def test_finalize_fills_missing_fields(self):
+        """Test every schema field is returned, missing ones empty."""
+        plan = compile_plan(SELECTORS)
+        self.assertEqual(
+            plan.finalize({"heading": "Shop"}),
+            {"heading": "Shop", "tags": []},
+        )
+        self.assertEqual(plan.finalize(None), {"heading": None, "tags": []})
+
+
+class TestExtractionPlanRegistry(unittest.TestCase):
+    """Test registering named plans."""
+
+    def test_register_get_delete(self):
+        """Test a plan is found by name until deleted."""
+        registry = ExtractionPlanRegistry()
+        registered = registry.register("shop", SELECTORS)
+
+        self.assertIs(registry.get("shop"), registered)
+        self.assertEqual(registered.to_response().name, "shop")
+        self.assertEqual(registry.names(), ["shop"])
+        self.assertTrue(registry.delete("shop"))
+        self.assertIsNone(registry.get("shop"))
+        self.assertFalse(registry.delete("shop"))
+
+    def test_plan_and_selectors_exclusive(self):
+        """Test a request names a plan or sends selectors, not both."""
+        with self.assertRaises(ValueError):
+            make_request(plan="shop", selectors=SELECTORS)
+        with self.assertRaises(ValueError):
+            make_request(plan="shop", browser_type="http")
+
+
+class TestScrapeWithPlan(unittest.TestCase):
+    """Test ScraperService extraction with named plans."""
+
+    def setUp(self):
+        """Register a plan on the shared registry."""
+        self.service = ScraperService()
+        extraction_plans.register("shop", SELECTORS)
+        self.addCleanup(extraction_plans.delete, "shop")
+
+    def test_named_plan_extracted(self):
+        """Test the named plan's schema reaches the script."""
+        driver = MagicMock()
+        driver.execute_script.return_value = {"data": {"heading": "Shop"}}
+
+        data = self.service._extract_data(driver, make_request(plan="shop"))
+
+        options = driver.execute_script.call_args.args[1]
+        self.assertEqual(options["selectors"]["tags"]["multiple"], True)
+        self.assertEqual(data["data"], {"heading": "Shop", "tags": []})
+
+    def test_unknown_plan(self):
+        """Test an unregistered plan fails before leasing a browser."""
+        with (
+            patch.object(self.service, "_scrape_with_browser") as browser,
+            self.assertRaisesRegex(ValueError, "Unknown extraction plan"),
+        ):
+            self.service._scrape_page(make_request(plan="missing"))
+        browser.assert_not_called()
+
+    def test_cache_key_follows_plan(self):
+        """Test redefining a plan changes the cache key of its requests."""
+        request = make_request(plan="shop")
+        before = request_cache_key(request)
+        extraction_plans.register("shop", {"title": SELECTORS["heading"]})
+        self.assertNotEqual(request_cache_key(request), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
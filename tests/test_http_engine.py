@@ -0,0 +1,205 @@
+"""Tests for the HTTP fetch engine."""
+
+import http.server
+import socket
+import threading
+import unittest
+from unittest.mock import patch
+
+from pydantic import HttpUrl
+
+from app.core.errors import HttpConnectionError, HttpStatusError
+from app.serializers.scraper import ScrapeRequest
+from app.services.http_engine import HttpEngine, PageParser
+from app.services.scraper_service import ScraperService
+
+PAGE = b"""<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <title> Example  Page </title>
+  <meta name="description" content="demo">
+  <script>var hidden = "script text";</script>
+  <style>body { color: red; }</style>
+</head>
+<body>
+  <h1>Caf\xc3\xa9</h1>
+  <p>First <b>paragraph</b>.</p>
+  <noscript>Enable JavaScript</noscript>
+  <a href="/about">About</a>
+  <a href="https://other.example/">Other</a>
+  <img src="logo.png">
+</body>
+</html>
+"""
+
+
+class PageHandler(http.server.BaseHTTPRequestHandler):
+    """Serve PAGE for every path but /missing."""
+
+    def do_GET(self):
+        """Send the test page without a charset header."""
+        self.send_response(404 if self.path == "/missing" else 200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *_args):
+        """Keep test output quiet."""
+
+
+class TestPageParser(unittest.TestCase):
+    """Test PageParser extraction."""
+
+    def setUp(self):
+        """Parse the test page."""
+        self.parser = PageParser("https://example.com/docs/")
+        self.parser.feed(PAGE.decode())
+        self.parser.close()
+
+    def test_title_and_meta(self):
+        """Test the title is collapsed and meta tags are collected."""
+        self.assertEqual(self.parser.title, "Example Page")
+        self.assertEqual(self.parser.meta, {"description": "demo"})
+
+    def test_visible_text_only(self):
+        """Test scripts, styles and noscript are left out of the text."""
+        self.assertEqual(
+            self.parser.text, "Café\nFirst paragraph.\nAbout Other"
+        )
+
+    def test_urls_resolved(self):
+        """Test links and images are made absolute."""
+        self.assertEqual(
+            self.parser.links,
+            ["https://example.com/about", "https://other.example/"],
+        )
+        self.assertEqual(
+            self.parser.images, ["https://example.com/docs/logo.png"]
+        )
+
+
+class TestHttpEngine(unittest.TestCase):
+    """Test HttpEngine against a local server."""
+
+    def setUp(self):
+        """Start a local HTTP server."""
+        self.server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), PageHandler
+        )
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/page"
+        self.engine = HttpEngine(timeout=5)
+        self.addCleanup(self.engine.close)
+
+    def test_fetch_builds_scrape_response(self):
+        """Test a fetch produces the browser response shape."""
+        request = ScrapeRequest(
+            url=HttpUrl(self.url),
+            browser_type="http",
+            extract_links=True,
+            extract_images=True,
+        )
+        response = self.engine.fetch(request)
+
+        self.assertEqual(response.title, "Example Page")
+        self.assertIn("Café", response.text or "")
+        self.assertIsNone(response.html)
+        self.assertEqual(len(response.links), 2)
+        self.assertEqual(response.metadata["status_code"], 200)
+        self.assertEqual(response.metadata["extraction"], "http")
+
+    def test_error_status_raises(self):
+        """Test error responses fail instead of passing as pages."""
+        request = ScrapeRequest(
+            url=HttpUrl(self.url.replace("/page", "/missing")),
+            browser_type="http",
+        )
+        with self.assertRaises(HttpStatusError) as caught:
+            self.engine.fetch(request)
+        self.assertEqual(caught.exception.status_code, 404)
+
+    def test_refused_connection_raises(self):
+        """Test unreachable servers are told apart from other failures."""
+        with socket.socket() as closed:
+            closed.bind(("127.0.0.1", 0))
+            port = closed.getsockname()[1]
+        request = ScrapeRequest(
+            url=HttpUrl(f"http://127.0.0.1:{port}/"), browser_type="http"
+        )
+        with self.assertRaises(HttpConnectionError):
+            self.engine.fetch(request)
+
+    def test_sessions_are_reused(self):
+        """Test requests share one keep-alive session."""
+        request = ScrapeRequest(url=HttpUrl(self.url), browser_type="http")
+        self.engine.fetch(request)
+        self.engine.fetch(request)
+        self.assertEqual(len(self.engine._sessions), 1)
+
+    def test_socks_support_required_for_tor(self):
+        """Test fetching over Tor without PySocks is a config error."""
+        request = ScrapeRequest(url=HttpUrl(self.url), browser_type="http")
+        with (
+            patch(
+                "app.services.http_engine.importlib.util.find_spec",
+                return_value=None,
+            ),
+            self.assertRaises(ValueError),
+        ):
+            self.engine.fetch(request, socks_port=9050)
+
+
+class TestScrapeWithHttpEngine(unittest.TestCase):
+    """Test ScraperService routes 'http' scrapes to the engine."""
+
+    def test_http_scrape_skips_browser(self):
+        """Test no browser is leased for the HTTP engine."""
+        request = ScrapeRequest(
+            url=HttpUrl("https://example.com"),
+            browser_type="http",
+            bypass_cache=True,
+        )
+        with (
+            patch("app.services.scraper_service.http_engine") as engine,
+            patch.object(ScraperService, "_lease_browser") as lease,
+        ):
+            ScraperService()._scrape_page(request)
+
+        engine.fetch.assert_called_once_with(request, headers=None)
+        lease.assert_not_called()
+
+    def test_tor_checked_only_after_connection_error(self):
+        """Test tor is restarted and the fetch retried when it is down."""
+        request = ScrapeRequest(
+            url=HttpUrl("https://example.com"),
+            browser_type="http",
+            http_via_tor=True,
+            bypass_cache=True,
+        )
+        service = ScraperService()
+        with (
+            patch("app.services.scraper_service.http_engine") as engine,
+            patch("app.services.scraper_service.shared_tor") as tor,
+            patch("app.services.scraper_service.tor_circuits"),
+        ):
+            service._scrape_page(request)
+            tor.is_healthy.assert_not_called()
+            tor.ensure_running.assert_not_called()
+
+            tor.is_healthy.return_value = False
+            engine.fetch.side_effect = [
+                HttpConnectionError("refused"),
+                engine.fetch.return_value,
+            ]
+            service._scrape_page(request)
+
+        tor.ensure_running.assert_called_once()
+        self.assertEqual(engine.fetch.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
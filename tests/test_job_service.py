@@ -0,0 +1,108 @@
+"""Tests for the scrape job queue."""
+
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from pydantic import HttpUrl
+
+from app.core.errors import JobQueueFullError
+from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.services.job_service import ScrapeJobQueue
+
+
+class TestScrapeJobQueue(unittest.TestCase):
+    """Test ScrapeJobQueue."""
+
+    def setUp(self):
+        """Create a request for queued jobs."""
+        self.request = ScrapeRequest(url=HttpUrl("https://example.com"))
+
+    def wait_for(self, jobs, job_id):
+        """Drain the queue and return the finished job."""
+        jobs._queue.join()
+        return jobs.get(job_id)
+
+    def test_job_succeeds(self):
+        """Test a queued job runs in the background and stores its result."""
+        runner = MagicMock(
+            return_value=ScrapeResponse(url="https://example.com/")
+        )
+        jobs = ScrapeJobQueue(runner=runner, workers=1)
+
+        job = jobs.submit(self.request)
+        self.assertIn(job.status, ("queued", "running", "succeeded"))
+
+        finished = self.wait_for(jobs, job.id)
+        self.assertEqual(finished.status, "succeeded")
+        self.assertEqual(finished.result.url, "https://example.com/")
+        self.assertIsNotNone(finished.finished_at)
+        runner.assert_called_once_with(self.request)
+
+    def test_job_failure_recorded(self):
+        """Test a failing scrape marks the job failed with the error."""
+        runner = MagicMock(side_effect=ValueError("bad config"))
+        jobs = ScrapeJobQueue(runner=runner, workers=1)
+
+        job = jobs.submit(self.request)
+
+        finished = self.wait_for(jobs, job.id)
+        self.assertEqual(finished.status, "failed")
+        self.assertIn("bad config", finished.error)
+        self.assertEqual(finished.to_response().status, "failed")
+
+    def test_queue_full(self):
+        """Test submissions beyond capacity are rejected."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def runner(_request):
+            started.set()
+            release.wait()
+
+        jobs = ScrapeJobQueue(runner=runner, workers=1, max_size=1)
+        try:
+            jobs.submit(self.request)
+            started.wait(timeout=5)
+            jobs.submit(self.request)
+            with self.assertRaises(JobQueueFullError):
+                jobs.submit(self.request)
+        finally:
+            release.set()
+
+    def test_unknown_job(self):
+        """Test unknown job ids return None."""
+        jobs = ScrapeJobQueue(runner=MagicMock())
+        self.assertIsNone(jobs.get("missing"))
+
+    def test_store_answers_other_workers(self):
+        """Test job state is stored and read back from the store."""
+        runner = MagicMock(
+            return_value=ScrapeResponse(url="https://example.com/")
+        )
+        store = MagicMock()
+        jobs = ScrapeJobQueue(runner=runner, workers=1, store=store)
+        job = jobs.submit(self.request)
+        self.wait_for(jobs, job.id)
+
+        self.assertEqual(
+            [call.args[0].id for call in store.set.call_args_list],
+            [job.id] * 3,
+        )
+        self.assertEqual(job.status, "succeeded")
+
+        store.get.return_value = job
+        self.assertIs(jobs.get("other-worker-job"), job)
+        store.get.assert_called_once_with("other-worker-job")
+
+    def test_expired_results_purged(self):
+        """Test finished jobs past the TTL are dropped."""
+        runner = MagicMock(
+            return_value=ScrapeResponse(url="https://example.com/")
+        )
+        jobs = ScrapeJobQueue(runner=runner, workers=1, result_ttl=0)
+        job = jobs.submit(self.request)
+        self.wait_for(jobs, job.id)
+
+        jobs.submit(self.request)
+        self.assertIsNone(jobs.get(job.id))
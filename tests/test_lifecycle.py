@@ -0,0 +1,120 @@
+"""Tests for memory-aware browser lifecycle management."""
+
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.core.browsers.abc import Browser
+from app.core.browsers.lifecycle import DriverLifecycle, process_tree_rss
+from app.core.browsers.pool import BrowserPool
+
+MIB = 1024 * 1024
+
+
+class SharedBrowser(Browser):
+    """Browser reusing one mock driver per lifecycle."""
+
+    def _set_executable(self) -> None:
+        """Set mock executable."""
+        self.executable = "/mock/browser"
+
+    def _set_options(self) -> None:
+        """Set mock options."""
+        self.options = MagicMock()
+
+    def get_instance(self):
+        """Get the shared mock driver."""
+        return self._shared_instance(MagicMock)
+
+
+def driver_with_pid(pid=1234):
+    """Mock driver whose WebDriver service runs as pid."""
+    driver = MagicMock()
+    driver.service.process.pid = pid
+    return driver
+
+
+@unittest.skipUnless(os.path.isdir("/proc"), "requires /proc")
+class TestProcessTreeRss(unittest.TestCase):
+    """Test RSS measurement from /proc."""
+
+    def test_includes_children(self):
+        """Test a child process adds to its parent's tree RSS."""
+        own = process_tree_rss(os.getpid())
+        child = subprocess.Popen(
+            [sys.executable, "-c", "import sys; sys.stdin.read()"],
+            stdin=subprocess.PIPE,
+        )
+        self.addCleanup(child.communicate, timeout=10)
+        self.assertGreater(own, 0)
+        self.assertGreater(process_tree_rss(os.getpid()), own)
+
+    def test_missing_process(self):
+        """Test a process that is gone has no memory."""
+        self.assertEqual(process_tree_rss(2**22 + 1), 0)
+
+
+class TestDriverLifecycle(unittest.TestCase):
+    """Test recycling decisions."""
+
+    def test_page_limit(self):
+        """Test drivers are recycled after max_pages pages."""
+        lifecycle = DriverLifecycle(max_pages=2)
+        driver = driver_with_pid()
+        lifecycle.track(driver)
+        lifecycle.record_page(driver)
+        self.assertIsNone(lifecycle.recycle_reason(driver))
+        lifecycle.record_page(driver)
+        self.assertEqual(lifecycle.recycle_reason(driver), "pages")
+
+    def test_age_limit(self):
+        """Test drivers are recycled after max_age seconds."""
+        lifecycle = DriverLifecycle(max_age=60)
+        driver = driver_with_pid()
+        lifecycle.track(driver).created_at -= 61
+        self.assertEqual(lifecycle.recycle_reason(driver), "age")
+
+    @patch("app.core.browsers.lifecycle.process_tree_rss")
+    def test_rss_sampled_at_interval(self, tree_rss):
+        """Test RSS is sampled at most once per interval."""
+        tree_rss.return_value = 600 * MIB
+        lifecycle = DriverLifecycle(max_rss_mb=512, rss_interval=60)
+        driver = driver_with_pid(4321)
+
+        self.assertEqual(lifecycle.recycle_reason(driver), "rss")
+        self.assertEqual(lifecycle.recycle_reason(driver), "rss")
+        tree_rss.assert_called_once_with(4321)
+
+    def test_pool_recycles_large_driver(self):
+        """Test the pool quits drivers over the RSS limit on return."""
+        lifecycle = DriverLifecycle(max_rss_mb=512)
+        pool = BrowserPool(
+            MagicMock(side_effect=driver_with_pid), lifecycle=lifecycle
+        )
+        with (
+            patch(
+                "app.core.browsers.lifecycle.process_tree_rss",
+                return_value=1024 * MIB,
+            ),
+            pool.lease() as driver,
+        ):
+            pass
+
+        driver.quit.assert_called_once()
+        self.assertEqual(pool.size, 0)
+
+    def test_shared_instance_recycled(self):
+        """Test the single-instance path replaces a worn out driver."""
+        browser = SharedBrowser(lifecycle=DriverLifecycle(max_pages=2))
+        first = browser.get_instance()
+        self.assertIs(browser.get_instance(), first)
+
+        replacement = browser.get_instance()
+        self.assertIsNot(replacement, first)
+        first.quit.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Tests for scrape metrics."""
+
+import contextlib
+import unittest
+from unittest.mock import patch
+
+from pydantic import HttpUrl
+
+from app.core.metrics import (
+    MetricsRegistry,
+    StageTimings,
+    instrument_driver,
+    scrape_stage_seconds,
+)
+from app.serializers.scraper import ScrapeRequest
+from app.services.scraper_service import ScraperService
+
+
+class CommandDriver:
+    """Driver whose methods go through execute like Selenium's."""
+
+    def __init__(self):
+        """Answer extraction with a small payload."""
+        self.payload = {"title": "Example", "current_url": "https://e.x/"}
+
+    def execute(self, command, _params=None):
+        """Return a WebDriver style response."""
+        if command == "executeScript":
+            return {"value": self.payload}
+        return {"value": None}
+
+    def get(self, url):
+        """Navigate."""
+        self.execute("get", {"url": url})
+
+    def execute_script(self, script, *args):
+        """Run a script."""
+        params = {"script": script, "args": list(args)}
+        return self.execute("executeScript", params)["value"]
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test metric rendering."""
+
+    def setUp(self):
+        """Create an empty registry."""
+        self.registry = MetricsRegistry()
+
+    def test_histogram_text_format(self):
+        """Test cumulative buckets, sum and count are rendered."""
+        histogram = self.registry.histogram(
+            "stage_seconds", "Stage time.", ("stage",), buckets=(0.1, 1)
+        )
+        histogram.observe(0.05, stage="wait")
+        histogram.observe(0.5, stage="wait")
+        histogram.observe(2, stage="wait")
+
+        text = self.registry.render()
+
+        self.assertIn("# TYPE stage_seconds histogram", text)
+        self.assertIn('stage_seconds_bucket{stage="wait",le="0.1"} 1', text)
+        self.assertIn('stage_seconds_bucket{stage="wait",le="1"} 2', text)
+        self.assertIn('stage_seconds_bucket{stage="wait",le="+Inf"} 3', text)
+        self.assertIn('stage_seconds_sum{stage="wait"} 2.55', text)
+        self.assertIn('stage_seconds_count{stage="wait"} 3', text)
+
+    def test_counter_labels_escaped(self):
+        """Test label values are escaped."""
+        counter = self.registry.counter("hits_total", "Hits.", ("path",))
+        counter.inc(path='a"b')
+        counter.inc(2, path='a"b')
+        self.assertIn('hits_total{path="a\\"b"} 3', self.registry.render())
+
+    def test_label_mismatch_rejected(self):
+        """Test observations must carry exactly the declared labels."""
+        counter = self.registry.counter("hits_total", "Hits.", ("path",))
+        with self.assertRaises(ValueError):
+            counter.inc(route="/")
+
+    def test_duplicate_name_rejected(self):
+        """Test metric names are unique."""
+        self.registry.counter("hits_total", "Hits.")
+        with self.assertRaises(ValueError):
+            self.registry.counter("hits_total", "Hits.")
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test stage timings and WebDriver command counting."""
+
+    def test_stage_timings(self):
+        """Test stages accumulate and the total is reported."""
+        timings = StageTimings()
+        with timings.stage("wait"):
+            pass
+        milliseconds = timings.as_milliseconds()
+        self.assertEqual(set(milliseconds), {"wait", "total"})
+        self.assertGreaterEqual(milliseconds["total"], milliseconds["wait"])
+
+    def test_commands_counted_per_scrape(self):
+        """Test instrumenting again resets the counts for a new scrape."""
+        driver = CommandDriver()
+        stats = instrument_driver(driver)
+        driver.execute_script("return 1")
+        self.assertEqual(stats.commands["executeScript"], 1)
+        self.assertGreater(stats.bytes, 0)
+
+        self.assertIs(instrument_driver(driver), stats)
+        self.assertEqual(sum(stats.commands.values()), 0)
+
+    def test_scrape_metadata_breakdown(self):
+        """Test a browser scrape reports stage timings and commands."""
+        driver = CommandDriver()
+
+        @contextlib.contextmanager
+        def lease(*_args):
+            yield driver
+
+        request = ScrapeRequest(
+            url=HttpUrl("https://example.com"),
+            browser_type="chrome",
+            wait_time=0,
+            bypass_cache=True,
+        )
+        before = scrape_stage_seconds.count(
+            browser_type="chrome", stage="navigate"
+        )
+        with patch.object(ScraperService, "_lease_browser", side_effect=lease):
+            response = ScraperService()._scrape_page(request)
+
+        metadata = response.metadata
+        self.assertEqual(
+            set(metadata["timings_ms"]),
+            {"lease", "navigate", "wait", "extract", "release", "total"},
+        )
+        self.assertEqual(metadata["webdriver_commands"], 2)
+        self.assertEqual(
+            scrape_stage_seconds.count(
+                browser_type="chrome", stage="navigate"
+            ),
+            before + 1,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+"""Tests for the content-addressed page store."""
+
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from app.serializers.scraper import ScrapeResponse
+from app.services.page_store import (
+    PageStore,
+    compress,
+    content_hash,
+    decompress,
+)
+
+PAGE = "<html><body>" + "<p>mirror</p>" * 500 + "</body></html>"
+
+
+def make_response(url="http://mirror1.onion/", html=PAGE, text="mirror"):
+    """Build a ScrapeResponse for page store tests."""
+    return ScrapeResponse(url=url, title="Mirror", html=html, text=text)
+
+
+class TestCompression(unittest.TestCase):
+    """Test page compression codecs."""
+
+    def test_gzip_round_trip(self):
+        """Test gzip content shrinks and restores exactly."""
+        codec, blob = compress(PAGE, "gzip")
+        self.assertEqual(codec, "gzip")
+        self.assertLess(len(blob), len(PAGE) // 10)
+        self.assertEqual(decompress(codec, blob), PAGE)
+
+    def test_incompressible_content_kept_raw(self):
+        """Test content that would grow is stored as is."""
+        codec, blob = compress("ok", "gzip")
+        self.assertEqual((codec, blob), ("identity", b"ok"))
+        self.assertEqual(decompress(codec, blob), "ok")
+
+    def test_unknown_codec(self):
+        """Test blobs of an unknown codec are refused."""
+        with self.assertRaises(ValueError):
+            decompress("brotli", b"")
+
+
+class TestPageStore(unittest.TestCase):
+    """Test PageStore deduplication and batching."""
+
+    def setUp(self):
+        """Create a store over an in-memory database."""
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        self.addCleanup(self.engine.dispose)
+        self.statements: list[str] = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda *args: self.statements.append(args[2]),
+        )
+        self.store = PageStore(
+            bind=self.engine, codec="gzip", batch_size=3, flush_interval=0
+        )
+
+    def inserts(self):
+        """Count INSERT statements sent to the database."""
+        return sum(
+            statement.startswith("INSERT") for statement in self.statements
+        )
+
+    def test_mirrors_share_content(self):
+        """Test identical pages under different URLs are stored once."""
+        for mirror in range(3):
+            self.store.add(make_response(f"http://mirror{mirror}.onion/"))
+        self.store.add(make_response("http://mirror0.onion/"), fetched_at=1)
+        self.store.flush()
+
+        stats = self.store.stats()
+        self.assertEqual(stats["fetches"], 4)
+        self.assertEqual(stats["contents"], 2)
+        self.assertEqual(stats["fetched_bytes"], 4 * (len(PAGE) + 6))
+        self.assertLess(stats["stored_bytes"] * 10, stats["fetched_bytes"])
+
+    def test_buffer_flushes_in_bulk(self):
+        """Test a full buffer is written with one insert per table."""
+        self.store.add(make_response("http://a.onion/"))
+        self.store.add(make_response("http://b.onion/"))
+        self.assertEqual(self.inserts(), 0)
+
+        self.store.add(make_response("http://c.onion/"))
+        self.assertEqual(self.inserts(), 2)
+        self.assertEqual(self.store.stats()["pending"], 0)
+
+    def test_known_content_skips_lookup(self):
+        """Test content written before is not looked up or compressed."""
+        self.store.add(make_response())
+        self.store.flush()
+        self.statements.clear()
+
+        with patch("app.services.page_store.compress") as compress_mock:
+            self.store.add(make_response("http://other.onion/"))
+            self.store.flush()
+        compress_mock.assert_not_called()
+        self.assertEqual(len(self.statements), 1)
+
+    def test_latest_restores_content(self):
+        """Test the newest fetch of a URL is returned decompressed."""
+        self.store.add(make_response(html="<p>old</p>"), fetched_at=1)
+        self.store.add(make_response(), fetched_at=2)
+        self.store.flush()
+
+        page = self.store.latest("HTTP://MIRROR1.onion")
+        if page is None:
+            self.fail("latest fetch not found")
+        self.assertEqual(page.html, PAGE)
+        self.assertEqual(page.text, "mirror")
+        self.assertEqual(page.html_hash, content_hash(PAGE))
+        self.assertEqual(len(self.store.history("http://mirror1.onion/")), 2)
+        self.assertIsNone(self.store.latest("http://unknown.onion/"))
+
+    def test_returns_content_hash(self):
+        """Test add returns the HTML hash, or the text hash without HTML."""
+        self.assertEqual(self.store.add(make_response()), content_hash(PAGE))
+        self.assertEqual(
+            self.store.add(make_response(html=None)), content_hash("mirror")
+        )
+        self.assertIsNone(self.store.add(make_response(html=None, text=None)))
+
+    def test_failed_write_kept_for_retry(self):
+        """Test failed writes are retried, up to a bound on their size."""
+        self.store.max_pending_bytes = 2 * len(f"{PAGE}mirror".encode())
+        self.store.add(make_response("http://a.onion/"))
+        self.store.add(make_response("http://b.onion/"))
+        error = OperationalError("INSERT", {}, Exception("locked"))
+        with patch.object(self.store, "_write", side_effect=error):
+            self.store.add(make_response("http://c.onion/"))
+        self.assertEqual(self.store.stats()["pending"], 2)
+
+        self.assertEqual(self.store.flush(), 2)
+        self.assertIsNone(self.store.latest("http://a.onion/"))
+        self.assertIsNotNone(self.store.latest("http://b.onion/"))
+        self.assertIsNotNone(self.store.latest("http://c.onion/"))
+
+    def test_background_flush(self):
+        """Test close writes what the background flusher has not."""
+        store = PageStore(bind=self.engine, batch_size=100, flush_interval=60)
+        store.add(make_response())
+        self.assertIsNotNone(store._flusher)
+
+        store.close()
+        self.assertIsNone(store._flusher)
+        self.assertEqual(store.stats()["fetches"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
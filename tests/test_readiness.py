@@ -0,0 +1,80 @@
+"""Tests for page readiness strategies."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from pydantic import HttpUrl
+
+from app.serializers.scraper import ScrapeRequest
+from app.services.readiness import (
+    DomQuietStrategy,
+    NetworkIdleStrategy,
+    ReadyStateStrategy,
+    SelectorStrategy,
+    get_readiness_strategy,
+)
+
+
+def make_request(**kwargs):
+    """Build a ScrapeRequest for readiness tests."""
+    return ScrapeRequest(url=HttpUrl("https://example.com"), **kwargs)
+
+
+class TestReadinessStrategies(unittest.TestCase):
+    """Test readiness strategy conditions."""
+
+    def test_get_strategy_by_name(self):
+        """Test the request selects the strategy class."""
+        strategy = get_readiness_strategy(
+            make_request(wait_strategy="dom_quiet")
+        )
+        self.assertIsInstance(strategy, DomQuietStrategy)
+        self.assertIsInstance(
+            get_readiness_strategy(make_request()), ReadyStateStrategy
+        )
+
+    def test_ready_state_returns_immediately(self):
+        """Test a complete page does not wait for the full timeout."""
+        driver = MagicMock()
+        driver.execute_script.return_value = "complete"
+        strategy = ReadyStateStrategy(make_request())
+        self.assertTrue(strategy.wait(driver, timeout=30))
+        driver.execute_script.assert_called_once()
+
+    def test_timeout_returns_false(self):
+        """Test a page that never becomes ready reports False."""
+        driver = MagicMock()
+        driver.execute_script.return_value = "loading"
+        strategy = ReadyStateStrategy(make_request())
+        strategy.poll_interval = 0.01
+        self.assertFalse(strategy.wait(driver, timeout=0.05))
+
+    def test_network_idle_requires_quiet_period(self):
+        """Test network idle waits for pending requests and quiet time."""
+        driver = MagicMock()
+        strategy = NetworkIdleStrategy(make_request(idle_time_ms=500))
+        driver.execute_script.return_value = ["complete", 0, 200]
+        self.assertFalse(strategy.is_ready(driver))
+        driver.execute_script.return_value = ["complete", 1, 600]
+        self.assertFalse(strategy.is_ready(driver))
+        driver.execute_script.return_value = ["complete", 0, 600]
+        self.assertTrue(strategy.is_ready(driver))
+
+    def test_dom_quiet(self):
+        """Test DOM quiescence compares the quiet period."""
+        driver = MagicMock()
+        strategy = DomQuietStrategy(make_request(idle_time_ms=200))
+        driver.execute_script.return_value = ["complete", 50]
+        self.assertFalse(strategy.is_ready(driver))
+        driver.execute_script.return_value = ["complete", 250]
+        self.assertTrue(strategy.is_ready(driver))
+
+    def test_selector(self):
+        """Test selector strategy passes the selector to the page."""
+        driver = MagicMock()
+        driver.execute_script.return_value = True
+        strategy = SelectorStrategy(
+            make_request(wait_strategy="selector", wait_selector="#main")
+        )
+        self.assertTrue(strategy.is_ready(driver))
+        self.assertEqual(driver.execute_script.call_args.args[1], "#main")
@@ -0,0 +1,132 @@
+"""Tests for resource blocking."""
+
+import contextlib
+import unittest
+from unittest.mock import MagicMock
+
+from pydantic import HttpUrl
+
+from app.core.browsers.resources import (
+    ResourceBlocking,
+    apply_resource_blocking,
+    release_resource_blocking,
+)
+from app.serializers.scraper import ResourcePolicy, ScrapeRequest
+from app.services.scraper_service import ScraperService
+
+
+class FakeFirefoxDriver:
+    """Record chrome-context scripts like a Firefox driver."""
+
+    CONTEXT_CHROME = "chrome"
+
+    def __init__(self, tab_browser=None):
+        """Start without any context switches."""
+        self.tab_browser = tab_browser if tab_browser is not None else self
+        self.contexts = []
+        self.scripts = []
+
+    @contextlib.contextmanager
+    def context(self, name):
+        """Enter a Marionette context."""
+        self.contexts.append(name)
+        yield
+
+    def execute_script(self, _script, *args):
+        """Record the script arguments."""
+        self.scripts.append(args)
+
+
+class TestResourceBlocking(unittest.TestCase):
+    """Test applying resource policies to drivers."""
+
+    def test_chrome_url_patterns(self):
+        """Test Chrome blocks by extension and domain patterns."""
+        driver = MagicMock()
+        blocking = ResourceBlocking(
+            kinds=frozenset({"fonts"}), domains=("tracker.test",)
+        )
+
+        self.assertTrue(apply_resource_blocking(driver, blocking))
+
+        driver.execute_cdp_cmd.assert_any_call("Network.enable", {})
+        urls = driver.execute_cdp_cmd.call_args.args[1]["urls"]
+        self.assertIn("*.woff2", urls)
+        self.assertIn("*.woff2?*", urls)
+        self.assertIn("*://*.tracker.test/*", urls)
+        self.assertNotIn("*.png", urls)
+
+    def test_unchanged_policy_not_resent(self):
+        """Test a pooled driver keeps its policy without extra commands."""
+        driver = MagicMock()
+        blocking = ResourceBlocking(kinds=frozenset({"images"}))
+        apply_resource_blocking(driver, blocking)
+        driver.reset_mock()
+
+        apply_resource_blocking(driver, blocking)
+        driver.execute_cdp_cmd.assert_not_called()
+
+        apply_resource_blocking(driver, ResourceBlocking())
+        driver.execute_cdp_cmd.assert_called_once_with(
+            "Network.setBlockedURLs", {"urls": []}
+        )
+
+    def test_empty_policy_on_fresh_driver_is_free(self):
+        """Test drivers that never blocked anything get no commands."""
+        driver = MagicMock()
+        self.assertFalse(apply_resource_blocking(driver, ResourceBlocking()))
+        driver.execute_cdp_cmd.assert_not_called()
+
+    def test_firefox_content_types(self):
+        """Test Firefox drivers get a chrome-context request observer."""
+        driver = FakeFirefoxDriver()
+        blocking = ResourceBlocking(kinds=frozenset({"images", "media"}))
+
+        self.assertTrue(apply_resource_blocking(driver, blocking))
+
+        self.assertEqual(driver.contexts, ["chrome"])
+        (policy,) = driver.scripts[0]
+        self.assertEqual(
+            policy["types"], ["TYPE_IMAGE", "TYPE_IMAGESET", "TYPE_MEDIA"]
+        )
+
+    def test_firefox_tabs_share_browser_policy(self):
+        """Test tabs wait for other tabs of the browser to drop theirs."""
+        browser = FakeFirefoxDriver()
+        first = FakeFirefoxDriver(tab_browser=browser)
+        second = FakeFirefoxDriver(tab_browser=browser)
+        blocking = ResourceBlocking(kinds=frozenset({"images"}))
+
+        self.assertTrue(apply_resource_blocking(first, blocking))
+        self.assertFalse(
+            apply_resource_blocking(second, ResourceBlocking(), timeout=0)
+        )
+        self.assertEqual(len(second.scripts), 0)
+
+        release_resource_blocking(first)
+        self.assertFalse(apply_resource_blocking(second, ResourceBlocking()))
+        (policy,) = second.scripts[0]
+        self.assertEqual(policy["types"], [])
+
+
+class TestResourcePolicy(unittest.TestCase):
+    """Test request resource policies."""
+
+    def test_domains_normalized(self):
+        """Test wildcard prefixes and case are dropped."""
+        policy = ResourcePolicy(block_domains=["*.Ads.Example", " ", "x.io"])
+        self.assertEqual(policy.block_domains, ["ads.example", "x.io"])
+
+    def test_trackers_expand_to_domains(self):
+        """Test block_trackers adds the built-in tracker list."""
+        request = ScrapeRequest(
+            url=HttpUrl("https://example.com"),
+            resources=ResourcePolicy(block_images=True, block_trackers=True),
+        )
+        blocking = ScraperService()._resource_blocking(request)
+        self.assertEqual(blocking.kinds, frozenset({"images"}))
+        self.assertIn("doubleclick.net", blocking.domains)
+
+
+if __name__ == "__main__":
+    unittest.main()
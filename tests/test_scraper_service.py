@@ -0,0 +1,308 @@
+"""Tests for the scraper service."""
+
+import contextlib
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pydantic import HttpUrl
+from selenium.common.exceptions import JavascriptException
+
+from app.core.errors import ScrapingError
+from app.serializers.scraper import (
+    ScrapeBatchRequest,
+    ScrapeRequest,
+    ScrapeResponse,
+)
+from app.services.cache import result_cache
+from app.services.scraper_service import ScraperService
+
+
+class TestExtractData(unittest.TestCase):
+    """Test ScraperService._extract_data."""
+
+    def setUp(self):
+        """Create a service and a request extracting links."""
+        self.service = ScraperService()
+        self.request = ScrapeRequest(
+            url=HttpUrl("https://example.com"), extract_links=True
+        )
+
+    def test_single_script_call(self):
+        """Test all fields are gathered with one execute_script call."""
+        driver = MagicMock()
+        driver.execute_script.return_value = {
+            "title": "Example",
+            "current_url": "https://example.com/",
+            "text": "Hello",
+            "links": ["https://example.com/a"],
+            "meta": {"description": "demo"},
+        }
+
+        data = self.service._extract_data(driver, self.request)
+
+        driver.execute_script.assert_called_once()
+        driver.find_elements.assert_not_called()
+        self.assertEqual(data["title"], "Example")
+        self.assertEqual(data["text"], "Hello")
+        self.assertEqual(data["links"], ["https://example.com/a"])
+        self.assertEqual(data["images"], [])
+        self.assertEqual(data["metadata"]["extraction"], "script")
+        self.assertEqual(data["metadata"]["page_meta"]["description"], "demo")
+
+    def test_fallback_to_commands(self):
+        """Test per-element commands are used when the script fails."""
+        driver = MagicMock()
+        driver.execute_script.side_effect = JavascriptException("blocked")
+        driver.title = "Example"
+        driver.current_url = "https://example.com/"
+        link = MagicMock()
+        link.get_attribute.return_value = "https://example.com/a"
+        driver.find_elements.return_value = [link]
+
+        data = self.service._extract_data(driver, self.request)
+
+        link.get_attribute.assert_called_once_with("href")
+        self.assertEqual(data["links"], ["https://example.com/a"])
+        self.assertEqual(data["metadata"]["extraction"], "commands")
+
+
+class TestScrapeBatch(unittest.TestCase):
+    """Test ScraperService.scrape_batch."""
+
+    def setUp(self):
+        """Create a service and a two-URL batch."""
+        self.service = ScraperService()
+        self.batch = ScrapeBatchRequest(
+            urls=[
+                HttpUrl("https://example.com/ok"),
+                HttpUrl("https://example.com/broken"),
+            ],
+            concurrency=2,
+        )
+
+    def fake_scrape(self, request):
+        """Succeed for every URL except the broken one."""
+        if request.url.path == "/broken":
+            raise ScrapingError("boom")
+        return ScrapeResponse(url=str(request.url), title="ok")
+
+    def test_partial_failures_reported_per_url(self):
+        """Test a failing URL does not fail the whole batch."""
+        with patch.object(
+            ScraperService, "scrape", side_effect=self.fake_scrape
+        ):
+            response = self.service.scrape_batch(self.batch)
+
+        self.assertEqual(response.succeeded, 1)
+        self.assertEqual(response.failed, 1)
+        ok, broken = response.results
+        self.assertTrue(ok.success)
+        self.assertEqual(ok.result.title if ok.result else None, "ok")
+        self.assertFalse(broken.success)
+        self.assertIn("boom", broken.error or "")
+
+    def test_concurrency_capped_by_settings(self):
+        """Test batch concurrency respects service limits."""
+        self.batch.concurrency = 32
+        with (
+            patch(
+                "app.services.scraper_service.settings.batch_max_concurrency",
+                8,
+            ),
+            patch(
+                "app.services.scraper_service.settings.browser_pool_max_size",
+                3,
+            ),
+        ):
+            self.assertEqual(self.service._batch_concurrency(self.batch), 2)
+            self.batch.urls = self.batch.urls * 4
+            self.assertEqual(self.service._batch_concurrency(self.batch), 3)
+
+
+class TestScrapeCache(unittest.TestCase):
+    """Test result caching in ScraperService.scrape."""
+
+    def setUp(self):
+        """Create a service with an empty cache."""
+        result_cache.clear()
+        self.addCleanup(result_cache.clear)
+        self.service = ScraperService()
+        self.request = ScrapeRequest(url=HttpUrl("https://example.com"))
+
+    def test_repeat_scrape_served_from_cache(self):
+        """Test the second identical scrape does not load the page."""
+        with patch.object(
+            ScraperService,
+            "_scrape_page",
+            return_value=ScrapeResponse(url="https://example.com/"),
+        ) as scrape_page:
+            first = self.service.scrape(self.request)
+            second = self.service.scrape(self.request)
+
+        scrape_page.assert_called_once()
+        self.assertEqual(first.metadata["cache"], "miss")
+        self.assertEqual(second.metadata["cache"], "hit")
+        self.assertEqual(second.metadata["cache_tier"], "memory")
+
+    def test_bypass_cache(self):
+        """Test bypass_cache always scrapes the page."""
+        request = self.request.model_copy(update={"bypass_cache": True})
+        with patch.object(
+            ScraperService,
+            "_scrape_page",
+            side_effect=lambda r: ScrapeResponse(url=str(r.url)),
+        ) as scrape_page:
+            self.service.scrape(request)
+            response = self.service.scrape(request)
+
+        self.assertEqual(scrape_page.call_count, 2)
+        self.assertEqual(response.metadata["cache"], "bypass")
+
+
+class TestScrapeCoalescing(unittest.TestCase):
+    """Test single-flight coalescing in ScraperService.scrape."""
+
+    def test_concurrent_identical_scrapes_share_session(self):
+        """Test followers receive the leader's result without scraping."""
+        service = ScraperService()
+        request = ScrapeRequest(
+            url=HttpUrl("https://example.com"), bypass_cache=True
+        )
+        shared = ScrapeResponse(url="https://example.com/", title="shared")
+
+        with (
+            patch(
+                "app.services.scraper_service.scrape_flights.do",
+                return_value=(shared, True),
+            ),
+            patch.object(ScraperService, "_scrape_page") as scrape_page,
+        ):
+            response = service.scrape(request)
+
+        scrape_page.assert_not_called()
+        self.assertTrue(response.metadata["coalesced"])
+        self.assertEqual(response.title, "shared")
+        self.assertNotIn("coalesced", shared.metadata)
+
+
+class TestScrapeStream(unittest.TestCase):
+    """Test streamed scrapes."""
+
+    def setUp(self):
+        """Create a service."""
+        self.service = ScraperService()
+
+    def fake_scrape(self, request):
+        """Finish the slow URL last."""
+        if request.url.path == "/slow":
+            time.sleep(0.2)
+        return ScrapeResponse(url=str(request.url))
+
+    def test_batch_streams_in_completion_order(self):
+        """Test batch results are emitted as each URL finishes."""
+        batch = ScrapeBatchRequest(
+            urls=[
+                HttpUrl("https://example.com/slow"),
+                HttpUrl("https://example.com/fast"),
+            ],
+            concurrency=2,
+        )
+        with patch.object(
+            ScraperService, "scrape", side_effect=self.fake_scrape
+        ):
+            lines = [
+                event.model_dump()
+                for event in self.service.stream_batch(batch)
+            ]
+
+        self.assertEqual(
+            [(line["event"], line.get("index")) for line in lines],
+            [("result", 1), ("result", 0), ("done", None)],
+        )
+        self.assertEqual(lines[-1]["succeeded"], 2)
+
+    def test_page_streams_fields_separately(self):
+        """Test one extraction is streamed page first, then per field."""
+        driver = MagicMock()
+        driver.execute_script.side_effect = lambda _script, options: {
+            "title": "Example",
+            "current_url": "https://example.com/",
+            "meta": {},
+            **{name: f"{name} value" for name, on in options.items() if on},
+            "links": ["https://example.com/a"],
+        }
+
+        @contextlib.contextmanager
+        def lease(*_args):
+            yield driver
+
+        request = ScrapeRequest(
+            url=HttpUrl("https://example.com"),
+            wait_time=0,
+            extract_html=True,
+            extract_links=True,
+            bypass_cache=True,
+        )
+        with patch.object(ScraperService, "_lease_browser", side_effect=lease):
+            lines = [
+                event.model_dump()
+                for event in self.service.stream_scrape(request)
+            ]
+
+        self.assertEqual(
+            [(line["event"], line.get("name")) for line in lines],
+            [
+                ("page", None),
+                ("field", "links"),
+                ("field", "text"),
+                ("field", "html"),
+                ("done", None),
+            ],
+        )
+        self.assertEqual(lines[0]["title"], "Example")
+        self.assertEqual(lines[3]["value"], "html value")
+        self.assertEqual(driver.execute_script.call_count, 1)
+
+    def test_page_stream_releases_browser_first(self):
+        """Test the browser is released before the first line is sent."""
+        driver = MagicMock()
+        driver.execute_script.return_value = {
+            "title": "Example",
+            "current_url": "https://example.com/",
+            "text": "text value",
+        }
+        leased = []
+
+        @contextlib.contextmanager
+        def lease(*_args):
+            leased.append(True)
+            yield driver
+            leased.pop()
+
+        request = ScrapeRequest(
+            url=HttpUrl("https://example.com"), wait_time=0, bypass_cache=True
+        )
+        with patch.object(ScraperService, "_lease_browser", side_effect=lease):
+            events = self.service.stream_scrape(request)
+            next(events)
+            self.assertEqual(leased, [])
+
+    def test_page_stream_detects_changes(self):
+        """Test change detection streams from a complete scrape."""
+        request = ScrapeRequest(
+            url=HttpUrl("https://example.com"),
+            browser_type="chrome",
+            detect_changes=True,
+        )
+        response = ScrapeResponse(url="https://example.com/", text="hello")
+        with patch.object(
+            ScraperService, "scrape", return_value=response
+        ) as scrape:
+            lines = [
+                event.model_dump()
+                for event in self.service.stream_scrape(request)
+            ]
+
+        scrape.assert_called_once_with(request)
+        self.assertEqual(lines[1]["value"], "hello")
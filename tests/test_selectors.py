@@ -0,0 +1,230 @@
+"""Tests for selector-based structured extraction."""
+
+import json
+import shutil
+import subprocess
+import unittest
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from pydantic import HttpUrl
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    JavascriptException,
+)
+from selenium.webdriver.common.by import By
+
+from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.services.extraction import EXTRACTION_SCRIPT, extraction_options
+from app.services.extraction_plans import compile_plan
+from app.services.scraper_service import ScraperService
+
+SELECTORS: dict[str, Any] = {
+    "heading": {"selector": "h1"},
+    "items": {
+        "selector": "//li",
+        "type": "xpath",
+        "multiple": True,
+        "fields": {
+            "name": {"selector": "b"},
+            "link": {"selector": "a", "attribute": "href"},
+        },
+    },
+}
+
+
+def make_request(**kwargs):
+    """Build a ScrapeRequest with the test selectors."""
+    kwargs.setdefault("browser_type", "chrome")
+    return ScrapeRequest(
+        url=HttpUrl("https://shop.example/"),
+        extract_text=False,
+        selectors=SELECTORS,
+        **kwargs,
+    )
+
+
+def element(text="", href=None, children=None):
+    """Build a fake WebElement whose find_elements looks up children."""
+    fake = MagicMock()
+    fake.text = text
+    fake.get_attribute.return_value = href
+    fake.find_elements.side_effect = lambda _by, selector: (
+        children or {}
+    ).get(selector, [])
+    return fake
+
+
+class TestSelectorSchema(unittest.TestCase):
+    """Test selector validation and the script argument."""
+
+    def test_script_receives_schema(self):
+        """Test the whole schema is passed to the single script call."""
+        request = make_request()
+        options = extraction_options(request, compile_plan(request.selectors))
+        self.assertFalse(options["text"])
+        self.assertEqual(options["selectors"]["heading"]["type"], "css")
+        self.assertEqual(
+            options["selectors"]["items"]["fields"]["link"]["attribute"],
+            "href",
+        )
+
+    def test_without_selectors(self):
+        """Test requests without selectors send none."""
+        request = ScrapeRequest(url=HttpUrl("https://shop.example/"))
+        self.assertIsNone(extraction_options(request)["selectors"])
+
+    def test_http_engine_rejected(self):
+        """Test selectors need an engine with a DOM."""
+        with self.assertRaises(ValueError):
+            make_request(browser_type="http")
+
+
+class TestSelectorExtraction(unittest.TestCase):
+    """Test ScraperService returns selector values in data."""
+
+    def setUp(self):
+        """Create a service."""
+        self.service = ScraperService()
+
+    def test_script_values_returned(self):
+        """Test script values and errors land in data and metadata."""
+        driver = MagicMock()
+        driver.execute_script.return_value = {
+            "title": "Shop",
+            "current_url": "https://shop.example/",
+            "data": {"heading": "Shop", "items": []},
+            "selector_errors": {"items": "bad xpath"},
+        }
+
+        data = self.service._extract_data(driver, make_request())
+
+        driver.execute_script.assert_called_once()
+        self.assertEqual(data["data"], {"heading": "Shop", "items": []})
+        self.assertIsNone(data["text"])
+        self.assertEqual(
+            data["metadata"]["selector_errors"], {"items": "bad xpath"}
+        )
+        self.assertIsNone(ScrapeResponse(**data).html)
+
+    def test_command_fallback(self):
+        """Test selectors are evaluated with commands when scripts fail."""
+        items = [
+            element(
+                children={
+                    "b": [element(" Tea ")],
+                    "a": [element(href="https://shop.example/tea")],
+                }
+            ),
+            element(children={"b": [element("Cake")]}),
+        ]
+        driver = MagicMock()
+        driver.execute_script.side_effect = JavascriptException("blocked")
+        driver.title = "Shop"
+
+        def find_elements(by, selector):
+            if selector == "h1":
+                return [element("Shop"), element("Other")]
+            if by == By.XPATH:
+                return items
+            raise InvalidSelectorException("unexpected")
+
+        driver.find_elements.side_effect = find_elements
+
+        data = self.service._extract_data(driver, make_request())
+
+        self.assertEqual(
+            data["data"],
+            {
+                "heading": "Shop",
+                "items": [
+                    {"name": "Tea", "link": "https://shop.example/tea"},
+                    {"name": "Cake", "link": None},
+                ],
+            },
+        )
+
+    def test_command_fallback_errors(self):
+        """Test an invalid selector fails only its own field."""
+        driver = MagicMock()
+        driver.execute_script.side_effect = JavascriptException("blocked")
+        driver.find_elements.side_effect = InvalidSelectorException("bad")
+
+        data = self.service._extract_data(driver, make_request())
+
+        self.assertEqual(data["data"], {"heading": None, "items": []})
+        errors = data["metadata"]["selector_errors"]
+        self.assertEqual(set(errors), {"heading", "items"})
+        self.assertTrue(errors["heading"].startswith("bad"))
+
+    def test_auto_goes_to_browser(self):
+        """Test 'auto' skips the HTTP attempt for selector requests."""
+        request = make_request(browser_type="auto")
+        browser_response = ScrapeResponse(url=str(request.url), data={})
+        with (
+            patch.object(self.service, "_fetch_page") as fetch,
+            patch.object(
+                self.service,
+                "_scrape_with_browser",
+                return_value=browser_response,
+            ) as browser,
+        ):
+            response = self.service._scrape_page(request)
+
+        fetch.assert_not_called()
+        browser.assert_called_once()
+        self.assertEqual(response.metadata["escalation_reason"], "selectors")
+
+
+# Page "<a href='/a'>a</a><svg><a href='/b'></a></svg>": the SVG anchor's
+# href is an SVGAnimatedString, as in a browser.
+FAKE_PAGE = """
+const anchors = [
+    { href: "https://shop.example/a" },
+    {
+        href: { baseVal: "/b", animVal: "/b" },
+        getAttribute: (name) => (name === "href" ? "/b" : null),
+    },
+];
+globalThis.window = { location: { href: "https://shop.example/" } };
+globalThis.document = {
+    documentElement: {},
+    title: "Shop",
+    baseURI: "https://shop.example/",
+    querySelectorAll: (selector) => (selector === "a[href]" ? anchors : []),
+};
+"""
+
+
+@unittest.skipUnless(shutil.which("node"), "requires node")
+class TestExtractionScript(unittest.TestCase):
+    """Test the extraction script against a minimal DOM."""
+
+    def run_script(self, options):
+        """Run EXTRACTION_SCRIPT on FAKE_PAGE and return its result."""
+        program = (
+            f"{FAKE_PAGE}\n"
+            f"const extract = new Function({json.dumps(EXTRACTION_SCRIPT)});\n"
+            f"console.log(JSON.stringify(extract({json.dumps(options)})));"
+        )
+        output = subprocess.run(
+            ["node"], input=program, capture_output=True, text=True, check=True
+        ).stdout
+        return json.loads(output)
+
+    def test_svg_links_resolved(self):
+        """Test SVG anchors give URLs like HTML ones."""
+        request = ScrapeRequest(
+            url=HttpUrl("https://shop.example/"), extract_links=True
+        )
+        result = self.run_script(extraction_options(request))
+
+        self.assertEqual(
+            result["links"],
+            ["https://shop.example/a", "https://shop.example/b"],
+        )
+        ScrapeResponse(url=str(request.url), links=result["links"])
+
+
+if __name__ == "__main__":
+    unittest.main()
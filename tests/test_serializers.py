@@ -4,7 +4,12 @@ import unittest
 
 from pydantic import HttpUrl, ValidationError
 
-from app.serializers.scraper import ScrapeRequest, ScrapeResponse
+from app.serializers.scraper import (
+    ScrapeBatchRequest,
+    ScrapeOptions,
+    ScrapeRequest,
+    ScrapeResponse,
+)
 
 
 class TestScrapeRequest(unittest.TestCase):
@@ -54,6 +59,13 @@ class TestScrapeRequest(unittest.TestCase):
         with self.assertRaises(ValidationError):
             ScrapeRequest(url=HttpUrl("https://example.com"), wait_time=61)
 
+    def test_selector_strategy_requires_selector(self):
+        """Test selector wait strategy without a selector is rejected."""
+        with self.assertRaises(ValidationError):
+            ScrapeRequest(
+                url=HttpUrl("https://example.com"), wait_strategy="selector"
+            )
+
     def test_invalid_url(self):
         """Test invalid URL raises ValidationError."""
         with self.assertRaises(ValidationError):
@@ -108,3 +120,35 @@ class TestScrapeResponse(unittest.TestCase):
         self.assertEqual(response.links, [])
         self.assertEqual(response.images, [])
         self.assertEqual(response.metadata, {})
+
+
+class TestScrapeBatchRequest(unittest.TestCase):
+    """Test ScrapeBatchRequest serializer."""
+
+    def test_to_requests_applies_shared_options(self):
+        """Test every URL gets the shared options."""
+        batch = ScrapeBatchRequest(
+            urls=[
+                HttpUrl("https://example.com/a"),
+                HttpUrl("https://example.com/b"),
+            ],
+            options=ScrapeOptions(browser_type="chrome", extract_links=True),
+        )
+        requests = batch.to_requests()
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(str(requests[1].url), "https://example.com/b")
+        for request in requests:
+            self.assertEqual(request.browser_type, "chrome")
+            self.assertTrue(request.extract_links)
+
+    def test_empty_urls_rejected(self):
+        """Test an empty URL list raises ValidationError."""
+        with self.assertRaises(ValidationError):
+            ScrapeBatchRequest(urls=[])
+
+    def test_invalid_concurrency(self):
+        """Test concurrency below minimum raises ValidationError."""
+        with self.assertRaises(ValidationError):
+            ScrapeBatchRequest(
+                urls=[HttpUrl("https://example.com")], concurrency=0
+            )
@@ -68,3 +68,27 @@ class TestSettings(unittest.TestCase):
         settings2 = get_settings()
         self.assertIs(settings1, settings2)
         get_settings.cache_clear()
+
+    def test_browser_pool_defaults(self):
+        """Test browser pool default settings."""
+        settings = Settings()
+        self.assertTrue(settings.browser_pool_enabled)
+        self.assertEqual(settings.browser_pool_min_size, 0)
+        self.assertEqual(settings.browser_pool_max_size, 2)
+
+    def test_browser_pool_min_exceeds_max(self):
+        """Test browser pool min size above max size is rejected."""
+        with self.assertRaises(ValueError):
+            Settings(browser_pool_min_size=3, browser_pool_max_size=2)
+
+    def test_workers_require_shared_state(self):
+        """Test several workers need jobs and plans in the database."""
+        with self.assertRaisesRegex(ValueError, "JOBS_PERSISTENT"):
+            Settings(scope="production", server_workers=2)
+        settings = Settings(
+            scope="production",
+            server_workers=2,
+            jobs_persistent=True,
+            extraction_plans_persistent=True,
+        )
+        self.assertEqual(settings.worker_count, 2)
@@ -0,0 +1,64 @@
+"""Tests for single-flight deduplication."""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test SingleFlight."""
+
+    def run_concurrently(self, flights, fn, followers=4):
+        """Run a blocked leader call and followers joining it."""
+        release = threading.Event()
+
+        def leader_fn():
+            release.wait(timeout=5)
+            return fn()
+
+        def follower_fn():
+            raise AssertionError("followers must not run fn")
+
+        with ThreadPoolExecutor(max_workers=followers + 1) as executor:
+            leader = executor.submit(flights.do, "key", leader_fn)
+            while flights.in_flight() == 0:
+                time.sleep(0.001)
+            others = [
+                executor.submit(flights.do, "key", follower_fn)
+                for _ in range(followers)
+            ]
+            time.sleep(0.05)
+            release.set()
+        return leader, others
+
+    def test_concurrent_calls_share_result(self):
+        """Test concurrent callers with one key run fn once."""
+        flights = SingleFlight()
+        leader, others = self.run_concurrently(flights, lambda: "page")
+
+        self.assertEqual(leader.result(), ("page", False))
+        for future in others:
+            self.assertEqual(future.result(), ("page", True))
+        self.assertEqual(flights.in_flight(), 0)
+
+    def test_errors_propagate_to_waiters(self):
+        """Test every caller sees the leader's exception."""
+        flights = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        leader, others = self.run_concurrently(flights, fail)
+        for future in [leader, *others]:
+            with self.assertRaises(ValueError):
+                future.result()
+        self.assertEqual(flights.in_flight(), 0)
+
+    def test_sequential_calls_not_shared(self):
+        """Test calls after completion run fn again."""
+        flights = SingleFlight()
+        self.assertEqual(flights.do("key", lambda: 1), (1, False))
+        self.assertEqual(flights.do("key", lambda: 2), (2, False))
@@ -0,0 +1,232 @@
+"""Tests for tab-level concurrency within one browser."""
+
+import unittest
+from types import SimpleNamespace
+
+from selenium.common.exceptions import (
+    NoSuchWindowException,
+    WebDriverException,
+)
+from selenium.webdriver.remote.command import Command
+
+from app.core.browsers.lifecycle import DriverLifecycle
+from app.core.browsers.pool import BrowserPool
+from app.core.browsers.tabs import LOADED_SCRIPT, BrowserTabs, TabPool
+from app.core.errors import BrowserPoolTimeoutError
+
+
+class FakeSession:
+    """
+    WebDriver session stand-in tracking windows and commands.
+
+    Like a remote session, its state is shared by shallow copies.
+    """
+
+    def __init__(self):
+        self.state = SimpleNamespace(
+            handles=["base"],
+            current="base",
+            log=[],
+            opened=0,
+            quit_called=False,
+            loaded=[True],
+        )
+
+    def execute(self, command, params=None):
+        """Run a command against the current window."""
+        state = self.state
+        state.log.append((state.current, command, params))
+        if command == Command.W3C_GET_CURRENT_WINDOW_HANDLE:
+            return {"value": state.current}
+        if command == Command.NEW_WINDOW:
+            state.opened += 1
+            handle = f"tab-{state.opened}"
+            state.handles.append(handle)
+            return {"value": {"handle": handle, "type": "tab"}}
+        if command == Command.SWITCH_TO_WINDOW:
+            if params["handle"] not in state.handles:
+                raise NoSuchWindowException(params["handle"])
+            state.current = params["handle"]
+        if command == Command.CLOSE:
+            state.handles.remove(state.current)
+        if (
+            command == Command.W3C_EXECUTE_SCRIPT
+            and params["script"] == LOADED_SCRIPT
+        ):
+            return {"value": state.loaded.pop(0)}
+        return {"value": None}
+
+    def execute_script(self, script, *args):
+        """Run a script in the current window."""
+        return self.execute(
+            Command.W3C_EXECUTE_SCRIPT, {"script": script, "args": args}
+        )["value"]
+
+    @property
+    def current_url(self):
+        """URL of the current window."""
+        return "about:blank"
+
+    def delete_all_cookies(self):
+        """Clear cookies."""
+
+    def get(self, url):
+        """Navigate the current window."""
+
+    def quit(self):
+        """End the session."""
+        self.state.quit_called = True
+
+
+class FakeChromeSession(FakeSession):
+    """Session supporting DevTools browser contexts."""
+
+    def __init__(self):
+        super().__init__()
+        self.state.disposed = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        """Run a DevTools command."""
+        if cmd == "Target.createBrowserContext":
+            return {"browserContextId": "context-1"}
+        if cmd == "Target.createTarget":
+            self.state.handles.append("target-1")
+            return {"targetId": "target-1"}
+        if cmd == "Target.disposeBrowserContext":
+            self.state.disposed.append(params["browserContextId"])
+        return {}
+
+
+def commands(session, command):
+    """Windows a command ran in."""
+    return [window for window, name, _ in session.state.log if name == command]
+
+
+class TestBrowserTabs(unittest.TestCase):
+    """Test window switching and tab cleanup."""
+
+    def test_commands_run_in_their_tab(self):
+        """Test each tab's commands switch to its window first."""
+        session = FakeSession()
+        tabs = BrowserTabs(session, isolate=False)
+        first, second = tabs.open_tab(), tabs.open_tab()
+
+        first.driver.execute("one")
+        second.driver.execute("two")
+        first.driver.execute("three")
+
+        self.assertEqual(commands(session, "one"), [first.handle])
+        self.assertEqual(commands(session, "two"), [second.handle])
+        self.assertEqual(commands(session, "three"), [first.handle])
+
+    def test_close_tab_clears_cookies(self):
+        """Test closing a shared-jar tab deletes its cookies."""
+        session = FakeSession()
+        tabs = BrowserTabs(session, isolate=False)
+        tab = tabs.open_tab()
+        tabs.close_tab(tab)
+
+        self.assertEqual(
+            commands(session, Command.DELETE_ALL_COOKIES), [tab.handle]
+        )
+        self.assertEqual(session.state.handles, ["base"])
+        self.assertEqual(session.state.current, "base")
+
+    def test_isolated_tab_has_own_context(self):
+        """Test Chrome tabs live in a disposable browser context."""
+        session = FakeChromeSession()
+        tabs = BrowserTabs(session)
+        tab = tabs.open_tab()
+        self.assertEqual(tab.handle, "target-1")
+
+        tabs.close_tab(tab)
+        self.assertEqual(session.state.disposed, ["context-1"])
+        self.assertEqual(commands(session, Command.DELETE_ALL_COOKIES), [])
+
+    def test_get_waits_for_new_document(self):
+        """Test navigation polls until the new page has loaded."""
+        session = FakeSession()
+        session.state.loaded = [False, False, True]
+        tab = BrowserTabs(session, isolate=False, poll_interval=0).open_tab()
+
+        tab.driver.get("https://example.com/")
+
+        self.assertEqual(session.state.loaded, [])
+        tab.driver.quit()
+        self.assertFalse(session.state.quit_called)
+
+
+class TestTabPool(unittest.TestCase):
+    """Test packing scrapes into browser tabs."""
+
+    def setUp(self):
+        """Create a pool of fake sessions."""
+        self.sessions: list[FakeSession] = []
+
+        def factory():
+            session = FakeSession()
+            self.sessions.append(session)
+            return session
+
+        self.factory = factory
+        self.pool = BrowserPool(factory, max_size=2, lease_timeout=0)
+        self.tabs = TabPool(self.pool, max_tabs=2, isolate=False)
+
+    def test_tabs_packed_into_one_browser(self):
+        """Test a browser serves max_tabs scrapes before another launches."""
+        with self.tabs.lease(), self.tabs.lease():
+            self.assertEqual(len(self.sessions), 1)
+            with self.tabs.lease():
+                self.assertEqual(len(self.sessions), 2)
+                self.assertEqual(self.tabs.open_tabs, 3)
+
+        self.assertEqual(self.pool.idle_count, 2)
+        self.assertEqual(self.tabs.open_tabs, 0)
+
+    def test_full_browsers_time_out(self):
+        """Test leases fail once every browser's tabs are taken."""
+        with (
+            self.tabs.lease(),
+            self.tabs.lease(),
+            self.tabs.lease(),
+            self.tabs.lease(),
+            self.assertRaises(BrowserPoolTimeoutError),
+            self.tabs.lease(),
+        ):
+            pass
+
+    def test_broken_browser_discarded(self):
+        """Test a browser whose tab failed is quit once drained."""
+        with (
+            self.assertRaises(WebDriverException),
+            self.tabs.lease(),
+        ):
+            raise WebDriverException("crashed")
+
+        self.assertTrue(self.sessions[0].state.quit_called)
+        self.assertEqual(self.pool.size, 0)
+
+    def test_browser_past_limit_gets_no_tabs(self):
+        """Test each tab counts as a page and a spent browser drains."""
+        pool = BrowserPool(
+            self.factory,
+            max_size=2,
+            lease_timeout=0,
+            lifecycle=DriverLifecycle(max_pages=2),
+        )
+        self.tabs = TabPool(pool, max_tabs=2, isolate=False)
+
+        with self.tabs.lease():
+            with self.tabs.lease():
+                pass
+            with self.tabs.lease():
+                self.assertEqual(len(self.sessions), 1)
+            with self.tabs.lease():
+                self.assertEqual(len(self.sessions), 2)
+
+        self.assertTrue(self.sessions[0].state.quit_called)
+        self.assertFalse(self.sessions[1].state.quit_called)
+
+
+if __name__ == "__main__":
+    unittest.main()
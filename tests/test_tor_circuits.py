@@ -0,0 +1,105 @@
+"""Tests for Tor circuit scheduling."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from app.core.browsers.tor_circuits import TorCircuitManager
+
+
+class TestTorCircuitManager(unittest.TestCase):
+    """Test TorCircuitManager assignment and rotation."""
+
+    def test_round_robin_cycles_ports(self):
+        """Test round robin hands out every port in turn."""
+        manager = TorCircuitManager([9050, 9060, 9061], strategy="round_robin")
+        ports = []
+        for _ in range(6):
+            circuit = manager.acquire()
+            ports.append(circuit.port)
+            manager.release(circuit, 1.0, True)
+        self.assertEqual(ports, [9050, 9060, 9061, 9050, 9060, 9061])
+
+    def test_latency_prefers_fast_circuit(self):
+        """Test the latency strategy favors the faster circuit."""
+        manager = TorCircuitManager([9050, 9060])
+        slow, fast = manager.acquire(), manager.acquire()
+        self.assertNotEqual(slow.port, fast.port)
+        manager.release(slow, 2.0, True)
+        manager.release(fast, 0.5, True)
+
+        self.assertIs(manager.acquire(), fast)
+
+    def test_latency_spreads_concurrent_load(self):
+        """Test busy circuits are weighed by their in-flight scrapes."""
+        manager = TorCircuitManager([9050, 9060])
+        first, second = manager.acquire(), manager.acquire()
+        manager.release(first, 1.0, True)
+        manager.release(second, 1.5, True)
+
+        held = [manager.acquire() for _ in range(2)]
+        self.assertEqual({circuit.port for circuit in held}, {9050, 9060})
+
+    def test_failing_circuit_rotates(self):
+        """Test consecutive failures request new circuits."""
+        rotate = MagicMock()
+        manager = TorCircuitManager(
+            [9050], max_failures=2, rotate=rotate, min_rotate_interval=0
+        )
+        for _ in range(2):
+            with self.assertRaises(RuntimeError), manager.lease():
+                raise RuntimeError("neterror")
+
+        rotate.assert_called_once()
+        stats = manager.snapshot()[0]
+        self.assertEqual(stats["failed"], 2)
+        self.assertEqual(stats["rotations"], 1)
+
+    def test_slow_circuit_rotates(self):
+        """Test a circuit much slower than the fastest one is rotated."""
+        rotate = MagicMock()
+        manager = TorCircuitManager(
+            [9050, 9060],
+            strategy="round_robin",
+            slow_factor=2,
+            min_samples=2,
+            rotate=rotate,
+            min_rotate_interval=0,
+        )
+        for _ in range(2):
+            fast, slow = manager.acquire(), manager.acquire()
+            manager.release(fast, 1.0, True)
+            manager.release(slow, 5.0, True)
+
+        rotate.assert_called_once()
+        self.assertIsNone(slow.latency)
+        self.assertEqual(slow.rotations, 1)
+
+    def test_rotation_is_rate_limited(self):
+        """Test rotations within the minimum interval are skipped."""
+        rotate = MagicMock()
+        manager = TorCircuitManager(
+            [9050], max_failures=1, rotate=rotate, min_rotate_interval=60
+        )
+        for _ in range(3):
+            circuit = manager.acquire()
+            manager.release(circuit, 1.0, False)
+        rotate.assert_called_once()
+
+    def test_unmeasured_release_only_frees_circuit(self):
+        """Test releasing without timing leaves the statistics alone."""
+        manager = TorCircuitManager([9050])
+        circuit = manager.acquire()
+        manager.release(circuit, None, False)
+        self.assertEqual(circuit.active, 0)
+        self.assertEqual(circuit.failed, 0)
+
+    def test_throughput(self):
+        """Test throughput is completed scrapes per busy second."""
+        manager = TorCircuitManager([9050])
+        for elapsed in (1.0, 3.0):
+            manager.release(manager.acquire(), elapsed, True)
+        self.assertEqual(manager.snapshot()[0]["throughput"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
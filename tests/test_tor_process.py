@@ -0,0 +1,183 @@
+"""Tests for the shared Tor process."""
+
+import socket
+import socketserver
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from app.core.browsers.tor_process import TorControl, TorProcess
+from app.core.errors import TorProcessError
+
+
+class FakeControlHandler(socketserver.StreamRequestHandler):
+    """Answer Tor control commands like a bootstrapped tor."""
+
+    progress = 100
+    signals: list[str] = []
+    authentications: list[str] = []
+
+    def handle(self):
+        """Reply to each command line."""
+        for raw in self.rfile:
+            line = raw.decode().strip()
+            if line.startswith("AUTHENTICATE"):
+                self.authentications.append(line)
+                self.wfile.write(b"250 OK\r\n")
+            elif line == "GETINFO status/bootstrap-phase":
+                self.wfile.write(
+                    b"250-status/bootstrap-phase=NOTICE BOOTSTRAP "
+                    + f"PROGRESS={self.progress} TAG=done".encode()
+                    + b"\r\n250 OK\r\n"
+                )
+            elif line == "SIGNAL NEWNYM":
+                self.signals.append("NEWNYM")
+                self.wfile.write(b"250 OK\r\n")
+            elif line == "QUIT":
+                self.wfile.write(b"250 closing connection\r\n")
+                return
+            else:
+                self.wfile.write(b"510 Unrecognized command\r\n")
+
+
+class TestTorControl(unittest.TestCase):
+    """Test TorControl against a fake control port."""
+
+    def setUp(self):
+        """Start a fake control server."""
+        self.server = socketserver.ThreadingTCPServer(
+            ("127.0.0.1", 0), FakeControlHandler
+        )
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def test_bootstrap_progress(self):
+        """Test GETINFO bootstrap phase parsing."""
+        with TorControl(self.port) as control:
+            self.assertEqual(control.bootstrap_progress(), 100)
+
+    def test_error_reply_raises(self):
+        """Test non-2xx replies raise TorProcessError."""
+        with (
+            TorControl(self.port) as control,
+            self.assertRaises(TorProcessError),
+        ):
+            control.command("SIGNAL BOGUS")
+
+    def test_external_tor_is_healthy(self):
+        """Test an already running tor is reused instead of started."""
+        process = TorProcess(control_port=self.port)
+        self.assertTrue(process.is_healthy())
+        with patch.object(TorProcess, "_start") as start:
+            process.ensure_running()
+        start.assert_not_called()
+
+    def test_signal_newnym(self):
+        """Test NEWNYM is sent over the control port."""
+        FakeControlHandler.signals.clear()
+        TorProcess(control_port=self.port).signal_newnym()
+        self.assertEqual(FakeControlHandler.signals, ["NEWNYM"])
+
+    def test_cookie_of_sibling_process_used(self):
+        """Test a tor launched by another worker is controlled too."""
+        FakeControlHandler.authentications.clear()
+        with tempfile.TemporaryDirectory() as data_dir:
+            with open(f"{data_dir}/control_auth_cookie", "wb") as cookie:
+                cookie.write(b"\x01\xff")
+            TorProcess(
+                control_port=self.port, data_dir=data_dir
+            ).signal_newnym()
+        self.assertEqual(
+            FakeControlHandler.authentications, ["AUTHENTICATE 01ff"]
+        )
+
+
+class TestTorProcess(unittest.TestCase):
+    """Test TorProcess startup."""
+
+    def free_port(self):
+        """Find a port nothing listens on."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def test_missing_binary_raises(self):
+        """Test starting without a tor executable fails clearly."""
+        process = TorProcess(
+            socks_port=self.free_port(), control_port=self.free_port()
+        )
+        with (
+            patch(
+                "app.core.browsers.tor_process.shutil.which", return_value=None
+            ),
+            self.assertRaises(TorProcessError),
+        ):
+            process.ensure_running("/nonexistent/tor-browser")
+
+    def test_torrc_lists_every_socks_port(self):
+        """Test each circuit port gets its own SocksPort line."""
+        with tempfile.TemporaryDirectory() as data_dir:
+            process = TorProcess(
+                tor_binary="/usr/bin/tor",
+                socks_port=9050,
+                extra_socks_ports=[9060, 9061],
+                data_dir=data_dir,
+            )
+            with (
+                patch(
+                    "app.core.browsers.tor_process.subprocess.Popen"
+                ) as popen,
+                patch.object(TorProcess, "_wait_for_bootstrap"),
+            ):
+                process.ensure_running()
+
+            torrc = f"{data_dir}/torrc"
+            with open(torrc, encoding="utf-8") as config:
+                lines = config.read().splitlines()
+
+        self.assertEqual(
+            popen.call_args.args[0], ["/usr/bin/tor", "-f", torrc]
+        )
+        self.assertEqual(
+            [line for line in lines if line.startswith("SocksPort")],
+            ["SocksPort 9050", "SocksPort 9060", "SocksPort 9061"],
+        )
+
+    def test_detect_bundled_binary(self):
+        """Test the bundled tor binary is preferred."""
+        with patch(
+            "app.core.browsers.tor_process.os.path.isfile", return_value=True
+        ):
+            path = TorProcess.detect_binary("/opt/tor-browser")
+        self.assertEqual(path, "/opt/tor-browser/Browser/TorBrowser/Tor/tor")
+
+
+class TestTorBrowserRunningTor(unittest.TestCase):
+    """Test TorBrowser attaches to a running tor."""
+
+    @patch("app.core.browsers.tor.TorBrowserDriver")
+    @patch("app.core.browsers.tor.os.path.exists", return_value=True)
+    @patch("app.core.browsers.tor.os.makedirs")
+    def test_running_tor_ports_passed(self, _makedirs, _exists, driver_cls):
+        """Test tor_cfg and ports are passed to TorBrowserDriver."""
+        from tbselenium.common import USE_RUNNING_TOR
+
+        from app.core.browsers.tor import TorBrowser
+
+        browser = TorBrowser(
+            multi_instances=True,
+            tor_browser_path="/opt/tor-browser",
+            use_running_tor=True,
+            socks_port=9150,
+            control_port=9151,
+        )
+        browser.get_instance()
+
+        kwargs = driver_cls.call_args.kwargs
+        self.assertEqual(kwargs["tor_cfg"], USE_RUNNING_TOR)
+        self.assertEqual(kwargs["socks_port"], 9150)
+        self.assertEqual(kwargs["control_port"], 9151)